@@ -9,6 +9,7 @@ from crawler.api.routes import health, tasks, scrape, bulk, config, webhooks
 from crawler.api.middleware import LoggingMiddleware, ErrorMiddleware
 from crawler.lpm import LocalPersistenceManager
 from crawler.config_loader import ConfigLoader
+from crawler.http_clients import close_clients
 
 logger = logging.getLogger(__name__)
 
@@ -64,6 +65,7 @@ def create_app(
     async def shutdown():
         """Cleanup on shutdown."""
         await app.state.lpm.close()
+        await close_clients()
         logger.info("Crawler API stopped")
 
     # Register routes
@@ -1,11 +1,21 @@
 """Task management routes."""
 
-from fastapi import APIRouter, HTTPException, Query
+from fastapi import APIRouter, HTTPException, Query, Request
+from pydantic import ValidationError
 from typing import Optional, List
+from datetime import datetime
+import json
 import uuid
 
-from crawler.api.schemas import TaskCreate, TaskResponse, TaskListResponse
-from crawler.models.task import TaskStatus
+from crawler.api.schemas import (
+    TaskCreate,
+    TaskResponse,
+    TaskListResponse,
+    TaskBatchItem,
+    TaskBatchResponse,
+)
+from crawler.models.task import Task, TaskStatus
+from crawler.repositories.task_repo import TaskFilter
 
 router = APIRouter()
 
@@ -35,6 +45,81 @@ async def create_task(task: TaskCreate):
     return TaskResponse.model_validate(created_task)
 
 
+@router.post("/batch", response_model=TaskBatchResponse, status_code=201)
+async def create_tasks_batch(
+    request: Request,
+    platform: Optional[str] = Query(None, description="Default platform for entries"),
+    chunk_size: int = Query(1000, ge=1, le=10000, description="Rows per insert chunk"),
+):
+    """
+    Create many tasks in one transaction.
+
+    Accepts a JSON array of tasks, or a JSONL body (one task object per
+    line) when sent as application/x-ndjson or application/jsonl.
+    """
+    lpm = request.app.state.lpm
+    default_platform = platform or request.app.state.platform
+
+    content_type = request.headers.get("content-type", "")
+    if "ndjson" in content_type or "jsonl" in content_type:
+        items = [item async for item in _iter_jsonl(request)]
+    else:
+        try:
+            items = json.loads(await request.body())
+        except json.JSONDecodeError as e:
+            raise HTTPException(status_code=400, detail=f"Invalid JSON: {e}")
+        if not isinstance(items, list):
+            raise HTTPException(status_code=400, detail="Expected a JSON array of tasks")
+
+    tasks = []
+    for index, data in enumerate(items):
+        try:
+            item = TaskBatchItem.model_validate(data)
+        except ValidationError as e:
+            raise HTTPException(status_code=422, detail=f"Entry {index}: {e}")
+
+        item_platform = item.platform or default_platform
+        if not item_platform:
+            raise HTTPException(status_code=422, detail=f"Entry {index}: platform is required")
+
+        tasks.append(
+            Task(
+                id=str(uuid.uuid4()),
+                url=item.url,
+                platform=item_platform,
+                priority=item.priority,
+            )
+        )
+
+    chunks = await lpm.add_tasks(tasks, chunk_size)
+    return TaskBatchResponse(created=sum(chunks), chunks=chunks)
+
+
+async def _iter_jsonl(request: Request):
+    """Yield JSON objects from a streamed JSONL request body."""
+    buffer = b""
+    line_number = 0
+
+    async for chunk in request.stream():
+        buffer += chunk
+        *lines, buffer = buffer.split(b"\n")
+        for line in lines:
+            line_number += 1
+            if line.strip():
+                yield _parse_jsonl_line(line, line_number)
+
+    if buffer.strip():
+        yield _parse_jsonl_line(buffer, line_number + 1)
+
+
+def _parse_jsonl_line(line: bytes, line_number: int) -> dict:
+    """Parse one JSONL line."""
+    try:
+        return json.loads(line)
+    except json.JSONDecodeError as e:
+        raise HTTPException(status_code=400, detail=f"Invalid JSON on line {line_number}: {e}")
+
+
 @router.get("/{task_id}", response_model=TaskResponse)
 async def get_task(task_id: str):
     """Get task by ID."""
@@ -54,33 +139,46 @@ async def get_task(task_id: str):
 
 @router.get("", response_model=TaskListResponse)
 async def list_tasks(
+    request: Request,
     platform: Optional[str] = Query(None, description="Filter by platform"),
-    status: Optional[str] = Query(None, description="Filter by status"),
-    limit: int = Query(100, description="Max tasks to return"),
+    status: Optional[TaskStatus] = Query(None, description="Filter by status"),
+    created_after: Optional[datetime] = Query(None, description="Created at or after"),
+    created_before: Optional[datetime] = Query(None, description="Created before"),
+    completed_after: Optional[datetime] = Query(None, description="Completed at or after"),
+    completed_before: Optional[datetime] = Query(None, description="Completed before"),
+    error: Optional[str] = Query(None, description="Error message substring"),
+    cursor: Optional[str] = Query(None, description="Cursor from the previous page"),
+    limit: int = Query(100, ge=1, le=1000, description="Max tasks to return"),
 ):
-    """List all tasks."""
-    from fastapi import Request
-    request = Request.scope.get("request")
-    lpm = request.app.state.lpm if request else None
-
-    if not lpm:
-        raise HTTPException(status_code=500, detail="LPM not initialized")
+    """List tasks ordered by priority, one keyset page at a time."""
+    lpm = request.app.state.lpm
+
+    filters = TaskFilter(
+        status=status,
+        platform=platform,
+        created_after=created_after,
+        created_before=created_before,
+        completed_after=completed_after,
+        completed_before=completed_before,
+        error_contains=error,
+    )
 
-    if status:
-        status_enum = TaskStatus(status)
-        tasks = await lpm.task_repo.get_by_status(status_enum, platform, limit)
-    else:
-        tasks = await lpm.task_repo.get_all(platform, limit)
+    try:
+        tasks, next_cursor = await lpm.task_repo.list_page(filters, cursor, limit)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
 
     # Get counts
-    pending = await lpm.task_repo.count_by_status(TaskStatus.PENDING)
-    processing = await lpm.task_repo.count_by_status(TaskStatus.PROCESSING)
+    counts = await lpm.task_repo.count_all_by_status()
+    pending = counts[TaskStatus.PENDING.value]
+    processing = counts[TaskStatus.PROCESSING.value]
 
     return TaskListResponse(
         tasks=[TaskResponse.model_validate(t) for t in tasks],
         total=len(tasks),
         pending=pending,
         processing=processing,
+        next_cursor=next_cursor,
     )
 
 
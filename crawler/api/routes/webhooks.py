@@ -4,6 +4,7 @@ from fastapi import APIRouter, HTTPException
 import httpx
 
 from crawler.api.schemas import WebhookTestRequest, WebhookTestResponse
+from crawler.http_clients import get_client
 
 router = APIRouter()
 
@@ -12,33 +13,34 @@ router = APIRouter()
 async def test_webhook(request_data: WebhookTestRequest):
     """Test webhook endpoint."""
     try:
-        async with httpx.AsyncClient() as client:
-            # Send test payload
-            payload = {
-                "event": "test",
-                "message": "This is a test webhook",
-            }
-
-            headers = {}
-            if request_data.secret:
-                # Add HMAC signature
-                from crawler.webhooks.signer import WebhookSigner
-                signer = WebhookSigner(request_data.secret)
-                headers["X-Webhook-Signature"] = signer.sign(payload)
-
-            response = await client.post(
-                request_data.url,
-                json=payload,
-                headers=headers,
-                timeout=10.0,
-            )
-
-            return WebhookTestResponse(
-                success=response.status_code < 400,
-                status_code=response.status_code,
-                response_body=response.text[:1000],  # Limit response size
-                error=None,
-            )
+        client = get_client("webhooks")
+
+        # Send test payload
+        payload = {
+            "event": "test",
+            "message": "This is a test webhook",
+        }
+
+        headers = {}
+        if request_data.secret:
+            # Add HMAC signature
+            from crawler.webhooks.signer import WebhookSigner
+            signer = WebhookSigner(request_data.secret)
+            headers["X-Webhook-Signature"] = signer.sign(payload)
+
+        response = await client.post(
+            request_data.url,
+            json=payload,
+            headers=headers,
+            timeout=10.0,
+        )
+
+        return WebhookTestResponse(
+            success=response.status_code < 400,
+            status_code=response.status_code,
+            response_body=response.text[:1000],  # Limit response size
+            error=None,
+        )
 
     except httpx.ConnectError as e:
         return WebhookTestResponse(
@@ -23,6 +23,19 @@ class TaskCreate(BaseModel):
     priority: int = Field(default=0, description="Task priority")
 
 
+class TaskBatchItem(BaseModel):
+    """Single entry of a batch task request."""
+    url: str = Field(..., description="URL to scrape")
+    platform: Optional[str] = Field(default=None, description="Platform name (defaults to request platform)")
+    priority: int = Field(default=0, description="Task priority")
+
+
+class TaskBatchResponse(BaseModel):
+    """Result of a batch task request."""
+    created: int
+    chunks: List[int]
+
+
 class TaskResponse(BaseModel):
     """Task response."""
     id: str
@@ -36,6 +49,9 @@ class TaskResponse(BaseModel):
     result_path: Optional[str]
     error: Optional[str]
     retry_count: int
+    worker_id: Optional[str] = None
+    lease_expires_at: Optional[datetime] = None
+    next_attempt_at: Optional[datetime] = None
 
     class Config:
         from_attributes = True
@@ -47,6 +63,7 @@ class TaskListResponse(BaseModel):
     total: int
     pending: int
     processing: int
+    next_cursor: Optional[str] = None
 
 
 # === Scrape Schemas ===
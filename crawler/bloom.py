@@ -0,0 +1,214 @@
+"""Disk-persisted Bloom filter for seen-URL prefiltering."""
+
+import hashlib
+import math
+import os
+import struct
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, Union
+
+try:
+    import fcntl
+except ImportError:  # Windows: saves are not serialized across processes
+    fcntl = None
+
+
+# File header: magic, version, num_bits, num_hashes, count, capacity, error_rate
+HEADER = struct.Struct("<4sHQIQQd")
+MAGIC = b"CRBF"
+VERSION = 1
+
+
+class BloomFilter:
+    """
+    Space-efficient set membership with a tunable false-positive rate.
+
+    "key in filter" is False only for keys never added; True means the
+    key was probably added and must be confirmed against the source of
+    truth. Sized for capacity keys at error_rate; past capacity the
+    false-positive rate climbs, so callers should rebuild with a larger
+    capacity once saturated is True.
+    """
+
+    def __init__(self, capacity: int, error_rate: float = 0.001):
+        if capacity <= 0:
+            raise ValueError("capacity must be positive")
+        if not 0 < error_rate < 1:
+            raise ValueError("error_rate must be between 0 and 1")
+
+        self.capacity = capacity
+        self.error_rate = error_rate
+        # Optimal size and hash count for capacity keys at error_rate
+        self.num_bits = max(8, math.ceil(-capacity * math.log(error_rate) / math.log(2) ** 2))
+        self.num_hashes = max(1, round(self.num_bits / capacity * math.log(2)))
+        self.count = 0
+        self._bits = bytearray((self.num_bits + 7) // 8)
+
+    def _positions(self, key: bytes) -> Iterable[int]:
+        """Bit positions for a key (Kirsch-Mitzenmacher double hashing)."""
+        digest = hashlib.blake2b(key, digest_size=16).digest()
+        h1 = int.from_bytes(digest[:8], "little")
+        h2 = int.from_bytes(digest[8:], "little") | 1
+        for i in range(self.num_hashes):
+            yield (h1 + i * h2) % self.num_bits
+
+    @staticmethod
+    def _key(key: Union[str, bytes]) -> bytes:
+        return key.encode("utf-8") if isinstance(key, str) else key
+
+    def add(self, key: Union[str, bytes]) -> None:
+        """Add a key."""
+        for pos in self._positions(self._key(key)):
+            self._bits[pos >> 3] |= 1 << (pos & 7)
+        self.count += 1
+
+    def update(self, keys: Iterable[Union[str, bytes]]) -> None:
+        """Add many keys."""
+        for key in keys:
+            self.add(key)
+
+    def merge(self, other: "BloomFilter") -> None:
+        """
+        Add every key of another filter of the same size (bitwise OR).
+
+        Raises:
+            ValueError: If the filters differ in size or hash count
+        """
+        if (other.num_bits, other.num_hashes) != (self.num_bits, self.num_hashes):
+            raise ValueError(
+                f"Cannot merge a {other.num_bits}-bit filter into a {self.num_bits}-bit one"
+            )
+        merged = int.from_bytes(self._bits, "little") | int.from_bytes(other._bits, "little")
+        self._bits = bytearray(merged.to_bytes(len(self._bits), "little"))
+        # Shared keys are counted once, estimated from the bits set
+        self.count = max(self.count, other.count, self._estimated_keys())
+
+    def _estimated_keys(self) -> int:
+        """Number of distinct keys estimated from the fraction of bits set."""
+        bits_set = bin(int.from_bytes(self._bits, "little")).count("1")
+        if bits_set >= self.num_bits:
+            return self.capacity + 1
+        return round(-self.num_bits / self.num_hashes * math.log(1 - bits_set / self.num_bits))
+
+    def __contains__(self, key: Union[str, bytes]) -> bool:
+        bits = self._bits
+        return all(
+            bits[pos >> 3] & (1 << (pos & 7))
+            for pos in self._positions(self._key(key))
+        )
+
+    def __len__(self) -> int:
+        """Number of keys added (including repeats)."""
+        return self.count
+
+    @property
+    def memory_bytes(self) -> int:
+        """Size of the bit array."""
+        return len(self._bits)
+
+    @property
+    def saturated(self) -> bool:
+        """Check if more keys were added than the filter was sized for."""
+        return self.count > self.capacity
+
+    def estimated_error_rate(self) -> float:
+        """False-positive rate expected at the current fill."""
+        return (1 - math.exp(-self.num_hashes * self.count / self.num_bits)) ** self.num_hashes
+
+    def stats(self) -> Dict[str, Any]:
+        """Size and fill figures for reporting."""
+        return {
+            "entries": self.count,
+            "capacity": self.capacity,
+            "error_rate": self.error_rate,
+            "estimated_error_rate": round(self.estimated_error_rate(), 6),
+            "memory_bytes": self.memory_bytes,
+        }
+
+    def save(self, path: Union[str, Path], merge: bool = False) -> None:
+        """
+        Write the filter to disk atomically.
+
+        With merge, keys of the filter already saved at path (by another
+        process sharing the file) are merged into this one first, under
+        an exclusive lock so concurrent savers keep each other's keys. An
+        unreadable file is overwritten.
+
+        Raises:
+            ValueError: If merging with a saved filter of a different size
+        """
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_suffix(path.suffix + ".tmp")
+
+        with _locked(path):
+            if merge and path.exists():
+                try:
+                    saved = BloomFilter.load(path)
+                except (OSError, ValueError):
+                    saved = None
+                if saved is not None:
+                    self.merge(saved)
+
+            with open(tmp_path, "wb") as f:
+                f.write(HEADER.pack(
+                    MAGIC,
+                    VERSION,
+                    self.num_bits,
+                    self.num_hashes,
+                    self.count,
+                    self.capacity,
+                    self.error_rate,
+                ))
+                f.write(self._bits)
+            os.replace(tmp_path, path)
+
+    @classmethod
+    def load(cls, path: Union[str, Path]) -> "BloomFilter":
+        """
+        Read a filter written by save().
+
+        Raises:
+            ValueError: If the file is not a valid filter
+        """
+        with open(path, "rb") as f:
+            header = f.read(HEADER.size)
+            if len(header) != HEADER.size:
+                raise ValueError(f"Truncated Bloom filter file: {path}")
+            magic, version, num_bits, num_hashes, count, capacity, error_rate = HEADER.unpack(header)
+            if magic != MAGIC or version != VERSION:
+                raise ValueError(f"Not a Bloom filter file: {path}")
+            bits = bytearray(f.read())
+
+        if len(bits) != (num_bits + 7) // 8:
+            raise ValueError(f"Corrupt Bloom filter file: {path}")
+
+        bloom = cls.__new__(cls)
+        bloom.capacity = capacity
+        bloom.error_rate = error_rate
+        bloom.num_bits = num_bits
+        bloom.num_hashes = num_hashes
+        bloom.count = count
+        bloom._bits = bits
+        return bloom
+
+
+@contextmanager
+def _locked(path: Path) -> Iterator[None]:
+    """
+    Hold an exclusive lock for a filter file.
+
+    The lock is taken on a sidecar file, since save() replaces the
+    filter file itself.
+    """
+    if fcntl is None:
+        yield
+        return
+
+    with open(path.with_suffix(path.suffix + ".lock"), "a") as lock_file:
+        fcntl.flock(lock_file, fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            fcntl.flock(lock_file, fcntl.LOCK_UN)
@@ -1,6 +1,8 @@
 """CLI application using Typer."""
 
+import asyncio
 import typer
+from datetime import datetime
 from typing import Optional
 from pathlib import Path
 
@@ -48,6 +50,19 @@ def task_add(
     asyncio.run(task_add_command(url, platform, priority))
 
 
+@task_app.command("add-file")
+def task_add_file(
+    file: Path = typer.Argument(..., help="File with one URL per line"),
+    platform: str = typer.Option(..., "--platform", "-p", help="Platform name"),
+    priority: int = typer.Option(0, "--priority", help="Task priority"),
+    chunk_size: int = typer.Option(1000, "--chunk-size", help="Rows per insert chunk"),
+    db_path: str = typer.Option("/data/state/crawler.db", "--db-path", help="Database path"),
+):
+    """Add tasks for every URL in a file."""
+    from crawler.cli.commands.task import task_add_file_command
+    asyncio.run(task_add_file_command(file, platform, priority, chunk_size, db_path))
+
+
 @task_app.command("status")
 def task_status(
     task_id: str = typer.Argument(..., help="Task ID"),
@@ -63,11 +78,61 @@ def task_list(
     platform: Optional[str] = typer.Option(None, "--platform", "-p", help="Filter by platform"),
     status: Optional[str] = typer.Option(None, "--status", "-s", help="Filter by status"),
     limit: int = typer.Option(50, "--limit", "-l", help="Max tasks to show"),
+    cursor: Optional[str] = typer.Option(None, "--cursor", help="Cursor from a previous page"),
+    error: Optional[str] = typer.Option(None, "--error", help="Filter by error message substring"),
+    created_after: Optional[datetime] = typer.Option(None, "--created-after", help="Created at or after"),
+    created_before: Optional[datetime] = typer.Option(None, "--created-before", help="Created before"),
+    completed_after: Optional[datetime] = typer.Option(None, "--completed-after", help="Completed at or after"),
+    completed_before: Optional[datetime] = typer.Option(None, "--completed-before", help="Completed before"),
+    output_format: str = typer.Option("table", "--format", "-f", help="Output format (table, ndjson)"),
+    all_pages: bool = typer.Option(False, "--all", help="Stream every matching task (ndjson only)"),
     db_path: str = typer.Option("/data/state/crawler.db", "--db-path", help="Database path"),
 ):
-    """List all tasks."""
+    """List tasks."""
     from crawler.cli.commands.task import task_list_command
-    asyncio.run(task_list_command(platform, status, limit, db_path))
+    from crawler.repositories.task_repo import TaskFilter
+    filters = TaskFilter(
+        status=status,
+        platform=platform,
+        created_after=created_after,
+        created_before=created_before,
+        completed_after=completed_after,
+        completed_before=completed_before,
+        error_contains=error,
+    )
+    asyncio.run(task_list_command(filters, limit, cursor, output_format, all_pages, db_path))
+
+
+@task_app.command("reprioritize")
+def task_reprioritize(
+    platform: Optional[str] = typer.Option(None, "--platform", "-p", help="Only this platform"),
+    db_path: str = typer.Option("/data/state/crawler.db", "--db-path", help="Database path"),
+):
+    """Recompute pending task priorities (age, relationship and retry boosts)."""
+    from crawler.cli.commands.task import task_reprioritize_command
+    asyncio.run(task_reprioritize_command(platform, db_path))
+
+
+@task_app.command("reap")
+def task_reap(
+    stale_seconds: int = typer.Option(600, "--stale-seconds", help="Age after which unleased processing tasks are reclaimed"),
+    db_path: str = typer.Option("/data/state/crawler.db", "--db-path", help="Database path"),
+):
+    """Return tasks with expired leases to the queue."""
+    from crawler.cli.commands.task import task_reap_command
+    asyncio.run(task_reap_command(stale_seconds, db_path))
+
+
+@task_app.command("refresh")
+def task_refresh(
+    older_than_hours: float = typer.Option(24.0, "--older-than-hours", help="Requeue tasks last checked longer ago than this"),
+    platform: Optional[str] = typer.Option(None, "--platform", "-p", help="Only this platform"),
+    limit: Optional[int] = typer.Option(None, "--limit", "-n", help="Requeue at most this many, least recently checked first"),
+    db_path: str = typer.Option("/data/state/crawler.db", "--db-path", help="Database path"),
+):
+    """Requeue completed tasks for a re-crawl; unchanged pages are only marked checked."""
+    from crawler.cli.commands.task import task_refresh_command
+    asyncio.run(task_refresh_command(older_than_hours, platform, limit, db_path))
 
 
 # Worker commands
@@ -82,10 +147,38 @@ def worker_run(
     data_dir: str = typer.Option("/data", "--data-dir", help="Data directory"),
     config_dir: str = typer.Option("/config", "--config-dir", help="Config directory"),
     max_retries: int = typer.Option(3, "--max-retries", help="Max retries per task"),
+    batch_size: int = typer.Option(5, "--batch-size", help="Tasks claimed per batch"),
+    lease_seconds: int = typer.Option(600, "--lease-seconds", help="Claim lease duration"),
+    group_commit: bool = typer.Option(False, "--group-commit/--no-group-commit", help="Batch database commits"),
+    db_profile: Optional[str] = typer.Option(None, "--db-profile", help="SQLite tuning profile (default: $DB_PROFILE)"),
+    retry_delay: float = typer.Option(30.0, "--retry-delay", help="Base retry delay in seconds (doubles per attempt)"),
+    concurrency: int = typer.Option(1, "--concurrency", "-c", min=1, help="Tasks fetched at once (one browser each)"),
+    parse_workers: int = typer.Option(1, "--parse-workers", min=0, help="Parser processes (0: parse on a thread)"),
+    processes: int = typer.Option(1, "--processes", "-P", min=1, help="Worker processes under a supervisor"),
 ):
     """Start processing the task queue."""
+    if processes > 1:
+        from crawler.cli.commands.worker import worker_supervise_command
+        worker_supervise_command(
+            platform, db_path, data_dir, config_dir, processes, max_retries, batch_size,
+            lease_seconds, group_commit, db_profile, retry_delay, concurrency, parse_workers,
+        )
+        return
+
     from crawler.cli.commands.worker import worker_run_command
-    asyncio.run(worker_run_command(platform, db_path, data_dir, config_dir, max_retries))
+    asyncio.run(worker_run_command(
+        platform, db_path, data_dir, config_dir, max_retries, batch_size, lease_seconds,
+        group_commit, db_profile, retry_delay, concurrency, parse_workers,
+    ))
+
+
+@worker_app.command("status")
+def worker_status(
+    data_dir: str = typer.Option("/data", "--data-dir", help="Data directory"),
+):
+    """Show the status of a supervised multi-process worker."""
+    from crawler.cli.commands.worker import worker_status_command
+    worker_status_command(data_dir)
 
 
 @worker_app.command("resume")
@@ -138,6 +231,58 @@ def bulk_status(
     asyncio.run(bulk_status_command(job_id, db_path))
 
 
+# Database commands
+db_app = typer.Typer()
+app.add_typer(db_app, name="db")
+
+
+@db_app.command("recount")
+def db_recount(
+    db_path: str = typer.Option("/data/state/crawler.db", "--db-path", help="Database path"),
+):
+    """Recompute task and link counters from the source tables."""
+    from crawler.cli.commands.db import db_recount_command
+    asyncio.run(db_recount_command(db_path))
+
+
+@db_app.command("compact")
+def db_compact(
+    retention_days: int = typer.Option(30, "--retention-days", help="Keep rows finished within this many days"),
+    archive_path: Optional[str] = typer.Option(None, "--archive-path", help="Archive database (default: <db>-archive.db)"),
+    batch_size: int = typer.Option(1000, "--batch-size", help="Rows moved per transaction"),
+    full_vacuum: bool = typer.Option(False, "--full-vacuum", help="Switch to incremental auto_vacuum with a blocking VACUUM"),
+    db_path: str = typer.Option("/data/state/crawler.db", "--db-path", help="Database path"),
+):
+    """Archive finished tasks and processed links, then reclaim free pages."""
+    from crawler.cli.commands.db import db_compact_command
+    asyncio.run(db_compact_command(db_path, retention_days, archive_path, batch_size, full_vacuum))
+
+
+@db_app.command("rebuild-filter")
+def db_rebuild_filter(
+    error_rate: float = typer.Option(0.001, "--error-rate", help="Target false-positive rate"),
+    capacity: Optional[int] = typer.Option(None, "--capacity", help="Expected URLs (default: twice the current count)"),
+    db_path: str = typer.Option("/data/state/crawler.db", "--db-path", help="Database path"),
+    data_dir: str = typer.Option("/data", "--data-dir", help="Data directory"),
+):
+    """Rebuild the seen-URL Bloom filter from the tasks table."""
+    from crawler.cli.commands.db import db_rebuild_filter_command
+    asyncio.run(db_rebuild_filter_command(db_path, data_dir, error_rate, capacity))
+
+
+@db_app.command("tune")
+def db_tune(
+    benchmark: bool = typer.Option(False, "--benchmark", help="Benchmark a queue workload under each profile"),
+    profile: Optional[str] = typer.Option(None, "--profile", help="Only this profile"),
+    tasks: int = typer.Option(2000, "--tasks", help="Tasks per benchmark run"),
+    bench_dir: Optional[Path] = typer.Option(None, "--bench-dir", help="Scratch directory (default: next to the database)"),
+    db_path: str = typer.Option("/data/state/crawler.db", "--db-path", help="Database path"),
+):
+    """Show SQLite tuning profiles, or benchmark them."""
+    from crawler.cli.commands.db import db_tune_command
+    asyncio.run(db_tune_command(db_path, benchmark, profile, tasks, bench_dir))
+
+
 # Config commands
 config_app = typer.Typer()
 app.add_typer(config_app, name="config")
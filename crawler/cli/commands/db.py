@@ -0,0 +1,179 @@
+"""Database maintenance CLI commands."""
+
+import shutil
+import tempfile
+import time
+from pathlib import Path
+from typing import Optional
+
+from crawler.db.maintenance import compact_database
+from crawler.db.tuning import PROFILES, get_profile
+from crawler.lpm import LocalPersistenceManager
+from crawler.models.task import Task, TaskStatus
+
+
+async def db_recount_command(db_path: str) -> None:
+    """Recompute task and link counters."""
+    lpm = LocalPersistenceManager(db_path, "/data")
+    await lpm.initialize()
+
+    try:
+        await lpm.recount_stats()
+        stats = await lpm.get_stats()
+
+        print("✓ Counters rebuilt")
+        for status, count in stats["tasks"].items():
+            print(f"  {status}: {count}")
+        print(f"  discovered_links_unprocessed: {stats['discovered_links_unprocessed']}")
+    finally:
+        await lpm.close()
+
+
+async def db_compact_command(
+    db_path: str,
+    retention_days: int,
+    archive_path: Optional[str],
+    batch_size: int,
+    full_vacuum: bool,
+) -> None:
+    """Archive finished rows and report page counts before and after."""
+    lpm = LocalPersistenceManager(db_path, "/data")
+    await lpm.initialize()
+
+    try:
+        report = await compact_database(
+            lpm.db,
+            archive_path=archive_path,
+            retention_days=retention_days,
+            batch_size=batch_size,
+            full_vacuum=full_vacuum,
+        )
+
+        print("✓ Database compacted")
+        print(f"  Archive: {report.archive_path}")
+        print(f"  Tasks archived: {report.tasks_archived}")
+        print(f"  Links archived: {report.links_archived}")
+        print(f"  Pages: {report.page_count_before} -> {report.page_count_after}")
+        print(f"  Free pages: {report.freelist_before} -> {report.freelist_after}")
+        print(f"  Reclaimed: {report.bytes_reclaimed / 1024:.1f} KiB")
+        if report.auto_vacuum != "incremental":
+            print(f"  auto_vacuum is {report.auto_vacuum}; run with --full-vacuum to shrink the file")
+    finally:
+        await lpm.close()
+
+
+async def db_rebuild_filter_command(
+    db_path: str,
+    data_dir: str,
+    error_rate: float,
+    capacity: Optional[int],
+) -> None:
+    """Rebuild the seen-URL filter and report its size."""
+    lpm = LocalPersistenceManager(db_path, data_dir)
+    await lpm.initialize()
+
+    try:
+        bloom = await lpm.rebuild_url_filter(error_rate, capacity)
+
+        print("✓ URL filter rebuilt")
+        print(f"  Path: {lpm.url_filter_path}")
+        print(f"  Entries: {len(bloom)} (capacity {bloom.capacity})")
+        print(f"  Hash functions: {bloom.num_hashes}")
+        print(f"  Memory: {bloom.memory_bytes / 1024 / 1024:.2f} MiB")
+        print(f"  Estimated false-positive rate: {bloom.estimated_error_rate():.6f}")
+    finally:
+        await lpm.close()
+
+
+async def db_tune_command(
+    db_path: str,
+    benchmark: bool,
+    profile: Optional[str],
+    tasks: int,
+    bench_dir: Optional[Path],
+) -> None:
+    """List tuning profiles or benchmark them."""
+    from rich.console import Console
+    from rich.table import Table
+
+    console = Console()
+
+    try:
+        selected = get_profile(profile)
+    except ValueError as e:
+        print(f"✗ {e}")
+        return
+
+    profiles = [selected] if profile else list(PROFILES.values())
+
+    if not benchmark:
+        table = Table(title="SQLite tuning profiles")
+        for column in ("Profile", "synchronous", "mmap_size", "cache_size",
+                       "temp_store", "wal_autocheckpoint", "busy_timeout", "optimize"):
+            table.add_column(column)
+        for p in profiles:
+            table.add_row(
+                p.name + (" *" if p is selected else ""),
+                p.synchronous,
+                str(p.mmap_size),
+                str(p.cache_size),
+                p.temp_store,
+                str(p.wal_autocheckpoint),
+                str(p.busy_timeout),
+                f"{p.optimize_interval}s",
+            )
+        console.print(table)
+        print("* selected (--profile or $DB_PROFILE)")
+        return
+
+    # Benchmark on the database's filesystem so results reflect its storage
+    if bench_dir is None and Path(db_path).parent.is_dir():
+        bench_dir = Path(db_path).parent
+    scratch = Path(tempfile.mkdtemp(prefix="crawler-tune-", dir=bench_dir))
+
+    try:
+        print(f"Benchmarking {tasks} tasks per profile in {scratch}")
+        for p in profiles:
+            ops_per_sec = await _benchmark_profile(p.name, scratch / p.name, tasks)
+            print(f"  {p.name:<10} {ops_per_sec:>10.0f} ops/sec")
+    finally:
+        shutil.rmtree(scratch, ignore_errors=True)
+
+
+async def _benchmark_profile(profile: str, work_dir: Path, tasks: int) -> float:
+    """
+    Run the standard queue workload and return operations per second.
+
+    Each task is enqueued individually, claimed in batches of 10 and
+    completed individually, with a stats read per claimed batch - the
+    same statement mix a worker and the API generate.
+    """
+    lpm = LocalPersistenceManager(
+        str(work_dir / "bench.db"), str(work_dir), db_options={"profile": profile}
+    )
+    await lpm.initialize()
+
+    try:
+        ops = 0
+        start = time.perf_counter()
+
+        for i in range(tasks):
+            await lpm.add_task(f"https://bench.local/item/{i}", "bench", priority=i % 5)
+            ops += 1
+
+        while True:
+            claimed = await lpm.claim_tasks("bench", 10, 600, "bench-worker")
+            ops += 1
+            if not claimed:
+                break
+            for task in claimed:
+                await lpm.complete_task(task.id, f"/results/{task.id}.json")
+                ops += 1
+            await lpm.get_stats()
+            ops += 1
+
+        elapsed = time.perf_counter() - start
+    finally:
+        await lpm.close()
+
+    return ops / elapsed
@@ -6,6 +6,7 @@ from typing import Optional
 
 from crawler.lpm import LocalPersistenceManager
 from crawler.config_loader import ConfigLoader
+from crawler.http_clients import close_clients
 from crawler.scraper.scraper import Scraper
 from crawler.parser.parser import Parser
 
@@ -79,3 +80,4 @@ async def scrape_command(
         await lpm.close()
         if 'scraper' in locals():
             await scraper.close()
+        await close_clients()
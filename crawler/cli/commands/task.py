@@ -1,10 +1,13 @@
 """Task CLI commands."""
 
-from typing import Optional
+from pathlib import Path
+from typing import Optional, Iterator
+import json
 import uuid
 
 from crawler.lpm import LocalPersistenceManager
-from crawler.models.task import TaskStatus
+from crawler.models.task import Task, TaskStatus
+from crawler.repositories.task_repo import TaskFilter
 
 
 async def task_add_command(
@@ -30,6 +33,49 @@ async def task_add_command(
         await lpm.close()
 
 
+async def task_add_file_command(
+    file: Path,
+    platform: str,
+    priority: int,
+    chunk_size: int,
+    db_path: str,
+) -> None:
+    """Add tasks for every URL in a file."""
+    if not file.exists():
+        print(f"Error: File not found: {file}")
+        return
+
+    lpm = LocalPersistenceManager(db_path, "/data")
+    await lpm.initialize()
+
+    try:
+        chunks = await lpm.add_tasks(
+            _read_url_tasks(file, platform, priority),
+            chunk_size,
+        )
+        print(f"✓ Tasks added: {sum(chunks)}")
+        print(f"  File: {file}")
+        print(f"  Platform: {platform}")
+        print(f"  Chunks: {len(chunks)} ({', '.join(str(c) for c in chunks)})")
+    finally:
+        await lpm.close()
+
+
+def _read_url_tasks(file: Path, platform: str, priority: int) -> Iterator[Task]:
+    """Yield a task per URL line, skipping blanks and # comments."""
+    with open(file, "r", encoding="utf-8") as f:
+        for line in f:
+            url = line.strip()
+            if not url or url.startswith("#"):
+                continue
+            yield Task(
+                id=str(uuid.uuid4()),
+                url=url,
+                platform=platform,
+                priority=priority,
+            )
+
+
 async def task_status_command(
     task_id: str,
     db_path: str,
@@ -64,27 +110,45 @@ async def task_status_command(
 
 
 async def task_list_command(
-    platform: Optional[str],
-    status: Optional[str],
+    filters: TaskFilter,
     limit: int,
+    cursor: Optional[str],
+    output_format: str,
+    all_pages: bool,
     db_path: str,
 ) -> None:
-    """List all tasks."""
+    """List tasks one page at a time, or stream all of them as NDJSON."""
     from rich.console import Console
     from rich.table import Table
 
+    if output_format not in ("table", "ndjson"):
+        print(f"✗ Unknown format: {output_format}")
+        return
+    if all_pages and output_format != "ndjson":
+        print("✗ --all requires --format ndjson")
+        return
+
     console = Console()
 
     lpm = LocalPersistenceManager(db_path, "/data")
     await lpm.initialize()
 
     try:
-        # Get tasks
-        if status:
-            status_enum = TaskStatus(status)
-            tasks = await lpm.task_repo.get_by_status(status_enum, platform, limit)
-        else:
-            tasks = await lpm.task_repo.get_all(platform, limit)
+        try:
+            if all_pages:
+                async for task in lpm.task_repo.iter_all(filters):
+                    print(json.dumps(task.to_dict()))
+                return
+
+            tasks, next_cursor = await lpm.task_repo.list_page(filters, cursor, limit)
+        except ValueError as e:
+            print(f"✗ {e}")
+            return
+
+        if output_format == "ndjson":
+            for task in tasks:
+                print(json.dumps(task.to_dict()))
+            return
 
         if not tasks:
             print("No tasks found")
@@ -110,6 +174,56 @@ async def task_list_command(
             )
 
         console.print(table)
+        if next_cursor:
+            print(f"Next page: --cursor {next_cursor}")
+
+    finally:
+        await lpm.close()
+
 
+async def task_reap_command(
+    stale_seconds: int,
+    db_path: str,
+) -> None:
+    """Return tasks with expired leases to the queue."""
+    lpm = LocalPersistenceManager(db_path, "/data")
+    await lpm.initialize()
+
+    try:
+        reclaimed = await lpm.reap_expired_leases(stale_seconds)
+        print(f"✓ Reclaimed {reclaimed} tasks with expired leases")
+    finally:
+        await lpm.close()
+
+
+async def task_reprioritize_command(platform: Optional[str], db_path: str) -> None:
+    """Recompute pending task priorities."""
+    lpm = LocalPersistenceManager(db_path, "/data")
+    await lpm.initialize()
+
+    try:
+        changed = await lpm.reprioritize_tasks(platform=platform)
+        print(f"✓ Reprioritized {changed} pending tasks")
+    finally:
+        await lpm.close()
+
+
+async def task_refresh_command(
+    older_than_hours: float,
+    platform: Optional[str],
+    limit: Optional[int],
+    db_path: str,
+) -> None:
+    """Requeue completed tasks not checked recently."""
+    from datetime import timedelta
+
+    lpm = LocalPersistenceManager(db_path, "/data")
+    await lpm.initialize()
+
+    try:
+        requeued = await lpm.refresh_tasks(
+            timedelta(hours=older_than_hours), platform=platform, limit=limit
+        )
+        print(f"✓ Requeued {requeued} tasks not checked in {older_than_hours:g}h")
     finally:
         await lpm.close()
@@ -14,6 +14,13 @@ async def worker_run_command(
     data_dir: str,
     config_dir: str,
     max_retries: int,
+    batch_size: int = 5,
+    lease_seconds: int = 600,
+    group_commit: bool = False,
+    db_profile: Optional[str] = None,
+    retry_delay: float = 30.0,
+    concurrency: int = 1,
+    parse_workers: int = 1,
 ) -> None:
     """Start processing the task queue."""
     # Load config
@@ -25,16 +32,35 @@ async def worker_run_command(
         return
 
     # Initialize LPM
-    lpm = LocalPersistenceManager(db_path, data_dir)
+    lpm = LocalPersistenceManager(
+        db_path,
+        data_dir,
+        db_options={"group_commit": group_commit, "profile": db_profile},
+    )
     await lpm.initialize()
 
     # Create and run worker
-    worker = Worker(lpm, config, max_retries=max_retries)
+    worker = Worker(
+        lpm,
+        config,
+        max_retries=max_retries,
+        batch_size=batch_size,
+        lease_seconds=lease_seconds,
+        retry_base_delay=retry_delay,
+        concurrency=concurrency,
+        parse_workers=parse_workers,
+    )
 
     print(f"Starting worker for platform: {platform}")
+    print(f"Worker ID: {worker.worker_id}")
     print(f"Database: {db_path}")
     print(f"Data dir: {data_dir}")
     print(f"Max retries: {max_retries}")
+    print(f"Batch size: {worker.batch_size}")
+    print(f"Concurrency: {worker.concurrency}")
+    print(f"Parse workers: {worker.parse_workers}")
+    print(f"Group commit: {'on' if group_commit else 'off'}")
+    print(f"DB profile: {lpm.db.profile.name}")
     print("Press Ctrl+C to stop")
     print()
 
@@ -46,6 +72,90 @@ async def worker_run_command(
         await lpm.close()
 
 
+def worker_supervise_command(
+    platform: str,
+    db_path: str,
+    data_dir: str,
+    config_dir: str,
+    processes: int,
+    max_retries: int,
+    batch_size: int = 5,
+    lease_seconds: int = 600,
+    group_commit: bool = False,
+    db_profile: Optional[str] = None,
+    retry_delay: float = 30.0,
+    concurrency: int = 1,
+    parse_workers: int = 1,
+) -> None:
+    """Run several worker processes under a supervisor."""
+    from crawler.supervisor import WorkerSupervisor
+
+    config = ConfigLoader(config_dir).load(platform)
+    if not config:
+        print(f"Error: Platform '{platform}' not found in {config_dir}")
+        return
+
+    supervisor = WorkerSupervisor(
+        platform,
+        db_path,
+        data_dir,
+        config_dir,
+        processes,
+        db_options={"group_commit": group_commit, "profile": db_profile},
+        worker_options={
+            "max_retries": max_retries,
+            "batch_size": batch_size,
+            "lease_seconds": lease_seconds,
+            "retry_base_delay": retry_delay,
+            "concurrency": concurrency,
+            "parse_workers": parse_workers,
+        },
+    )
+
+    print(f"Starting supervisor for platform: {platform}")
+    print(f"Supervisor ID: {supervisor.supervisor_id}")
+    print(f"Database: {db_path}")
+    print(f"Processes: {processes}")
+    print(f"Concurrency per process: {concurrency}")
+    print(f"Status: crawler worker status --data-dir {data_dir}")
+    print("Press Ctrl+C to stop")
+    print()
+
+    supervisor.run()
+
+    status = supervisor.status()
+    print(f"\n✓ Supervisor stopped. Processed: {status['processed']}, "
+          f"Errors: {status['errors']}, Restarts: {status['restarts']}")
+
+
+def worker_status_command(data_dir: str) -> None:
+    """Show the aggregated status written by a supervisor."""
+    from crawler.state import StateSerializer
+    from crawler.supervisor import STATUS_NAME
+
+    status = StateSerializer(f"{data_dir}/state").load_json(STATUS_NAME)
+    if status is None:
+        print(f"✗ No supervisor status in {data_dir}/state")
+        return
+
+    print(f"Supervisor: {status['supervisor_id']} (pid {status['pid']})")
+    print(f"  Platform: {status['platform']}")
+    print(f"  Updated: {status['updated_at']}")
+    print(f"  Processes: {status['alive']}/{status['processes']} alive")
+    print(f"  Processed: {status['processed']}")
+    print(f"  Errors: {status['errors']}")
+    print(f"  Restarts: {status['restarts']}")
+    print()
+    for child in status["children"]:
+        state = f"pid {child['pid']}" if child["alive"] else (
+            "finished" if child["finished"] else f"down (exit {child['last_exit_code']})"
+        )
+        print(
+            f"  {child['worker_id']}: {state}, processed {child['processed']}, "
+            f"errors {child['errors']}, restarts {child['restarts']}"
+        )
+
+
 async def worker_resume_command(
     platform: str,
     db_path: str,
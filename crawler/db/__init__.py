@@ -1,10 +1,20 @@
 """Database package."""
 
 from crawler.db.connection import get_connection, init_database
-from crawler.db.schema import SCHEMA_SQL
+from crawler.db.maintenance import CompactReport, compact_database
+from crawler.db.tuning import PROFILES, TuningProfile, get_profile
+from crawler.db.schema import SCHEMA_SQL, COLUMN_MIGRATIONS, INDEX_SQL, RECOUNT_STATEMENTS
 
 __all__ = [
     "get_connection",
     "init_database",
+    "CompactReport",
+    "compact_database",
+    "PROFILES",
+    "TuningProfile",
+    "get_profile",
     "SCHEMA_SQL",
+    "COLUMN_MIGRATIONS",
+    "INDEX_SQL",
+    "RECOUNT_STATEMENTS",
 ]
@@ -1,30 +1,77 @@
 """Database connection manager."""
 
 import aiosqlite
+from contextlib import asynccontextmanager
+from contextvars import ContextVar
 from pathlib import Path
-from typing import Optional
+from typing import AsyncIterator, List, Optional
 import asyncio
 
-from crawler.db.schema import SCHEMA_SQL
+from crawler.db.schema import SCHEMA_SQL, COLUMN_MIGRATIONS, INDEX_SQL, RECOUNT_STATEMENTS
+from crawler.db.tuning import get_profile
+from crawler.urls import url_hash
+
+
+# Connection whose explicit transaction the current task is running inside
+_transaction_owner: ContextVar[Optional["DatabaseConnection"]] = ContextVar(
+    "_transaction_owner", default=None
+)
 
 
 class DatabaseConnection:
-    """Manages SQLite database connections."""
+    """
+    Manages SQLite database connections.
+
+    Group commit (opt-in): commit() calls from repositories are queued and
+    committed together every commit_interval_ms milliseconds or every
+    commit_max_statements commits, whichever comes first. Callers that need
+    atomicity or immediate durability use ``async with db.transaction():``.
+
+    Read pool: read_pool_size extra connections opened with PRAGMA
+    query_only serve read-only queries (read_fetchone/read_fetchall), so
+    API reads do not queue behind worker writes. WAL mode lets them run
+    concurrently with the single writer connection.
+
+    Tuning: profile names a TuningProfile (default: $DB_PROFILE) whose
+    pragmas are applied to every connection. PRAGMA optimize runs on
+    connect, every optimize_interval seconds, and on disconnect.
+    """
 
     _instance: Optional["DatabaseConnection"] = None
     _lock: asyncio.Lock = asyncio.Lock()
 
-    def __init__(self, db_path: str):
+    def __init__(
+        self,
+        db_path: str,
+        group_commit: bool = False,
+        commit_interval_ms: int = 50,
+        commit_max_statements: int = 100,
+        read_pool_size: int = 2,
+        profile: Optional[str] = None,
+    ):
         self.db_path = db_path
+        self.group_commit = group_commit
+        self.commit_interval_ms = commit_interval_ms
+        self.commit_max_statements = commit_max_statements
+        self.read_pool_size = 0 if db_path == ":memory:" else read_pool_size
+        self.profile = get_profile(profile)
         self._db: Optional[aiosqlite.Connection] = None
+        self._readers: List[aiosqlite.Connection] = []
+        self._reader_queue: Optional[asyncio.Queue] = None
+
+        # Serializes explicit transactions against other writers
+        self._tx_lock = asyncio.Lock()
+        self._pending_commits = 0
+        self._flush_task: Optional[asyncio.Task] = None
+        self._optimize_task: Optional[asyncio.Task] = None
 
     @classmethod
-    async def get_instance(cls, db_path: str) -> "DatabaseConnection":
+    async def get_instance(cls, db_path: str, **options) -> "DatabaseConnection":
         """Get singleton instance."""
         if cls._instance is None:
             async with cls._lock:
                 if cls._instance is None:
-                    cls._instance = cls(db_path)
+                    cls._instance = cls(db_path, **options)
                     await cls._instance.connect()
         return cls._instance
 
@@ -37,19 +84,171 @@ class DatabaseConnection:
         self._db = await aiosqlite.connect(self.db_path)
         self._db.row_factory = aiosqlite.Row
 
+        # Only takes effect on a new, empty database; lets compaction
+        # release free pages with PRAGMA incremental_vacuum
+        await self._db.execute("PRAGMA auto_vacuum=INCREMENTAL")
+
         # Enable WAL mode for better concurrency
         await self._db.execute("PRAGMA journal_mode=WAL")
-        await self._db.execute("PRAGMA synchronous=NORMAL")
+        for pragma in self.profile.pragmas():
+            await self._db.execute(pragma)
 
         # Initialize schema
+        counters_existed = await self._table_exists("task_counters")
         await self._db.executescript(SCHEMA_SQL)
+        added = await self._apply_migrations()
+        if not await self._index_exists("idx_discovered_links_url_unique"):
+            await self._dedupe_links()
+        await self._db.executescript(INDEX_SQL)
+        if ("tasks", "url_hash") in added:
+            await self._backfill_url_hashes()
+        if ("tasks", "base_priority") in added:
+            # Existing priorities carry no boosts yet
+            await self._db.execute("UPDATE tasks SET base_priority = priority")
+        if not counters_existed:
+            # Seed counters for databases created before they existed
+            for statement in RECOUNT_STATEMENTS:
+                await self._db.execute(statement)
         await self._db.commit()
 
+        # Analyze tables whose statistics are missing or stale, with a cap
+        # on the work done so connect stays fast
+        await self._db.executescript("PRAGMA optimize=0x10002")
+        if self.profile.optimize_interval > 0:
+            self._optimize_task = asyncio.create_task(self._optimize_loop())
+
+        await self._open_readers()
+
+    async def _open_readers(self) -> None:
+        """Open the read-only connection pool."""
+        self._reader_queue = asyncio.Queue()
+        for _ in range(self.read_pool_size):
+            reader = await aiosqlite.connect(self.db_path)
+            reader.row_factory = aiosqlite.Row
+            await reader.execute("PRAGMA query_only=ON")
+            for pragma in self.profile.pragmas():
+                await reader.execute(pragma)
+            self._readers.append(reader)
+            self._reader_queue.put_nowait(reader)
+
+    async def _table_exists(self, name: str) -> bool:
+        """Check if a table exists."""
+        async with self._db.execute(
+            "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = ?",
+            (name,),
+        ) as cursor:
+            return await cursor.fetchone() is not None
+
+    async def _index_exists(self, name: str) -> bool:
+        """Check if an index exists."""
+        async with self._db.execute(
+            "SELECT 1 FROM sqlite_master WHERE type = 'index' AND name = ?",
+            (name,),
+        ) as cursor:
+            return await cursor.fetchone() is not None
+
+    async def _dedupe_links(self) -> None:
+        """
+        Remove duplicate discovered links recorded before URLs were unique.
+
+        The oldest row per URL is kept, marked processed if any duplicate was.
+        """
+        await self._db.execute(
+            """
+            UPDATE discovered_links SET processed = TRUE
+            WHERE processed = FALSE AND url IN (
+                SELECT url FROM discovered_links WHERE processed = TRUE
+            )
+            """
+        )
+        await self._db.execute(
+            """
+            DELETE FROM discovered_links
+            WHERE id NOT IN (SELECT MIN(id) FROM discovered_links GROUP BY url)
+            """
+        )
+
+    async def _apply_migrations(self) -> set:
+        """
+        Add columns missing from databases created by older versions.
+
+        Returns:
+            Set of (table, column) pairs that were added
+        """
+        added = set()
+        for table, columns in COLUMN_MIGRATIONS.items():
+            async with self._db.execute(f"PRAGMA table_info({table})") as cursor:
+                existing = {row["name"] for row in await cursor.fetchall()}
+
+            for name, definition in columns:
+                if name not in existing:
+                    await self._db.execute(
+                        f"ALTER TABLE {table} ADD COLUMN {name} {definition}"
+                    )
+                    added.add((table, name))
+        return added
+
+    async def _backfill_url_hashes(self, batch_size: int = 5000) -> None:
+        """
+        Compute url_hash for tasks created before the column existed.
+
+        The oldest task per URL gets the hash; later duplicates conflict on
+        the unique index and keep a NULL hash.
+        """
+        last_rowid = 0
+        while True:
+            async with self._db.execute(
+                """
+                SELECT rowid, url FROM tasks
+                WHERE rowid > ?
+                ORDER BY rowid
+                LIMIT ?
+                """,
+                (last_rowid, batch_size),
+            ) as cursor:
+                rows = await cursor.fetchall()
+
+            if not rows:
+                break
+
+            await self._db.executemany(
+                "UPDATE OR IGNORE tasks SET url_hash = ? WHERE rowid = ?",
+                [(url_hash(row["url"]), row["rowid"]) for row in rows],
+            )
+            last_rowid = rows[-1]["rowid"]
+
+    async def _optimize_loop(self) -> None:
+        """Run PRAGMA optimize periodically on the long-lived writer."""
+        while True:
+            await asyncio.sleep(self.profile.optimize_interval)
+            await self.optimize()
+
+    async def optimize(self) -> None:
+        """Refresh query planner statistics where SQLite thinks it helps."""
+        await self.executescript("PRAGMA optimize")
+
     async def disconnect(self) -> None:
         """Close database connection."""
+        if self._optimize_task is not None:
+            self._optimize_task.cancel()
+            try:
+                await self._optimize_task
+            except asyncio.CancelledError:
+                pass
+            self._optimize_task = None
+
+        for reader in self._readers:
+            await reader.close()
+        self._readers = []
+        self._reader_queue = None
+
         if self._db:
+            await self.flush()
+            await self.optimize()
             await self._db.close()
             self._db = None
+        if DatabaseConnection._instance is self:
+            DatabaseConnection._instance = None
 
     @property
     def connection(self) -> aiosqlite.Connection:
@@ -60,13 +259,20 @@ class DatabaseConnection:
 
     async def execute(self, query: str, parameters: tuple = None) -> aiosqlite.Cursor:
         """Execute a query."""
-        if parameters:
-            return await self._db.execute(query, parameters)
-        return await self._db.execute(query)
+        async with self._write_guard():
+            if parameters:
+                return await self._db.execute(query, parameters)
+            return await self._db.execute(query)
 
     async def executemany(self, query: str, parameters: list) -> aiosqlite.Cursor:
         """Execute many queries."""
-        return await self._db.executemany(query, parameters)
+        async with self._write_guard():
+            return await self._db.executemany(query, parameters)
+
+    async def executescript(self, script: str) -> aiosqlite.Cursor:
+        """Execute a SQL script, stepping every statement to completion."""
+        async with self._write_guard():
+            return await self._db.executescript(script)
 
     async def fetchone(self, query: str, parameters: tuple = None) -> Optional[aiosqlite.Row]:
         """Fetch one row."""
@@ -84,10 +290,131 @@ class DatabaseConnection:
         async with self._db.execute(query) as cursor:
             return await cursor.fetchall()
 
+    async def read_fetchone(
+        self, query: str, parameters: tuple = None
+    ) -> Optional[aiosqlite.Row]:
+        """Fetch one row using a pooled read-only connection."""
+        async with self._reader() as db:
+            async with db.execute(query, parameters or ()) as cursor:
+                return await cursor.fetchone()
+
+    async def read_fetchall(self, query: str, parameters: tuple = None) -> list:
+        """Fetch all rows using a pooled read-only connection."""
+        async with self._reader() as db:
+            async with db.execute(query, parameters or ()) as cursor:
+                return await cursor.fetchall()
+
+    @asynccontextmanager
+    async def _reader(self) -> AsyncIterator[aiosqlite.Connection]:
+        """
+        Check out a read-only connection.
+
+        Falls back to the writer when there is no pool, or when the writer
+        holds uncommitted changes (e.g. queued group commits) that the
+        readers could not see yet.
+        """
+        if (
+            not self._readers
+            or self._db.in_transaction
+            or self._owns_transaction()
+        ):
+            yield self._db
+            return
+
+        reader = await self._reader_queue.get()
+        try:
+            yield reader
+        finally:
+            self._reader_queue.put_nowait(reader)
+
     async def commit(self) -> None:
-        """Commit transaction."""
+        """
+        Commit transaction.
+
+        Inside transaction() this is a no-op (the block commits on exit).
+        With group commit enabled the commit is queued and flushed with
+        others.
+        """
+        if self._owns_transaction():
+            return
+
+        if not self.group_commit:
+            async with self._tx_lock:
+                await self._commit_now()
+            return
+
+        self._pending_commits += 1
+        if self._pending_commits >= self.commit_max_statements:
+            await self.flush()
+        elif self._flush_task is None:
+            self._flush_task = asyncio.create_task(self._flush_later())
+
+    async def flush(self) -> None:
+        """Commit queued group-commit writes immediately."""
+        if self._owns_transaction():
+            return
+        async with self._tx_lock:
+            if self._db is not None and self._db.in_transaction:
+                await self._commit_now()
+
+    async def rollback(self) -> None:
+        """Roll back transaction."""
+        await self._db.rollback()
+
+    @asynccontextmanager
+    async def transaction(self) -> AsyncIterator["DatabaseConnection"]:
+        """
+        Run statements atomically and commit immediately on exit.
+
+        Other coroutines' writes wait until the block finishes; nested
+        blocks join the outer transaction. Rolls back on exception.
+        """
+        if self._owns_transaction():
+            yield self
+            return
+
+        async with self._tx_lock:
+            token = _transaction_owner.set(self)
+            try:
+                # Commit queued writes so a rollback cannot discard them
+                if self._db.in_transaction:
+                    await self._commit_now()
+                yield self
+            except BaseException:
+                await self._db.rollback()
+                raise
+            else:
+                await self._commit_now()
+            finally:
+                _transaction_owner.reset(token)
+
+    def _owns_transaction(self) -> bool:
+        """Check if the current task is inside this connection's transaction()."""
+        return _transaction_owner.get() is self
+
+    @asynccontextmanager
+    async def _write_guard(self) -> AsyncIterator[None]:
+        """Keep statements out of another task's open transaction."""
+        if self._owns_transaction():
+            yield
+            return
+        async with self._tx_lock:
+            yield
+
+    async def _commit_now(self) -> None:
+        """Commit and reset the group-commit queue."""
+        if self._flush_task is not None and self._flush_task is not asyncio.current_task():
+            self._flush_task.cancel()
+        self._flush_task = None
+        self._pending_commits = 0
         await self._db.commit()
 
+    async def _flush_later(self) -> None:
+        """Flush queued commits after the group-commit interval."""
+        await asyncio.sleep(self.commit_interval_ms / 1000)
+        self._flush_task = None
+        await self.flush()
+
     async def close(self) -> None:
         """Close connection."""
         await self.disconnect()
@@ -97,12 +424,12 @@ class DatabaseConnection:
 _db_connection: Optional[DatabaseConnection] = None
 
 
-async def get_connection(db_path: str) -> DatabaseConnection:
+async def get_connection(db_path: str, **options) -> DatabaseConnection:
     """Get database connection."""
-    return await DatabaseConnection.get_instance(db_path)
+    return await DatabaseConnection.get_instance(db_path, **options)
 
 
-async def init_database(db_path: str) -> DatabaseConnection:
+async def init_database(db_path: str, **options) -> DatabaseConnection:
     """Initialize database."""
-    conn = await get_connection(db_path)
+    conn = await get_connection(db_path, **options)
     return conn
@@ -0,0 +1,212 @@
+"""Database maintenance: archival of finished rows and space reclamation."""
+
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import List, Optional
+
+from crawler.db.connection import DatabaseConnection
+
+
+# Rows eligible for archival, keyed by table. Each condition is applied
+# together with "finished before the retention cutoff".
+ARCHIVE_RULES = {
+    "tasks": (
+        "status IN ('completed', 'failed')",
+        "COALESCE(completed_at, created_at)",
+    ),
+    "discovered_links": (
+        "processed = 1",
+        "added_at",
+    ),
+}
+
+# auto_vacuum pragma values
+AUTO_VACUUM_MODES = {0: "none", 1: "full", 2: "incremental"}
+
+
+@dataclass
+class CompactReport:
+    """Before/after figures from a compaction run."""
+    page_size: int
+    page_count_before: int
+    page_count_after: int
+    freelist_before: int
+    freelist_after: int
+    auto_vacuum: str
+    archive_path: str
+    tasks_archived: int = 0
+    links_archived: int = 0
+
+    @property
+    def pages_reclaimed(self) -> int:
+        """Pages returned to the filesystem."""
+        return self.page_count_before - self.page_count_after
+
+    @property
+    def bytes_reclaimed(self) -> int:
+        """Bytes returned to the filesystem."""
+        return self.pages_reclaimed * self.page_size
+
+
+def default_archive_path(db_path: str) -> str:
+    """Get the archive database path next to the main database."""
+    path = Path(db_path)
+    return str(path.with_name(f"{path.stem}-archive{path.suffix or '.db'}"))
+
+
+async def compact_database(
+    db: DatabaseConnection,
+    archive_path: Optional[str] = None,
+    retention_days: int = 30,
+    batch_size: int = 1000,
+    full_vacuum: bool = False,
+) -> CompactReport:
+    """
+    Move finished rows into an archive database and reclaim free pages.
+
+    Completed/failed tasks and processed discovered links older than the
+    retention window are copied into the attached archive database and
+    deleted from the hot tables, one batch per transaction so workers are
+    only blocked briefly. Archived URLs no longer count as known for
+    deduplication, so they can be queued again.
+
+    Free pages are released with PRAGMA incremental_vacuum. Databases
+    created before auto_vacuum was enabled need one full_vacuum run
+    (a blocking VACUUM) to switch to incremental mode.
+
+    Args:
+        db: Connected database
+        archive_path: Archive database file (default: <db>-archive.db)
+        retention_days: Keep rows finished within this many days
+        batch_size: Rows moved per transaction
+        full_vacuum: Convert to auto_vacuum=INCREMENTAL and run VACUUM
+
+    Returns:
+        CompactReport with page counts before and after
+    """
+    if db.db_path == ":memory:":
+        raise ValueError("Cannot compact an in-memory database")
+
+    archive_path = archive_path or default_archive_path(db.db_path)
+    cutoff = (datetime.utcnow() - timedelta(days=retention_days)).isoformat()
+
+    # ATTACH/VACUUM cannot run inside a transaction
+    await db.flush()
+
+    page_size = await _pragma(db, "page_size")
+    page_count_before = await _pragma(db, "page_count")
+    freelist_before = await _pragma(db, "freelist_count")
+
+    moved = {}
+    await db.execute("ATTACH DATABASE ? AS archive", (archive_path,))
+    try:
+        for table, (condition, finished_column) in ARCHIVE_RULES.items():
+            columns = await _prepare_archive_table(db, table)
+            moved[table] = await _archive_rows(
+                db, table, columns, condition, finished_column, cutoff, batch_size
+            )
+    finally:
+        await db.execute("DETACH DATABASE archive")
+
+    if full_vacuum:
+        await db.execute("PRAGMA auto_vacuum = INCREMENTAL")
+        await db.execute("VACUUM")
+    elif await _pragma(db, "auto_vacuum") == 2:
+        # execute() would step the pragma once and free a single page
+        await db.executescript("PRAGMA incremental_vacuum")
+
+    # Fold the WAL back into the database file and truncate it
+    await db.fetchall("PRAGMA wal_checkpoint(TRUNCATE)")
+
+    return CompactReport(
+        page_size=page_size,
+        page_count_before=page_count_before,
+        page_count_after=await _pragma(db, "page_count"),
+        freelist_before=freelist_before,
+        freelist_after=await _pragma(db, "freelist_count"),
+        auto_vacuum=AUTO_VACUUM_MODES.get(await _pragma(db, "auto_vacuum"), "unknown"),
+        archive_path=archive_path,
+        tasks_archived=moved["tasks"],
+        links_archived=moved["discovered_links"],
+    )
+
+
+async def _pragma(db: DatabaseConnection, name: str) -> int:
+    """Read an integer pragma from the writer connection."""
+    row = await db.fetchone(f"PRAGMA {name}")
+    return row[0]
+
+
+async def _prepare_archive_table(db: DatabaseConnection, table: str) -> List[str]:
+    """
+    Create the archive copy of a table and add any newer columns.
+
+    Returns:
+        Column names shared by the hot and archive tables
+    """
+    await db.execute(
+        f"CREATE TABLE IF NOT EXISTS archive.{table} AS SELECT * FROM main.{table} WHERE 0"
+    )
+
+    main_columns = await db.fetchall(f"PRAGMA main.table_info({table})")
+    archive_columns = {
+        row["name"] for row in await db.fetchall(f"PRAGMA archive.table_info({table})")
+    }
+    for row in main_columns:
+        if row["name"] not in archive_columns:
+            await db.execute(
+                f"ALTER TABLE archive.{table} ADD COLUMN {row['name']} {row['type']}"
+            )
+
+    return [row["name"] for row in main_columns]
+
+
+async def _archive_rows(
+    db: DatabaseConnection,
+    table: str,
+    columns: List[str],
+    condition: str,
+    finished_column: str,
+    cutoff: str,
+    batch_size: int,
+) -> int:
+    """Move eligible rows in rowid order, one batch per transaction."""
+    column_list = ", ".join(columns)
+    moved = 0
+    last_rowid = 0
+
+    while True:
+        async with db.transaction():
+            rows = await db.fetchall(
+                f"""
+                SELECT rowid FROM main.{table}
+                WHERE rowid > ? AND {condition}
+                  AND julianday({finished_column}) < julianday(?)
+                ORDER BY rowid
+                LIMIT ?
+                """,
+                (last_rowid, cutoff, batch_size),
+            )
+            if not rows:
+                break
+
+            rowids = [row[0] for row in rows]
+            placeholders = ",".join("?" * len(rowids))
+            await db.execute(
+                f"""
+                INSERT INTO archive.{table} ({column_list})
+                SELECT {column_list} FROM main.{table}
+                WHERE rowid IN ({placeholders})
+                """,
+                tuple(rowids),
+            )
+            await db.execute(
+                f"DELETE FROM main.{table} WHERE rowid IN ({placeholders})",
+                tuple(rowids),
+            )
+
+        moved += len(rowids)
+        last_rowid = rowids[-1]
+
+    return moved
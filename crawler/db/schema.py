@@ -14,7 +14,18 @@ CREATE TABLE IF NOT EXISTS tasks (
     result_path TEXT,
     error TEXT,
     retry_count INTEGER DEFAULT 0,
-    discovered_links_count INTEGER DEFAULT 0
+    discovered_links_count INTEGER DEFAULT 0,
+    worker_id TEXT,
+    lease_expires_at TIMESTAMP,
+    heartbeat_at TIMESTAMP,
+    url_hash TEXT,
+    next_attempt_at TIMESTAMP,
+    base_priority INTEGER,
+    relationship_type TEXT,
+    etag TEXT,
+    last_modified TEXT,
+    content_hash TEXT,
+    last_checked_at TIMESTAMP
 );
 
 -- Bulk jobs table
@@ -67,11 +78,135 @@ CREATE TABLE IF NOT EXISTS platform_configs (
     error TEXT
 );
 
+-- Task counts per platform and status (maintained by triggers)
+CREATE TABLE IF NOT EXISTS task_counters (
+    platform TEXT NOT NULL,
+    status TEXT NOT NULL,
+    count INTEGER NOT NULL DEFAULT 0,
+    PRIMARY KEY (platform, status)
+);
+
+-- Discovered link counts by processed flag (maintained by triggers)
+CREATE TABLE IF NOT EXISTS link_counters (
+    processed INTEGER PRIMARY KEY,
+    count INTEGER NOT NULL DEFAULT 0
+);
+
+-- Counter triggers
+CREATE TRIGGER IF NOT EXISTS trg_tasks_count_insert AFTER INSERT ON tasks
+BEGIN
+    INSERT INTO task_counters (platform, status, count)
+    VALUES (NEW.platform, NEW.status, 1)
+    ON CONFLICT(platform, status) DO UPDATE SET count = count + 1;
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_tasks_count_delete AFTER DELETE ON tasks
+BEGIN
+    UPDATE task_counters SET count = count - 1
+    WHERE platform = OLD.platform AND status = OLD.status;
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_tasks_count_update AFTER UPDATE OF status, platform ON tasks
+WHEN OLD.status != NEW.status OR OLD.platform != NEW.platform
+BEGIN
+    UPDATE task_counters SET count = count - 1
+    WHERE platform = OLD.platform AND status = OLD.status;
+    INSERT INTO task_counters (platform, status, count)
+    VALUES (NEW.platform, NEW.status, 1)
+    ON CONFLICT(platform, status) DO UPDATE SET count = count + 1;
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_links_count_insert AFTER INSERT ON discovered_links
+BEGIN
+    INSERT INTO link_counters (processed, count)
+    VALUES (COALESCE(NEW.processed, 0), 1)
+    ON CONFLICT(processed) DO UPDATE SET count = count + 1;
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_links_count_delete AFTER DELETE ON discovered_links
+BEGIN
+    UPDATE link_counters SET count = count - 1
+    WHERE processed = COALESCE(OLD.processed, 0);
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_links_count_update AFTER UPDATE OF processed ON discovered_links
+WHEN COALESCE(OLD.processed, 0) != COALESCE(NEW.processed, 0)
+BEGIN
+    UPDATE link_counters SET count = count - 1
+    WHERE processed = COALESCE(OLD.processed, 0);
+    INSERT INTO link_counters (processed, count)
+    VALUES (COALESCE(NEW.processed, 0), 1)
+    ON CONFLICT(processed) DO UPDATE SET count = count + 1;
+END;
+
 -- Indexes for performance
-CREATE INDEX IF NOT EXISTS idx_tasks_status_priority ON tasks(status, priority DESC);
+CREATE INDEX IF NOT EXISTS idx_tasks_status_order ON tasks(status, priority DESC, created_at, id);
+CREATE INDEX IF NOT EXISTS idx_tasks_order ON tasks(priority DESC, created_at, id);
 CREATE INDEX IF NOT EXISTS idx_tasks_platform ON tasks(platform);
 CREATE INDEX IF NOT EXISTS idx_bulk_jobs_status ON bulk_jobs(status);
 CREATE INDEX IF NOT EXISTS idx_discovered_links_source ON discovered_links(source_task_id);
 CREATE INDEX IF NOT EXISTS idx_discovered_links_processed ON discovered_links(processed);
 CREATE INDEX IF NOT EXISTS idx_ingestion_jobs_status ON ingestion_jobs(status);
 """
+
+# Columns added after the initial release. Databases created by older
+# versions are upgraded with ALTER TABLE on connect.
+COLUMN_MIGRATIONS = {
+    "tasks": [
+        ("worker_id", "TEXT"),
+        ("lease_expires_at", "TIMESTAMP"),
+        ("heartbeat_at", "TIMESTAMP"),
+        ("url_hash", "TEXT"),
+        ("next_attempt_at", "TIMESTAMP"),
+        ("base_priority", "INTEGER"),
+        ("relationship_type", "TEXT"),
+        ("etag", "TEXT"),
+        ("last_modified", "TEXT"),
+        ("content_hash", "TEXT"),
+        ("last_checked_at", "TIMESTAMP"),
+    ],
+}
+
+# Indexes on migrated columns (created after COLUMN_MIGRATIONS are applied)
+INDEX_SQL = """
+CREATE INDEX IF NOT EXISTS idx_tasks_lease ON tasks(status, lease_expires_at);
+CREATE UNIQUE INDEX IF NOT EXISTS idx_tasks_platform_url_hash ON tasks(platform, url_hash);
+-- Claim order for due tasks (next_attempt_at IS NULL); delayed retries
+-- sit in a separate key range until they are promoted
+CREATE INDEX IF NOT EXISTS idx_tasks_due ON tasks(status, next_attempt_at, priority DESC, created_at, id);
+
+-- Claim orders used by crawler.strategies
+CREATE INDEX IF NOT EXISTS idx_tasks_due_checked ON tasks(status, next_attempt_at, last_checked_at, created_at, id);
+CREATE INDEX IF NOT EXISTS idx_tasks_due_base ON tasks(status, next_attempt_at, base_priority DESC, created_at, id);
+CREATE INDEX IF NOT EXISTS idx_tasks_due_discovered ON tasks(status, next_attempt_at, priority DESC, created_at, id)
+    WHERE relationship_type IS NOT NULL;
+
+-- Refresh sweeps over completed tasks, least recently checked first
+CREATE INDEX IF NOT EXISTS idx_tasks_checked ON tasks(status, last_checked_at);
+
+-- One row per link URL, so concurrent writers cannot record a link twice
+-- (duplicates from older versions are removed first, see DatabaseConnection)
+CREATE UNIQUE INDEX IF NOT EXISTS idx_discovered_links_url_unique ON discovered_links(url);
+
+-- Superseded by idx_tasks_status_order
+DROP INDEX IF EXISTS idx_tasks_status_priority;
+-- Superseded by idx_discovered_links_url_unique
+DROP INDEX IF EXISTS idx_discovered_links_url;
+-- Superseded by idx_tasks_due_checked
+DROP INDEX IF EXISTS idx_tasks_due_age;
+"""
+
+# Recompute counter tables from the source tables
+RECOUNT_STATEMENTS = [
+    "DELETE FROM task_counters",
+    """
+    INSERT INTO task_counters (platform, status, count)
+    SELECT platform, status, COUNT(*) FROM tasks GROUP BY platform, status
+    """,
+    "DELETE FROM link_counters",
+    """
+    INSERT INTO link_counters (processed, count)
+    SELECT COALESCE(processed, 0), COUNT(*) FROM discovered_links
+    GROUP BY COALESCE(processed, 0)
+    """,
+]
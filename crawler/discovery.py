@@ -1,11 +1,15 @@
 """Discovery engine for ripple effect."""
 
 import logging
-from typing import List, Optional
+import uuid
+from typing import Dict, List, Optional
 
 from crawler.lpm import LocalPersistenceManager
 from crawler.config_loader import PlatformConfig
 from crawler.models.parsed_result import DiscoveredLink
+from crawler.models.task import Task
+from crawler.priority import PriorityCalculator
+from crawler.urls import url_hash
 
 logger = logging.getLogger(__name__)
 
@@ -27,6 +31,7 @@ class DiscoveryEngine:
     ):
         self.lpm = lpm
         self.config = config
+        self.priority_calculator = PriorityCalculator()
 
     async def process_discovered_links(
         self,
@@ -36,6 +41,9 @@ class DiscoveryEngine:
         """
         Process discovered links and add to queue.
         
+        The whole batch is deduplicated with one indexed lookup on the
+        normalized URL hash, covering tasks in every status.
+        
         Args:
             source_task_id: ID of task that discovered the links
             links: List of discovered links
@@ -43,43 +51,52 @@ class DiscoveryEngine:
         Returns:
             Count of links added to queue
         """
-        added = 0
-
-        for link in links:
-            # Check if already processed or in queue
-            is_duplicate = await self._is_duplicate(link.url)
-            if is_duplicate:
-                logger.debug(f"Skipping duplicate link: {link.url}")
-                continue
-
-            # Add to discovered links table
-            await self.lpm.add_discovered_links(source_task_id, [link])
-
-            # Add as new task with adjusted priority
-            base_priority = 0  # Could come from config
-            priority = base_priority + link.priority_delta
-
-            await self.lpm.add_task(
+        new_links = await self._filter_new_links(links)
+        if not new_links:
+            return 0
+
+        # Add to discovered links table
+        await self.lpm.add_discovered_links(source_task_id, new_links)
+
+        # Add as new tasks with adjusted priority; the relationship type is
+        # stored so periodic reprioritization keeps applying its delta
+        base_priority = self.priority_calculator.base_priority
+        tasks = [
+            Task(
+                id=str(uuid.uuid4()),
                 url=link.url,
                 platform=self.config.platform,
-                priority=priority,
+                priority=self.priority_calculator.calculate(link.relationship_type.value),
+                base_priority=base_priority,
+                relationship_type=link.relationship_type.value,
             )
+            for link in new_links
+        ]
+        added = sum(await self.lpm.add_tasks(tasks))
 
-            added += 1
-            logger.debug(f"Added discovered link: {link.url} (priority: {priority})")
-
+        logger.debug(f"Added {added} discovered links from task {source_task_id}")
         return added
 
-    async def _is_duplicate(self, url: str) -> bool:
-        """Check if URL is already in queue or processed."""
-        # Check pending tasks
-        pending = await self.lpm.get_pending_tasks(limit=1000)
-        for task in pending:
-            if task.url == url:
-                return True
-
-        # TODO: Check processed results (would need index)
-        return False
+    async def _filter_new_links(
+        self, links: List[DiscoveredLink]
+    ) -> List[DiscoveredLink]:
+        """Drop links already queued or repeated within the batch."""
+        # Collapse repeats, keeping the highest priority delta
+        by_hash: Dict[str, DiscoveredLink] = {}
+        for link in links:
+            key = url_hash(link.url)
+            current = by_hash.get(key)
+            if current is None or link.priority_delta > current.priority_delta:
+                by_hash[key] = link
+
+        known = await self.lpm.get_known_urls(
+            self.config.platform,
+            [link.url for link in by_hash.values()],
+        )
+        for url in known:
+            logger.debug(f"Skipping duplicate link: {url}")
+
+        return [link for link in by_hash.values() if link.url not in known]
 
     async def get_unprocessed_links(
         self,
@@ -0,0 +1,260 @@
+"""Process-wide registry of pooled HTTP clients."""
+
+import asyncio
+import importlib.util
+import logging
+from collections import defaultdict
+from dataclasses import dataclass, field
+from typing import Any, Dict, Optional
+
+import httpx
+
+from crawler.config_loader import PlatformConfig
+
+logger = logging.getLogger(__name__)
+
+# HTTP/2 needs the optional h2 package (httpx[http2])
+HTTP2_AVAILABLE = importlib.util.find_spec("h2") is not None
+
+
+@dataclass
+class PoolSettings:
+    """Connection pool settings of one named client."""
+    max_connections: int = 100
+    max_keepalive: int = 20
+    keepalive_expiry: float = 30.0
+    max_per_host: int = 6
+    http2: bool = True
+    timeout: float = 30.0
+    follow_redirects: bool = False
+
+
+def pool_settings(config: PlatformConfig, **overrides: Any) -> Dict[str, Any]:
+    """
+    Get a platform's HTTP pool settings.
+
+    Read from "http_pool" in manifest.json ("scraping") and schedule.json,
+    schedule.json taking precedence; overrides win over both.
+    """
+    settings: Dict[str, Any] = {}
+    scraping = config.manifest.get("scraping") or {}
+    for source in (scraping, config.schedule or {}):
+        settings.update(source.get("http_pool") or {})
+    settings.update(overrides)
+    return {k: v for k, v in settings.items() if k in PoolSettings.__dataclass_fields__}
+
+
+@dataclass
+class PoolMetrics:
+    """Request and connection counters of one client."""
+    requests: int = 0
+    connections_opened: int = 0
+    host_waits: int = 0
+    http_versions: Dict[str, int] = field(default_factory=lambda: defaultdict(int))
+
+    def reuse_ratio(self) -> float:
+        """Fraction of requests served on an existing connection."""
+        if not self.requests:
+            return 0.0
+        return max(0.0, 1.0 - self.connections_opened / self.requests)
+
+
+class _ReleasingStream(httpx.AsyncByteStream):
+    """Response body that frees its host slot once closed."""
+
+    def __init__(self, stream: httpx.AsyncByteStream, release):
+        self._stream = stream
+        self._release = release
+
+    async def __aiter__(self):
+        async for chunk in self._stream:
+            yield chunk
+
+    async def aclose(self) -> None:
+        try:
+            await self._stream.aclose()
+        finally:
+            self._release()
+
+
+class HostLimitedTransport(httpx.AsyncBaseTransport):
+    """
+    Transport capping concurrent requests per host.
+
+    httpx limits connections for the whole pool only; this keeps one
+    busy host from taking every connection. A slot is held until the
+    response body is closed. Also counts requests and new connections.
+    """
+
+    def __init__(self, transport: httpx.AsyncBaseTransport, max_per_host: int):
+        self.transport = transport
+        self.max_per_host = max_per_host
+        self.metrics = PoolMetrics()
+        self._slots: Dict[str, asyncio.Semaphore] = {}
+
+    def _slot(self, host: str) -> asyncio.Semaphore:
+        if host not in self._slots:
+            self._slots[host] = asyncio.Semaphore(self.max_per_host)
+        return self._slots[host]
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        slot = self._slot(request.url.host)
+        if slot.locked():
+            self.metrics.host_waits += 1
+        await slot.acquire()
+
+        # httpcore reports connection setup through the trace extension
+        outer_trace = request.extensions.get("trace")
+
+        async def trace(event: str, info: Dict[str, Any]) -> None:
+            if event == "connection.connect_tcp.complete":
+                self.metrics.connections_opened += 1
+            if outer_trace is not None:
+                await outer_trace(event, info)
+
+        request.extensions["trace"] = trace
+        self.metrics.requests += 1
+
+        try:
+            response = await self.transport.handle_async_request(request)
+        except BaseException:
+            slot.release()
+            raise
+
+        version = response.extensions.get("http_version", b"HTTP/1.1")
+        self.metrics.http_versions[version.decode() if isinstance(version, bytes) else version] += 1
+
+        released = False
+
+        def release() -> None:
+            nonlocal released
+            if not released:
+                released = True
+                slot.release()
+
+        if response.is_closed:
+            # Body already in memory, nothing left to hold the slot for
+            release()
+        else:
+            response.stream = _ReleasingStream(response.stream, release)
+        return response
+
+    def connections(self) -> Dict[str, int]:
+        """Open and idle connections in the underlying pool."""
+        pool = getattr(self.transport, "_pool", None)
+        conns = getattr(pool, "connections", [])
+        open_conns = [c for c in conns if not c.is_closed()]
+        return {
+            "open": len(open_conns),
+            "idle": sum(1 for c in open_conns if c.is_idle()),
+        }
+
+    async def aclose(self) -> None:
+        await self.transport.aclose()
+
+
+@dataclass
+class _Entry:
+    client: httpx.AsyncClient
+    transport: HostLimitedTransport
+    settings: PoolSettings
+    loop: asyncio.AbstractEventLoop
+
+
+class HttpClientRegistry:
+    """
+    Owns long-lived, named httpx clients shared within a process.
+
+    Callers ask for a client by name ("fetch", "webhooks", ...) and get
+    the same instance, and so the same keep-alive connections, every
+    time. Settings apply when a client is created; later callers share
+    it as is. Clients are bound to the event loop they were created on,
+    and are replaced if asked for from another loop.
+    """
+
+    def __init__(self):
+        self._clients: Dict[str, _Entry] = {}
+
+    def get(
+        self,
+        name: str = "default",
+        transport: Optional[httpx.AsyncBaseTransport] = None,
+        **settings: Any,
+    ) -> httpx.AsyncClient:
+        """
+        Get the named client, creating it on first use.
+
+        Args:
+            name: Client name
+            transport: Transport to wrap instead of a pooled HTTP transport
+            **settings: PoolSettings fields used if the client is created
+        """
+        loop = asyncio.get_running_loop()
+        entry = self._clients.get(name)
+        if entry is not None and not entry.client.is_closed and entry.loop is loop:
+            return entry.client
+
+        config = PoolSettings(**settings)
+        http2 = config.http2 and HTTP2_AVAILABLE
+        if config.http2 and not HTTP2_AVAILABLE:
+            logger.debug(f"h2 not installed, HTTP client '{name}' uses HTTP/1.1")
+
+        inner = transport or httpx.AsyncHTTPTransport(
+            http2=http2,
+            limits=httpx.Limits(
+                max_connections=config.max_connections,
+                max_keepalive_connections=config.max_keepalive,
+                keepalive_expiry=config.keepalive_expiry,
+            ),
+        )
+        limited = HostLimitedTransport(inner, config.max_per_host)
+        client = httpx.AsyncClient(
+            transport=limited,
+            timeout=config.timeout,
+            follow_redirects=config.follow_redirects,
+        )
+        self._clients[name] = _Entry(client, limited, config, loop)
+        return client
+
+    def metrics(self) -> Dict[str, Dict[str, Any]]:
+        """Pool metrics per client."""
+        metrics = {}
+        for name, entry in self._clients.items():
+            counters = entry.transport.metrics
+            metrics[name] = {
+                **entry.transport.connections(),
+                "requests": counters.requests,
+                "connections_opened": counters.connections_opened,
+                "reuse_ratio": round(counters.reuse_ratio(), 3),
+                "host_waits": counters.host_waits,
+                "http_versions": dict(counters.http_versions),
+            }
+        return metrics
+
+    async def close(self) -> None:
+        """Close all clients owned by the current event loop."""
+        loop = asyncio.get_running_loop()
+        for name, entry in list(self._clients.items()):
+            if entry.loop is loop:
+                await entry.client.aclose()
+            # Clients of other (finished) loops cannot be closed from here
+            del self._clients[name]
+
+
+# The process-wide registry
+registry = HttpClientRegistry()
+
+
+def get_client(name: str = "default", **settings: Any) -> httpx.AsyncClient:
+    """Get a shared client from the process-wide registry."""
+    return registry.get(name, **settings)
+
+
+def pool_metrics() -> Dict[str, Dict[str, Any]]:
+    """Pool metrics of the process-wide registry."""
+    return registry.metrics()
+
+
+async def close_clients() -> None:
+    """Close the process-wide registry's clients."""
+    await registry.close()
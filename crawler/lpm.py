@@ -1,19 +1,29 @@
 """Local Persistence Manager - Core state and persistence layer."""
 
 import asyncio
+import logging
 from pathlib import Path
-from typing import Optional, Dict, Any, List
-from datetime import datetime
+from typing import Optional, Dict, Any, List, Iterable, Set, Tuple, Union
+from datetime import datetime, timedelta
 import uuid
 
+from crawler.bloom import BloomFilter
 from crawler.db.connection import DatabaseConnection, init_database
-from crawler.repositories.task_repo import TaskRepository
+from crawler.repositories.task_repo import CLAIM_ORDER, TaskRepository
 from crawler.repositories.bulk_job_repo import BulkJobRepository
 from crawler.repositories.link_repo import LinkRepository
-from crawler.models.task import Task, TaskStatus
+from crawler.models.task import PageFingerprint, Task, TaskStatus
 from crawler.models.bulk_job import BulkJob, BulkJobStatus
 from crawler.models.parsed_result import DiscoveredLink, RelationshipType
 from crawler.models.ingestion_job import IngestionJob, IngestionJobStatus
+from crawler.priority import PriorityCalculator
+from crawler.urls import url_hash
+
+logger = logging.getLogger(__name__)
+
+# Seen-URL filter defaults
+URL_FILTER_ERROR_RATE = 0.001
+URL_FILTER_MIN_CAPACITY = 100_000
 
 
 class LocalPersistenceManager:
@@ -27,18 +37,29 @@ class LocalPersistenceManager:
     - Result storage coordination
     """
 
-    def __init__(self, db_path: str, data_dir: str):
+    def __init__(
+        self,
+        db_path: str,
+        data_dir: str,
+        db_options: Optional[Dict[str, Any]] = None,
+    ):
         self.db_path = db_path
         self.data_dir = Path(data_dir)
+        self.db_options = db_options or {}
         self.db: Optional[DatabaseConnection] = None
         self.task_repo: Optional[TaskRepository] = None
         self.bulk_job_repo: Optional[BulkJobRepository] = None
         self.link_repo: Optional[LinkRepository] = None
         self._lock = asyncio.Lock()
+        # Set whenever tasks become pending, to wake idle consumers
+        self._tasks_added = asyncio.Event()
+        # Probabilistic prefilter of URL hashes with a task or link (see load_url_filter)
+        self.url_filter: Optional[BloomFilter] = None
+        self.url_filter_path = self.data_dir / "state" / "seen_urls.bloom"
 
     async def initialize(self) -> None:
         """Initialize database connection and repositories."""
-        self.db = await init_database(self.db_path)
+        self.db = await init_database(self.db_path, **self.db_options)
         self.task_repo = TaskRepository(self.db)
         self.bulk_job_repo = BulkJobRepository(self.db)
         self.link_repo = LinkRepository(self.db)
@@ -50,9 +71,81 @@ class LocalPersistenceManager:
 
     async def close(self) -> None:
         """Close database connection."""
+        if self.url_filter is not None:
+            self.save_url_filter()
         if self.db:
             await self.db.close()
 
+    # === Seen-URL Filter ===
+
+    async def load_url_filter(
+        self, error_rate: float = URL_FILTER_ERROR_RATE
+    ) -> BloomFilter:
+        """
+        Load the seen-URL filter from disk, rebuilding it if missing or full.
+
+        Once loaded, duplicate checks only query SQLite for URLs the filter
+        reports as probably seen. Tasks added by other processes are not
+        in this process's filter; the unique index still rejects them.
+        """
+        bloom = None
+        if self.url_filter_path.exists():
+            try:
+                bloom = BloomFilter.load(self.url_filter_path)
+            except (OSError, ValueError) as e:
+                logger.warning(f"Discarding unreadable URL filter: {e}")
+
+        if bloom is None or bloom.saturated:
+            return await self.rebuild_url_filter(error_rate)
+
+        self._set_url_filter(bloom)
+        return bloom
+
+    async def rebuild_url_filter(
+        self,
+        error_rate: float = URL_FILTER_ERROR_RATE,
+        capacity: Optional[int] = None,
+    ) -> BloomFilter:
+        """Rebuild the seen-URL filter from the tasks and discovered_links tables."""
+        if capacity is None:
+            counts = await self.task_repo.count_all_by_status()
+            row = await self.db.read_fetchone("SELECT COALESCE(SUM(count), 0) FROM link_counters")
+            # Room to double before the filter saturates
+            capacity = max(URL_FILTER_MIN_CAPACITY, 2 * (sum(counts.values()) + row[0]))
+
+        bloom = BloomFilter(capacity, error_rate)
+        async for hash_ in self.task_repo.iter_url_hashes():
+            bloom.add(hash_)
+        async for url in self.link_repo.iter_urls():
+            bloom.add(url_hash(url))
+
+        self._set_url_filter(bloom)
+        self.save_url_filter(merge=False)
+        return bloom
+
+    def save_url_filter(self, merge: bool = True) -> None:
+        """
+        Write the seen-URL filter to disk.
+
+        Every process sharing the data directory keeps its own copy, so by
+        default the copy is merged with the file rather than replacing URLs
+        only other processes have seen. If the file was rebuilt with another
+        size in the meantime the two cannot be merged; the file is then
+        removed so the next load rebuilds it from the database.
+        """
+        if self.url_filter is None:
+            return
+        try:
+            self.url_filter.save(self.url_filter_path, merge=merge)
+        except ValueError as e:
+            logger.warning(f"Discarding URL filter that cannot be merged: {e}")
+            self.url_filter_path.unlink(missing_ok=True)
+
+    def _set_url_filter(self, bloom: BloomFilter) -> None:
+        """Install a filter in the LPM and the repositories that consult it."""
+        self.url_filter = bloom
+        self.link_repo.url_filter = bloom
+
     # === Task Queue Operations ===
 
     async def add_task(
@@ -62,7 +155,12 @@ class LocalPersistenceManager:
         priority: int = 0,
         task_id: Optional[str] = None,
     ) -> str:
-        """Add a task to the queue. Returns task ID."""
+        """
+        Add a task to the queue. Returns task ID.
+
+        If the platform already has a task for the same URL, no task is
+        created and the existing task's ID is returned.
+        """
         if task_id is None:
             task_id = str(uuid.uuid4())
 
@@ -72,28 +170,217 @@ class LocalPersistenceManager:
             platform=platform,
             priority=priority,
         )
-        await self.task_repo.create(task)
+        if self.url_filter is not None:
+            hash_ = url_hash(url)
+            # Repeats would count towards saturation
+            if hash_ not in self.url_filter:
+                self.url_filter.add(hash_)
+        if not await self.task_repo.create(task):
+            existing = await self.task_repo.get_by_url(platform, url)
+            if existing:
+                return existing.id
+        self._tasks_added.set()
         return task_id
 
+    async def add_tasks(
+        self, tasks: Iterable[Task], chunk_size: int = 1000
+    ) -> List[int]:
+        """Add many tasks in one transaction. Returns counts added per chunk."""
+        if self.url_filter is not None:
+            tasks = list(tasks)
+            hashes = (url_hash(task.url) for task in tasks)
+            self.url_filter.update(h for h in hashes if h not in self.url_filter)
+        counts = await self.task_repo.create_many(tasks, chunk_size)
+        if sum(counts):
+            self._tasks_added.set()
+        return counts
+
+    async def wait_for_tasks(self, timeout: float) -> bool:
+        """
+        Wait until tasks are added through this LPM.
+
+        Returns:
+            True if woken by new tasks, False on timeout
+        """
+        try:
+            await asyncio.wait_for(self._tasks_added.wait(), timeout)
+            return True
+        except asyncio.TimeoutError:
+            return False
+        finally:
+            self._tasks_added.clear()
+
+    async def get_known_urls(self, platform: str, urls: Iterable[str]) -> Set[str]:
+        """
+        Return the URLs that already have a task (in any status).
+
+        With the URL filter loaded, URLs it has never seen skip the query.
+        """
+        by_hash = {url_hash(url): url for url in urls}
+        candidates = by_hash.keys()
+        if self.url_filter is not None:
+            candidates = [h for h in candidates if h in self.url_filter]
+        existing = await self.task_repo.existing_url_hashes(platform, candidates)
+        return {by_hash[h] for h in existing}
+
     async def get_next_task(self, platform: Optional[str] = None) -> Optional[Task]:
         """Get next pending task."""
         return await self.task_repo.get_next_pending(platform)
 
-    async def complete_task(self, task_id: str, result_path: str) -> None:
-        """Mark task as completed."""
-        await self.task_repo.mark_completed(task_id, result_path)
+    async def claim_tasks(
+        self,
+        platform: Optional[str],
+        limit: int,
+        lease_seconds: int,
+        worker_id: str,
+        where: Optional[str] = None,
+        where_params: tuple = (),
+        order_by: Optional[str] = None,
+    ) -> List[Task]:
+        """
+        Atomically claim a batch of pending tasks for a worker.
+
+        where/order_by narrow and order the candidates (see crawler.strategies).
+        """
+        return await self.task_repo.claim_batch(
+            platform,
+            limit,
+            lease_seconds,
+            worker_id,
+            where=where,
+            where_params=where_params,
+            order_by=order_by or CLAIM_ORDER,
+        )
+
+    async def release_tasks(self, task_ids: List[str], worker_id: str) -> int:
+        """Return claimed but unprocessed tasks to the queue."""
+        released = await self.task_repo.release(task_ids, worker_id)
+        if released:
+            self._tasks_added.set()
+        return released
+
+    async def release_worker_tasks(self, worker_id: str) -> int:
+        """
+        Release all tasks held by a worker ID, e.g. left by a crashed
+        process that is restarted under the same ID. Returns count released.
+        """
+        released = await self.task_repo.release_worker(worker_id)
+        if released:
+            self._tasks_added.set()
+        return released
+
+    async def renew_leases(self, worker_id: str, lease_seconds: int) -> int:
+        """Heartbeat: extend leases of tasks held by a worker."""
+        return await self.task_repo.renew_leases(worker_id, lease_seconds)
+
+    async def reap_expired_leases(self, stale_after_seconds: int = 600) -> int:
+        """Return tasks with expired leases to the queue. Returns count reclaimed."""
+        reclaimed = await self.task_repo.reap_expired(stale_after_seconds)
+        if reclaimed:
+            self._tasks_added.set()
+        return reclaimed
+
+    async def complete_task(
+        self, task_id: str, result_path: str, worker_id: Optional[str] = None
+    ) -> bool:
+        """
+        Mark task as completed.
+
+        With a worker ID, only while that worker holds the task's lease;
+        returns False if it no longer does.
+        """
+        return await self.task_repo.mark_completed(task_id, result_path, worker_id)
+
+    async def complete_tasks(
+        self,
+        results: List[Tuple[str, str]],
+        fingerprints: Optional[List[Tuple[str, PageFingerprint]]] = None,
+        worker_id: Optional[str] = None,
+    ) -> Set[str]:
+        """
+        Mark several tasks completed. Takes (task_id, result_path) pairs,
+        and optionally (task_id, fingerprint) pairs of the fetched pages.
+
+        With a worker ID, tasks whose lease it lost are left alone.
+        Returns the IDs of the completed tasks.
+        """
+        async with self.db.transaction():
+            completed = await self.task_repo.mark_completed_batch(results, worker_id)
+            if fingerprints:
+                await self.task_repo.record_fingerprints(
+                    [(task_id, fp) for task_id, fp in fingerprints if task_id in completed]
+                )
+        return completed
+
+    async def complete_unchanged(
+        self,
+        fingerprints: List[Tuple[str, PageFingerprint]],
+        worker_id: Optional[str] = None,
+    ) -> Set[str]:
+        """
+        Mark tasks completed whose page is unchanged since the last fetch.
+
+        With a worker ID, tasks whose lease it lost are left alone.
+        Returns the IDs of the completed tasks.
+        """
+        return await self.task_repo.mark_unchanged_batch(fingerprints, worker_id)
+
+    async def refresh_tasks(
+        self,
+        older_than: timedelta,
+        platform: Optional[str] = None,
+        limit: Optional[int] = None,
+    ) -> int:
+        """Requeue completed tasks not checked within older_than. Returns count requeued."""
+        requeued = await self.task_repo.requeue_completed(
+            datetime.utcnow() - older_than, platform, limit
+        )
+        if requeued:
+            self._tasks_added.set()
+        return requeued
+
+    async def fail_task(
+        self, task_id: str, error: str, worker_id: Optional[str] = None
+    ) -> bool:
+        """
+        Mark task as failed.
 
-    async def fail_task(self, task_id: str, error: str) -> None:
-        """Mark task as failed."""
-        await self.task_repo.mark_failed(task_id, error)
+        With a worker ID, only while that worker holds the task's lease;
+        returns False if it no longer does.
+        """
+        return await self.task_repo.mark_failed(task_id, error, worker_id)
 
     async def start_task(self, task_id: str) -> bool:
         """Mark task as processing. Returns False if task not found."""
         return await self.task_repo.mark_processing(task_id)
 
-    async def retry_task(self, task_id: str) -> int:
-        """Increment retry count. Returns new retry count."""
-        return await self.task_repo.increment_retry(task_id)
+    async def retry_task(
+        self, task_id: str, delay_seconds: float = 0, worker_id: Optional[str] = None
+    ) -> Optional[int]:
+        """
+        Requeue a task for retry, not claimable for delay_seconds.
+
+        With a worker ID, only while that worker holds the task's lease.
+        Returns new retry count, or None if the lease was lost.
+        """
+        retry_count = await self.task_repo.increment_retry(task_id, delay_seconds, worker_id)
+        if retry_count is not None and delay_seconds <= 0:
+            self._tasks_added.set()
+        return retry_count
+
+    async def reprioritize_tasks(
+        self,
+        calculator: Optional[PriorityCalculator] = None,
+        platform: Optional[str] = None,
+    ) -> int:
+        """Apply age, relationship and retry boosts to pending tasks. Returns count changed."""
+        return await self.task_repo.reprioritize(
+            calculator or PriorityCalculator(), platform
+        )
+
+    async def next_retry_at(self, platform: Optional[str] = None) -> Optional[datetime]:
+        """Get when the earliest delayed retry becomes due, if any."""
+        return await self.task_repo.next_attempt_at(platform)
 
     async def get_task(self, task_id: str) -> Optional[Task]:
         """Get task by ID."""
@@ -107,12 +394,19 @@ class LocalPersistenceManager:
         """Get count of pending tasks."""
         return await self.task_repo.count_pending()
 
+    async def recount_stats(self) -> None:
+        """Rebuild the incrementally maintained task and link counters."""
+        await self.task_repo.recount()
+
     # === Discovered Link Operations ===
 
     async def add_discovered_links(
         self, source_task_id: str, links: List[DiscoveredLink]
     ) -> int:
         """Add discovered links. Returns count added."""
+        for link in links:
+            if link.source_task_id is None:
+                link.source_task_id = source_task_id
         return await self.link_repo.add_batch(links)
 
     async def get_unprocessed_links(
@@ -195,6 +489,39 @@ class LocalPersistenceManager:
         self, task_id: str, platform: str, data: Dict[str, Any]
     ) -> str:
         """Save task result to JSON. Returns result path."""
+        return self._write_result(task_id, platform, data)
+
+    async def save_results(
+        self,
+        platform: str,
+        items: List[Tuple[str, Dict[str, Any], Optional[str]]],
+    ) -> List[str]:
+        """
+        Save several task results, and their raw HTML, on a worker thread.
+
+        Args:
+            platform: Platform name
+            items: (task_id, result data, raw HTML or None) tuples
+
+        Returns:
+            Result paths, in item order
+        """
+        def write_all() -> List[str]:
+            paths = []
+            for task_id, data, html in items:
+                paths.append(self._write_result(task_id, platform, data))
+                if html is not None:
+                    self._write_text(html, self.get_raw_html_path(task_id, platform))
+            return paths
+
+        return await asyncio.to_thread(write_all)
+
+    async def save_text(self, text: str, path: Union[str, Path]) -> str:
+        """Save text (e.g. raw HTML) to a file. Returns the path."""
+        return self._write_text(text, Path(path))
+
+    def _write_result(self, task_id: str, platform: str, data: Dict[str, Any]) -> str:
+        """Write a result JSON file."""
         import json
 
         result_path = self.get_result_path(task_id, platform)
@@ -205,6 +532,13 @@ class LocalPersistenceManager:
 
         return str(result_path)
 
+    def _write_text(self, text: str, path: Path) -> str:
+        """Write a text file, creating its directory."""
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with open(path, "w", encoding="utf-8") as f:
+            f.write(text)
+        return str(path)
+
     async def get_result(
         self, task_id: str, platform: str
     ) -> Optional[Dict[str, Any]]:
@@ -273,18 +607,13 @@ class LocalPersistenceManager:
 
     async def get_stats(self) -> Dict[str, Any]:
         """Get queue and job statistics."""
-        pending = await self.task_repo.count_by_status(TaskStatus.PENDING)
-        processing = await self.task_repo.count_by_status(TaskStatus.PROCESSING)
-        completed = await self.task_repo.count_by_status(TaskStatus.COMPLETED)
-        failed = await self.task_repo.count_by_status(TaskStatus.FAILED)
+        counts = await self.task_repo.count_all_by_status()
 
         return {
             "tasks": {
-                "pending": pending,
-                "processing": processing,
-                "completed": completed,
-                "failed": failed,
-                "total": pending + processing + completed + failed,
+                **counts,
+                "total": sum(counts.values()),
             },
             "discovered_links_unprocessed": await self.link_repo.count_unprocessed(),
+            "url_filter": self.url_filter.stats() if self.url_filter is not None else None,
         }
@@ -1,6 +1,6 @@
 """Models package."""
 
-from crawler.models.task import Task, TaskStatus
+from crawler.models.task import PageFingerprint, Task, TaskStatus
 from crawler.models.scraped_content import ScrapedContent
 from crawler.models.parsed_result import ParsedResult, DiscoveredLink
 from crawler.models.bulk_job import BulkJob, BulkJobStatus
@@ -11,6 +11,7 @@ from crawler.models.external_links import ExternalLinks
 __all__ = [
     "Task",
     "TaskStatus",
+    "PageFingerprint",
     "ScrapedContent",
     "ParsedResult",
     "DiscoveredLink",
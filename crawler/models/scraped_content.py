@@ -1,5 +1,6 @@
 """Scraped content model."""
 
+import hashlib
 from dataclasses import dataclass, field
 from typing import Optional, List, Dict, Any
 
@@ -22,6 +23,15 @@ class ScrapedContent:
         """Set metadata field."""
         self.metadata[key] = value
 
+    @property
+    def not_modified(self) -> bool:
+        """Check if the server answered 304 Not Modified (html is empty)."""
+        return bool(self.metadata.get("not_modified"))
+
+    def content_hash(self) -> str:
+        """Get the SHA-256 of the HTML, for change detection."""
+        return hashlib.sha256(self.html.encode("utf-8")).hexdigest()
+
     @property
     def size(self) -> int:
         """Get HTML size in bytes."""
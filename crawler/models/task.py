@@ -14,6 +14,14 @@ class TaskStatus(str, Enum):
     FAILED = "failed"
 
 
+@dataclass
+class PageFingerprint:
+    """Validators and content hash identifying a version of a page."""
+    etag: Optional[str] = None
+    last_modified: Optional[str] = None
+    content_hash: Optional[str] = None
+
+
 @dataclass
 class Task:
     """Represents a crawling task."""
@@ -29,12 +37,31 @@ class Task:
     error: Optional[str] = None
     retry_count: int = 0
     discovered_links_count: int = 0
+    worker_id: Optional[str] = None
+    lease_expires_at: Optional[datetime] = None
+    heartbeat_at: Optional[datetime] = None
+    next_attempt_at: Optional[datetime] = None
+    # Priority before relationship, age and retry boosts (see PriorityCalculator)
+    base_priority: Optional[int] = None
+    relationship_type: Optional[str] = None
+    # Fingerprint of the last fetched page, for conditional re-fetch
+    etag: Optional[str] = None
+    last_modified: Optional[str] = None
+    content_hash: Optional[str] = None
+    last_checked_at: Optional[datetime] = None
+
+    @property
+    def fingerprint(self) -> "PageFingerprint":
+        """Fingerprint of the page as last fetched."""
+        return PageFingerprint(self.etag, self.last_modified, self.content_hash)
 
     def __post_init__(self):
         if self.created_at is None:
             self.created_at = datetime.utcnow()
         if isinstance(self.status, str):
             self.status = TaskStatus(self.status)
+        if self.base_priority is None:
+            self.base_priority = self.priority
 
     def mark_processing(self) -> None:
         """Mark task as processing."""
@@ -72,6 +99,16 @@ class Task:
             "error": self.error,
             "retry_count": self.retry_count,
             "discovered_links_count": self.discovered_links_count,
+            "worker_id": self.worker_id,
+            "lease_expires_at": self.lease_expires_at.isoformat() if self.lease_expires_at else None,
+            "heartbeat_at": self.heartbeat_at.isoformat() if self.heartbeat_at else None,
+            "next_attempt_at": self.next_attempt_at.isoformat() if self.next_attempt_at else None,
+            "base_priority": self.base_priority,
+            "relationship_type": self.relationship_type,
+            "etag": self.etag,
+            "last_modified": self.last_modified,
+            "content_hash": self.content_hash,
+            "last_checked_at": self.last_checked_at.isoformat() if self.last_checked_at else None,
         }
 
     @classmethod
@@ -90,4 +127,14 @@ class Task:
             error=data.get("error"),
             retry_count=data.get("retry_count", 0),
             discovered_links_count=data.get("discovered_links_count", 0),
+            worker_id=data.get("worker_id"),
+            lease_expires_at=datetime.fromisoformat(data["lease_expires_at"]) if data.get("lease_expires_at") else None,
+            heartbeat_at=datetime.fromisoformat(data["heartbeat_at"]) if data.get("heartbeat_at") else None,
+            next_attempt_at=datetime.fromisoformat(data["next_attempt_at"]) if data.get("next_attempt_at") else None,
+            base_priority=data.get("base_priority"),
+            relationship_type=data.get("relationship_type"),
+            etag=data.get("etag"),
+            last_modified=data.get("last_modified"),
+            content_hash=data.get("content_hash"),
+            last_checked_at=datetime.fromisoformat(data["last_checked_at"]) if data.get("last_checked_at") else None,
         )
@@ -0,0 +1,145 @@
+"""Building blocks for the worker's fetch → parse → persist pipeline."""
+
+import asyncio
+import multiprocessing
+import os
+import threading
+import time
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterator, Optional, Tuple
+
+from crawler.config_loader import PlatformConfig
+from crawler.models.parsed_result import ParsedResult
+from crawler.models.scraped_content import ScrapedContent
+from crawler.models.task import PageFingerprint, Task
+from crawler.parser.parser import Parser
+
+
+@dataclass
+class PipelineItem:
+    """A task moving through the pipeline stages."""
+    task: Task
+    started: float = field(default_factory=time.monotonic)
+    content: Optional[ScrapedContent] = None
+    result: Optional[ParsedResult] = None
+    fingerprint: Optional[PageFingerprint] = None
+    # Same page as last fetched: skips parse, persist only marks it checked
+    unchanged: bool = False
+    # Still holds its fetch slot (given up early during a challenge wait)
+    holds_slot: bool = True
+
+
+def fingerprint_content(task: Task, content: ScrapedContent) -> Tuple[PageFingerprint, bool]:
+    """
+    Fingerprint fetched content and compare it with the task's last fetch.
+
+    Returns:
+        Tuple of (fingerprint, whether the page is unchanged)
+    """
+    etag = content.metadata.get("etag")
+    last_modified = content.metadata.get("last_modified")
+    if content.not_modified:
+        return PageFingerprint(etag, last_modified, task.content_hash), True
+
+    content_hash = content.content_hash()
+    fingerprint = PageFingerprint(etag, last_modified, content_hash)
+    return fingerprint, content_hash == task.content_hash
+
+
+@dataclass
+class StageStats:
+    """Throughput and utilization of one pipeline stage."""
+    name: str
+    workers: int = 1
+    items: int = 0
+    failed: int = 0
+    busy_seconds: float = 0.0
+    started_at: float = field(default_factory=time.monotonic)
+
+    @contextmanager
+    def busy(self) -> Iterator[None]:
+        """Count the time spent inside the block as busy."""
+        started = time.monotonic()
+        try:
+            yield
+        finally:
+            self.busy_seconds += time.monotonic() - started
+
+    def utilization(self) -> float:
+        """Fraction of the stage's worker time spent busy (0-1)."""
+        elapsed = max(time.monotonic() - self.started_at, 1e-9)
+        return min(1.0, self.busy_seconds / (elapsed * self.workers))
+
+    def to_dict(self, queued: Optional[int] = None) -> Dict[str, Any]:
+        """Convert to dictionary for reporting."""
+        return {
+            "workers": self.workers,
+            "items": self.items,
+            "failed": self.failed,
+            "utilization": round(self.utilization(), 3),
+            "avg_seconds": round(self.busy_seconds / max(self.items + self.failed, 1), 3),
+            "queued": queued,
+        }
+
+
+# Parser of the current parse process, set by the pool initializer
+_parser: Optional[Parser] = None
+
+
+def _init_parse_process(config: PlatformConfig) -> None:
+    """Build the parser once per parse process."""
+    global _parser
+    _parser = Parser(config)
+
+
+def _init_parse_subprocess(config: PlatformConfig, parent_pid: int) -> None:
+    """Initialize a parse process that exits if its worker dies."""
+    _init_parse_process(config)
+
+    def watch_parent() -> None:
+        # A killed worker never shuts the pool down; don't linger as an orphan
+        while os.getppid() == parent_pid:
+            time.sleep(5)
+        os._exit(1)
+
+    threading.Thread(target=watch_parent, name="parent-watch", daemon=True).start()
+
+
+def _parse_in_process(html: str) -> ParsedResult:
+    """Parse HTML with the process's parser."""
+    return _parser.parse(html)
+
+
+def create_parse_executor(config: PlatformConfig, workers: int) -> Executor:
+    """
+    Create the executor for the parse stage.
+
+    With workers > 0 parsing runs in that many processes, off the event
+    loop and outside the GIL. With 0 it runs on a single thread, which
+    keeps the loop responsive but shares the worker's core.
+    """
+    if workers <= 0:
+        return ThreadPoolExecutor(
+            max_workers=1,
+            thread_name_prefix="parse",
+            initializer=_init_parse_process,
+            initargs=(config,),
+        )
+
+    # Spawn rather than fork: the worker process already runs browser and
+    # database threads
+    return ProcessPoolExecutor(
+        max_workers=workers,
+        mp_context=multiprocessing.get_context("spawn"),
+        initializer=_init_parse_subprocess,
+        initargs=(config, os.getpid()),
+    )
+
+
+async def parse_html(executor: Executor, html: str) -> ParsedResult:
+    """Parse HTML on the parse executor."""
+    return await asyncio.get_running_loop().run_in_executor(
+        executor, _parse_in_process, html
+    )
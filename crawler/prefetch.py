@@ -0,0 +1,197 @@
+"""In-memory prefetch buffer in front of the SQLite task queue."""
+
+import asyncio
+import heapq
+import itertools
+import logging
+import time
+from typing import List, Optional, Tuple
+
+from crawler.lpm import LocalPersistenceManager
+from crawler.models.task import Task
+from crawler.ratelimit import RateLimiter
+from crawler.strategies.mixer import StrategyMixer
+
+logger = logging.getLogger(__name__)
+
+
+class TaskPrefetcher:
+    """
+    Claims tasks in chunks ahead of demand and serves them by priority.
+
+    Features:
+    - Bounded local priority heap of claimed tasks
+    - Background refill below a low-water mark
+    - Immediate wake-up when tasks are added through the LPM
+    - Polling fallback for tasks added by other processes
+    - Per-host rate limiting: tasks for throttled hosts stay buffered
+      while tasks for other hosts are served
+    - Optional strategy mixer deciding which tasks each refill claims
+    """
+
+    def __init__(
+        self,
+        lpm: LocalPersistenceManager,
+        platform: Optional[str],
+        worker_id: str,
+        chunk_size: int = 10,
+        low_water: Optional[int] = None,
+        max_buffered: Optional[int] = None,
+        lease_seconds: int = 600,
+        poll_interval: float = 5.0,
+        rate_limiter: Optional[RateLimiter] = None,
+        mixer: Optional[StrategyMixer] = None,
+    ):
+        self.lpm = lpm
+        self.platform = platform
+        self.worker_id = worker_id
+        self.chunk_size = chunk_size
+        self.low_water = low_water if low_water is not None else max(1, chunk_size // 4)
+        self.max_buffered = max_buffered or chunk_size * 2
+        self.lease_seconds = lease_seconds
+        self.poll_interval = poll_interval
+        self.rate_limiter = rate_limiter if rate_limiter and rate_limiter.enabled else None
+        self.mixer = mixer
+
+        self._heap: List[Tuple[int, float, int, Task]] = []
+        self._seq = itertools.count()
+        self._refill_lock = asyncio.Lock()
+        self._refill_task: Optional[asyncio.Task] = None
+        # When the last refill came back short (queue looked empty)
+        self._empty_at: Optional[float] = None
+
+    def __len__(self) -> int:
+        """Number of buffered tasks."""
+        return len(self._heap)
+
+    async def get(self, wait: bool = True) -> Optional[Task]:
+        """
+        Get the highest-priority claimed task whose host is not throttled.
+
+        When every buffered task is throttled, more tasks are claimed (up
+        to max_buffered) to find other hosts; only if none turn up does
+        this sleep until a host frees up.
+
+        Args:
+            wait: Block until a task is available. When False, returns
+                None as soon as the queue is empty (drain mode).
+
+        Returns:
+            Claimed task, or None if the queue is empty and wait is False
+        """
+        while True:
+            if not self._heap:
+                await self._refill()
+            elif len(self._heap) < self.low_water:
+                self._schedule_refill()
+
+            if self._heap:
+                task = self._pop_ready()
+                if task is not None:
+                    return task
+
+                # Everything buffered is throttled - look for other hosts
+                if len(self._heap) < self.max_buffered and not self._recently_empty():
+                    if await self._refill():
+                        continue
+
+                delay = self.rate_limiter.next_available(
+                    entry[-1].url for entry in self._heap
+                )
+                await asyncio.sleep(min(delay, self.poll_interval))
+                continue
+
+            if not wait:
+                return None
+
+            # Sleep until tasks are added locally, or poll for other writers
+            await self.lpm.wait_for_tasks(self.poll_interval)
+            self._empty_at = None
+
+    async def release(self) -> int:
+        """Return all buffered tasks to the queue. Returns count released."""
+        if self._refill_task is not None:
+            self._refill_task.cancel()
+            try:
+                await self._refill_task
+            except asyncio.CancelledError:
+                pass
+            self._refill_task = None
+
+        task_ids = [entry[-1].id for entry in self._heap]
+        self._heap.clear()
+        if self.mixer is not None:
+            self.mixer.forget(task_ids)
+        return await self.lpm.release_tasks(task_ids, self.worker_id)
+
+    def _pop_ready(self) -> Optional[Task]:
+        """Pop the best task whose host has a free slot; throttled ones stay buffered."""
+        if self.rate_limiter is None:
+            return heapq.heappop(self._heap)[-1]
+
+        skipped = []
+        task = None
+        while self._heap:
+            entry = heapq.heappop(self._heap)
+            if self.rate_limiter.try_acquire(entry[-1].url):
+                task = entry[-1]
+                break
+            skipped.append(entry)
+
+        for entry in skipped:
+            heapq.heappush(self._heap, entry)
+        return task
+
+    def _recently_empty(self) -> bool:
+        """Check if the last refill found the queue empty within poll_interval."""
+        return (
+            self._empty_at is not None
+            and time.monotonic() - self._empty_at < self.poll_interval
+        )
+
+    def _schedule_refill(self) -> None:
+        """Start a background refill unless one is running or the queue looked empty."""
+        if self._refill_task is not None and not self._refill_task.done():
+            return
+        if self._recently_empty():
+            return
+        self._refill_task = asyncio.create_task(self._refill())
+
+    async def _refill(self) -> int:
+        """Claim a chunk of tasks into the local heap. Returns count claimed."""
+        async with self._refill_lock:
+            wanted = min(self.chunk_size, self.max_buffered - len(self._heap))
+            if wanted <= 0:
+                return 0
+
+            try:
+                if self.mixer is not None:
+                    tasks = await self.mixer.claim(
+                        self.lpm,
+                        wanted,
+                        self.platform,
+                        self.worker_id,
+                        self.lease_seconds,
+                    )
+                else:
+                    tasks = await self.lpm.claim_tasks(
+                        self.platform,
+                        wanted,
+                        self.lease_seconds,
+                        self.worker_id,
+                    )
+            except Exception as e:
+                logger.error(f"Prefetch claim failed: {e}")
+                tasks = []
+
+            for task in tasks:
+                created = task.created_at.timestamp() if task.created_at else 0.0
+                heapq.heappush(
+                    self._heap,
+                    (-task.priority, created, next(self._seq), task),
+                )
+
+            self._empty_at = time.monotonic() if len(tasks) < wanted else None
+            if tasks:
+                logger.debug(f"Prefetched {len(tasks)} tasks ({len(self._heap)} buffered)")
+            return len(tasks)
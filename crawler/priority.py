@@ -1,6 +1,6 @@
 """Priority calculator for task scheduling."""
 
-from typing import Dict, Optional
+from typing import Dict, Optional, Tuple
 from datetime import datetime, timedelta
 
 
@@ -26,6 +26,13 @@ class PriorityCalculator:
         "unknown": 0,
     }
 
+    # Age boost: +1 per AGE_BOOST_SECONDS of age, capped at AGE_BOOST_CAP
+    AGE_BOOST_SECONDS = 3600
+    AGE_BOOST_CAP = 10
+
+    # Boost per retry
+    RETRY_BOOST = 2
+
     def __init__(self, config: Optional[Dict] = None):
         self.config = config or {}
         self.base_priority = self.config.get("base_priority", 0)
@@ -67,7 +74,7 @@ class PriorityCalculator:
 
         # Add retry boost (failed tasks get higher priority)
         if retry_count > 0:
-            priority += retry_count * 2
+            priority += retry_count * self.RETRY_BOOST
 
         # Add custom boost
         priority += custom_boost
@@ -80,8 +87,42 @@ class PriorityCalculator:
         age = now - created_at
 
         # Boost by 1 for every hour old
-        hours_old = age.total_seconds() / 3600
-        return min(int(hours_old), 10)  # Cap at 10
+        hours_old = age.total_seconds() / self.AGE_BOOST_SECONDS
+        return min(int(hours_old), self.AGE_BOOST_CAP)
+
+    def priority_sql(self, now: Optional[datetime] = None) -> Tuple[str, list]:
+        """
+        Build a SQL expression computing calculate() from task columns.
+
+        Mirrors calculate(relationship_type, created_at, retry_count) with
+        the tasks.base_priority column standing in for the base priority
+        and custom boost, so priorities can be refreshed in one UPDATE.
+
+        Returns:
+            Tuple of (expression, parameters)
+        """
+        now = now or datetime.utcnow()
+
+        cases = " ".join("WHEN ? THEN ?" for _ in self.relationship_deltas)
+        params: list = []
+        for relationship, delta in self.relationship_deltas.items():
+            params.extend([relationship.lower(), delta])
+
+        expression = f"""(
+            base_priority
+            + CASE LOWER(COALESCE(relationship_type, '')) {cases} ELSE 0 END
+            + COALESCE(MIN(CAST(
+                (julianday(?) - julianday(created_at)) * 86400 / ? AS INTEGER
+            ), ?), 0)
+            + retry_count * ?
+        )"""
+        params.extend([
+            now.isoformat(),
+            self.AGE_BOOST_SECONDS,
+            self.AGE_BOOST_CAP,
+            self.RETRY_BOOST,
+        ])
+        return expression, params
 
     def boost_priority(
         self,
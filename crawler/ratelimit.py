@@ -0,0 +1,176 @@
+"""Per-host token-bucket rate limiting."""
+
+import time
+from typing import Any, Callable, Dict, Iterable, Optional, Union
+from urllib.parse import urlsplit
+
+from crawler.config_loader import PlatformConfig
+
+
+# Seconds per unit in "N/unit" rate specs
+RATE_UNITS = {
+    "s": 1,
+    "m": 60,
+    "h": 3600,
+}
+
+
+def parse_rate(spec: Union[str, int, float, None]) -> Optional[float]:
+    """
+    Parse a rate limit into requests per second.
+
+    Accepts Celery-style strings ("5/m", "2/s", "100/h") or a number of
+    requests per second. Returns None for no limit.
+
+    Raises:
+        ValueError: If the spec cannot be parsed
+    """
+    if spec is None or spec == "":
+        return None
+    if isinstance(spec, (int, float)):
+        rate = float(spec)
+    else:
+        count, _, unit = spec.strip().partition("/")
+        unit = unit.strip().lower() or "s"
+        if unit not in RATE_UNITS:
+            raise ValueError(f"Invalid rate unit in '{spec}' (use s, m or h)")
+        rate = float(count) / RATE_UNITS[unit]
+
+    if rate <= 0:
+        raise ValueError(f"Rate must be positive: '{spec}'")
+    return rate
+
+
+class TokenBucket:
+    """Token bucket refilled continuously at rate tokens per second."""
+
+    def __init__(self, rate: float, capacity: float, now: float):
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = capacity
+        self.updated = now
+
+    def _refill(self, now: float) -> None:
+        """Add tokens for the time elapsed since the last update."""
+        elapsed = max(0.0, now - self.updated)
+        self.tokens = min(self.capacity, self.tokens + elapsed * self.rate)
+        self.updated = now
+
+    def try_acquire(self, now: float) -> bool:
+        """Take a token if one is available."""
+        self._refill(now)
+        if self.tokens >= 1:
+            self.tokens -= 1
+            return True
+        return False
+
+    def time_until_available(self, now: float) -> float:
+        """Seconds until a token is available."""
+        self._refill(now)
+        if self.tokens >= 1:
+            return 0.0
+        return (1 - self.tokens) / self.rate
+
+
+class RateLimiter:
+    """
+    Rate limits requests per host.
+
+    Hosts without an explicit limit use the default rate; with no default
+    rate they are unlimited. Buckets start full, so up to burst requests
+    go out immediately.
+
+    Configured per platform in schedule.json (top level) or manifest.json
+    (under "scraping"), schedule.json taking precedence:
+
+        {
+            "rate_limit": "5/m",
+            "burst": 1,
+            "host_rate_limits": {"slow.county.gov": "2/m"}
+        }
+    """
+
+    def __init__(
+        self,
+        default_rate: Optional[float] = None,
+        burst: int = 1,
+        host_rates: Optional[Dict[str, float]] = None,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.default_rate = default_rate
+        self.burst = max(1, burst)
+        self.host_rates = {host.lower(): rate for host, rate in (host_rates or {}).items()}
+        self.clock = clock
+        self._buckets: Dict[str, TokenBucket] = {}
+
+    @classmethod
+    def from_config(cls, config: PlatformConfig, share: float = 1.0) -> "RateLimiter":
+        """
+        Build a limiter from a platform's schedule.json / manifest.json.
+
+        Args:
+            config: Platform configuration
+            share: Fraction of the configured rates this limiter may use,
+                for processes crawling the same hosts in parallel
+        """
+        if not 0 < share <= 1:
+            raise ValueError(f"Rate share must be in (0, 1]: {share}")
+
+        settings: Dict[str, Any] = {}
+        scraping = config.manifest.get("scraping") or {}
+        for source in (scraping, config.schedule or {}):
+            for key in ("rate_limit", "burst", "host_rate_limits"):
+                if key in source:
+                    settings[key] = source[key]
+
+        def scaled(spec: Union[str, int, float, None]) -> Optional[float]:
+            rate = parse_rate(spec)
+            return rate * share if rate is not None else None
+
+        return cls(
+            default_rate=scaled(settings.get("rate_limit")),
+            burst=round(int(settings.get("burst", 1)) * share),
+            host_rates={
+                host: scaled(spec)
+                for host, spec in (settings.get("host_rate_limits") or {}).items()
+            },
+        )
+
+    @property
+    def enabled(self) -> bool:
+        """Check if any limit is configured."""
+        return self.default_rate is not None or any(
+            rate is not None for rate in self.host_rates.values()
+        )
+
+    @staticmethod
+    def host_of(url: str) -> str:
+        """Get the rate-limit key for a URL."""
+        return (urlsplit(url).hostname or "").lower()
+
+    def _bucket(self, host: str) -> Optional[TokenBucket]:
+        """Get the bucket for a host, or None if it is unlimited."""
+        bucket = self._buckets.get(host)
+        if bucket is None:
+            rate = self.host_rates.get(host, self.default_rate)
+            if rate is None:
+                return None
+            bucket = TokenBucket(rate, self.burst, self.clock())
+            self._buckets[host] = bucket
+        return bucket
+
+    def try_acquire(self, url: str) -> bool:
+        """Take a request slot for the URL's host if one is available."""
+        bucket = self._bucket(self.host_of(url))
+        return bucket is None or bucket.try_acquire(self.clock())
+
+    def delay_for(self, url: str) -> float:
+        """Seconds until the URL's host has a free slot."""
+        bucket = self._bucket(self.host_of(url))
+        if bucket is None:
+            return 0.0
+        return bucket.time_until_available(self.clock())
+
+    def next_available(self, urls: Iterable[str]) -> float:
+        """Seconds until any of the URLs' hosts has a free slot."""
+        return min((self.delay_for(url) for url in urls), default=0.0)
@@ -1,11 +1,12 @@
 """Repositories package."""
 
-from crawler.repositories.task_repo import TaskRepository
+from crawler.repositories.task_repo import TaskRepository, TaskFilter
 from crawler.repositories.bulk_job_repo import BulkJobRepository
 from crawler.repositories.link_repo import LinkRepository
 
 __all__ = [
     "TaskRepository",
+    "TaskFilter",
     "BulkJobRepository",
     "LinkRepository",
 ]
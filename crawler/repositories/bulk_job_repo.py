@@ -1,6 +1,7 @@
 """Bulk job repository for database operations."""
 
 from typing import Optional, List
+import aiosqlite
 from datetime import datetime
 
 from crawler.models.bulk_job import BulkJob, BulkJobStatus
@@ -1,23 +1,28 @@
 """Discovered link repository for database operations."""
 
-from typing import Optional, List
+from typing import Optional, List, AsyncIterator
+import aiosqlite
 from datetime import datetime
 
+from crawler.bloom import BloomFilter
 from crawler.models.parsed_result import DiscoveredLink, RelationshipType
 from crawler.db.connection import DatabaseConnection
+from crawler.urls import url_hash
 
 
 class LinkRepository:
     """Repository for discovered link database operations."""
 
-    def __init__(self, db: DatabaseConnection):
+    def __init__(self, db: DatabaseConnection, url_filter: Optional[BloomFilter] = None):
         self.db = db
+        # Seen-URL prefilter of URL hashes (set by the LPM when loaded)
+        self.url_filter = url_filter
 
     async def add(self, link: DiscoveredLink) -> int:
         """Add a discovered link. Returns the link ID."""
         cursor = await self.db.execute(
             """
-            INSERT INTO discovered_links (
+            INSERT OR IGNORE INTO discovered_links (
                 source_task_id, url, relationship_type, priority_delta
             ) VALUES (?, ?, ?, ?)
             """,
@@ -29,16 +34,35 @@ class LinkRepository:
             ),
         )
         await self.db.commit()
-        return cursor.lastrowid
+        if cursor.rowcount:
+            return cursor.lastrowid
+
+        # Already recorded
+        row = await self.db.fetchone(
+            "SELECT id FROM discovered_links WHERE url = ?",
+            (link.url,),
+        )
+        return row["id"]
 
     async def add_batch(self, links: List[DiscoveredLink]) -> int:
-        """Add multiple links. Returns count of added links."""
-        if not links:
+        """
+        Add multiple links, skipping URLs already recorded.
+
+        The unique index on url rejects recorded URLs, including ones
+        another process recorded that this process's URL filter has not seen.
+
+        Returns:
+            Count of added links
+        """
+        unique = {}
+        for link in links:
+            unique.setdefault(link.url, link)
+        if not unique:
             return 0
 
-        await self.db.executemany(
+        cursor = await self.db.executemany(
             """
-            INSERT INTO discovered_links (
+            INSERT OR IGNORE INTO discovered_links (
                 source_task_id, url, relationship_type, priority_delta
             ) VALUES (?, ?, ?, ?)
             """,
@@ -49,11 +73,34 @@ class LinkRepository:
                     link.relationship_type.value,
                     link.priority_delta,
                 )
-                for link in links
+                for link in unique.values()
             ],
         )
         await self.db.commit()
-        return len(links)
+
+        if self.url_filter is not None:
+            hashes = (url_hash(url) for url in unique)
+            self.url_filter.update(h for h in hashes if h not in self.url_filter)
+        return cursor.rowcount
+
+    async def iter_urls(self, batch_size: int = 5000) -> AsyncIterator[str]:
+        """Stream every recorded link URL."""
+        last_id = 0
+        while True:
+            rows = await self.db.read_fetchall(
+                """
+                SELECT id, url FROM discovered_links
+                WHERE id > ?
+                ORDER BY id
+                LIMIT ?
+                """,
+                (last_id, batch_size),
+            )
+            if not rows:
+                break
+            for row in rows:
+                yield row["url"]
+            last_id = rows[-1]["id"]
 
     async def get_unprocessed(self, source_task_id: Optional[str] = None) -> List[DiscoveredLink]:
         """Get unprocessed links."""
@@ -106,9 +153,9 @@ class LinkRepository:
         return [self._row_to_link(row) for row in rows]
 
     async def count_unprocessed(self) -> int:
-        """Count unprocessed links."""
-        row = await self.db.fetchone(
-            "SELECT COUNT(*) as count FROM discovered_links WHERE processed = FALSE"
+        """Count unprocessed links (O(1) via link_counters)."""
+        row = await self.db.read_fetchone(
+            "SELECT count FROM link_counters WHERE processed = 0"
         )
         return row["count"] if row else 0
 
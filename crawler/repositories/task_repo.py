@@ -1,11 +1,87 @@
 """Task repository for database operations."""
 
 import asyncio
-from typing import Optional, List
-from datetime import datetime
+import base64
+import json
+from dataclasses import dataclass
+from typing import Optional, List, Iterable, Set, Dict, Tuple, AsyncIterator
+import aiosqlite
+from datetime import datetime, timedelta
 
-from crawler.models.task import Task, TaskStatus
+from crawler.models.task import PageFingerprint, Task, TaskStatus
 from crawler.db.connection import DatabaseConnection
+from crawler.db.schema import RECOUNT_STATEMENTS
+from crawler.priority import PriorityCalculator
+from crawler.urls import url_hash
+
+
+# Default claim order (served by idx_tasks_due)
+CLAIM_ORDER = "priority DESC, created_at ASC"
+
+
+@dataclass
+class TaskFilter:
+    """Server-side filters for task listing."""
+    status: Optional[TaskStatus] = None
+    platform: Optional[str] = None
+    created_after: Optional[datetime] = None
+    created_before: Optional[datetime] = None
+    completed_after: Optional[datetime] = None
+    completed_before: Optional[datetime] = None
+    error_contains: Optional[str] = None
+
+    def to_sql(self) -> Tuple[List[str], list]:
+        """Build WHERE conditions and parameters."""
+        conditions = []
+        params: list = []
+
+        if self.status:
+            conditions.append("status = ?")
+            params.append(TaskStatus(self.status).value)
+        if self.platform:
+            conditions.append("platform = ?")
+            params.append(self.platform)
+        if self.created_after:
+            conditions.append("created_at >= ?")
+            params.append(self.created_after.isoformat())
+        if self.created_before:
+            conditions.append("created_at < ?")
+            params.append(self.created_before.isoformat())
+        if self.completed_after:
+            conditions.append("completed_at >= ?")
+            params.append(self.completed_after.isoformat())
+        if self.completed_before:
+            conditions.append("completed_at < ?")
+            params.append(self.completed_before.isoformat())
+        if self.error_contains:
+            escaped = (
+                self.error_contains.replace("\\", "\\\\")
+                .replace("%", "\\%")
+                .replace("_", "\\_")
+            )
+            conditions.append("error LIKE ? ESCAPE '\\'")
+            params.append(f"%{escaped}%")
+
+        return conditions, params
+
+
+def encode_cursor(task: Task) -> str:
+    """Encode the listing position after a task as an opaque cursor."""
+    key = [
+        task.priority,
+        task.created_at.isoformat() if task.created_at else "",
+        task.id,
+    ]
+    return base64.urlsafe_b64encode(json.dumps(key).encode("utf-8")).decode("ascii")
+
+
+def decode_cursor(cursor: str) -> Tuple[int, str, str]:
+    """Decode a listing cursor. Raises ValueError if malformed."""
+    try:
+        priority, created_at, task_id = json.loads(base64.urlsafe_b64decode(cursor))
+        return int(priority), str(created_at), str(task_id)
+    except (ValueError, TypeError) as e:
+        raise ValueError(f"Invalid cursor: {cursor}") from e
 
 
 class TaskRepository:
@@ -14,27 +90,82 @@ class TaskRepository:
     def __init__(self, db: DatabaseConnection):
         self.db = db
 
-    async def create(self, task: Task) -> None:
-        """Create a new task."""
-        await self.db.execute(
+    async def create(self, task: Task) -> bool:
+        """
+        Create a new task.
+
+        Returns:
+            False if the platform already has a task for the same URL
+        """
+        cursor = await self.db.execute(
             """
-            INSERT INTO tasks (id, url, platform, status, priority, created_at)
-            VALUES (?, ?, ?, ?, ?, ?)
+            INSERT OR IGNORE INTO tasks (
+                id, url, platform, status, priority, created_at, url_hash,
+                base_priority, relationship_type
+            ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
             """,
-            (
-                task.id,
-                task.url,
-                task.platform,
-                task.status.value,
-                task.priority,
-                task.created_at.isoformat() if task.created_at else None,
-            ),
+            self._task_params(task),
         )
         await self.db.commit()
+        return cursor.rowcount > 0
+
+    async def create_many(
+        self, tasks: Iterable[Task], chunk_size: int = 1000
+    ) -> List[int]:
+        """
+        Create many tasks in a single transaction.
+
+        Tasks are inserted with executemany in chunks of chunk_size and
+        committed once at the end; nothing is written if any chunk fails.
+        URLs already queued for the platform are skipped.
+
+        Returns:
+            Count of inserted tasks per chunk
+        """
+        counts = []
+        chunk = []
+
+        async with self.db.transaction():
+            for task in tasks:
+                chunk.append(self._task_params(task))
+                if len(chunk) >= chunk_size:
+                    counts.append(await self._insert_chunk(chunk))
+                    chunk = []
+            if chunk:
+                counts.append(await self._insert_chunk(chunk))
+
+        return counts
+
+    async def _insert_chunk(self, params: List[tuple]) -> int:
+        """Insert one chunk of task rows. Returns count inserted."""
+        cursor = await self.db.executemany(
+            """
+            INSERT OR IGNORE INTO tasks (
+                id, url, platform, status, priority, created_at, url_hash,
+                base_priority, relationship_type
+            ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+            """,
+            params,
+        )
+        return cursor.rowcount
+
+    def _task_params(self, task: Task) -> tuple:
+        """Build insert parameters for a task."""
+        return (
+            task.id,
+            task.url,
+            task.platform,
+            task.status.value,
+            task.priority,
+            task.created_at.isoformat() if task.created_at else None,
+            url_hash(task.url),
+            task.base_priority,
+            task.relationship_type,
+        )
 
     async def get(self, task_id: str) -> Optional[Task]:
         """Get task by ID."""
-        row = await self.db.fetchone(
+        row = await self.db.read_fetchone(
             "SELECT * FROM tasks WHERE id = ?",
             (task_id,),
         )
@@ -42,33 +173,130 @@ class TaskRepository:
             return self._row_to_task(row)
         return None
 
-    async def get_next_pending(self, platform: Optional[str] = None) -> Optional[Task]:
-        """Get next pending task ordered by priority."""
-        if platform:
-            row = await self.db.fetchone(
-                """
-                SELECT * FROM tasks 
-                WHERE status = ? AND platform = ?
-                ORDER BY priority DESC, created_at ASC
-                LIMIT 1
+    async def get_by_url(self, platform: str, url: str) -> Optional[Task]:
+        """Get task by normalized URL."""
+        row = await self.db.fetchone(
+            "SELECT * FROM tasks WHERE platform = ? AND url_hash = ?",
+            (platform, url_hash(url)),
+        )
+        if row:
+            return self._row_to_task(row)
+        return None
+
+    async def existing_url_hashes(
+        self, platform: str, hashes: Iterable[str], chunk_size: int = 500
+    ) -> Set[str]:
+        """Return the subset of URL hashes that already have a task."""
+        hashes = list(hashes)
+        existing = set()
+
+        for start in range(0, len(hashes), chunk_size):
+            chunk = hashes[start:start + chunk_size]
+            placeholders = ", ".join("?" for _ in chunk)
+            rows = await self.db.fetchall(
+                f"""
+                SELECT url_hash FROM tasks
+                WHERE platform = ? AND url_hash IN ({placeholders})
                 """,
-                (TaskStatus.PENDING.value, platform),
+                (platform, *chunk),
             )
-        else:
-            row = await self.db.fetchone(
+            existing.update(row["url_hash"] for row in rows)
+
+        return existing
+
+    async def iter_url_hashes(self, batch_size: int = 5000) -> AsyncIterator[str]:
+        """Stream the URL hash of every task."""
+        last_rowid = 0
+        while True:
+            rows = await self.db.read_fetchall(
                 """
-                SELECT * FROM tasks 
-                WHERE status = ?
-                ORDER BY priority DESC, created_at ASC
-                LIMIT 1
+                SELECT rowid, url_hash FROM tasks
+                WHERE rowid > ? AND url_hash IS NOT NULL
+                ORDER BY rowid
+                LIMIT ?
                 """,
-                (TaskStatus.PENDING.value,),
+                (last_rowid, batch_size),
             )
+            if not rows:
+                break
+            for row in rows:
+                yield row["url_hash"]
+            last_rowid = rows[-1]["rowid"]
+
+    async def get_next_pending(self, platform: Optional[str] = None) -> Optional[Task]:
+        """Get next due pending task ordered by priority."""
+        conditions = ["status = ?", "(next_attempt_at IS NULL OR next_attempt_at <= ?)"]
+        params: list = [TaskStatus.PENDING.value, datetime.utcnow().isoformat()]
+        if platform:
+            conditions.append("platform = ?")
+            params.append(platform)
+
+        row = await self.db.fetchone(
+            f"""
+            SELECT * FROM tasks
+            WHERE {" AND ".join(conditions)}
+            ORDER BY priority DESC, created_at ASC
+            LIMIT 1
+            """,
+            tuple(params),
+        )
 
         if row:
             return self._row_to_task(row)
         return None
 
+    async def reprioritize(
+        self,
+        calculator: PriorityCalculator,
+        platform: Optional[str] = None,
+    ) -> int:
+        """
+        Recompute pending task priorities in a single UPDATE.
+
+        Applies the calculator's relationship deltas, age boost (with its
+        cap) and retry boost in SQL, so old low-priority tasks climb the
+        queue without loading rows into Python.
+
+        Returns:
+            Count of tasks whose priority changed
+        """
+        expression, expression_params = calculator.priority_sql()
+
+        conditions = ["status = ?", "base_priority IS NOT NULL"]
+        params: list = [TaskStatus.PENDING.value]
+        if platform:
+            conditions.append("platform = ?")
+            params.append(platform)
+
+        cursor = await self.db.execute(
+            f"""
+            UPDATE tasks SET priority = {expression}
+            WHERE {" AND ".join(conditions)} AND priority != {expression}
+            """,
+            (*expression_params, *params, *expression_params),
+        )
+        await self.db.commit()
+        return cursor.rowcount
+
+    async def next_attempt_at(self, platform: Optional[str] = None) -> Optional[datetime]:
+        """Get the earliest next_attempt_at among delayed pending tasks."""
+        conditions = ["status = ?", "next_attempt_at IS NOT NULL"]
+        params: list = [TaskStatus.PENDING.value]
+        if platform:
+            conditions.append("platform = ?")
+            params.append(platform)
+
+        row = await self.db.read_fetchone(
+            f"""
+            SELECT MIN(next_attempt_at) AS next_attempt_at FROM tasks
+            WHERE {" AND ".join(conditions)}
+            """,
+            tuple(params),
+        )
+        if row and row["next_attempt_at"]:
+            return datetime.fromisoformat(row["next_attempt_at"])
+        return None
+
     async def update(self, task: Task) -> None:
         """Update task."""
         await self.db.execute(
@@ -76,6 +304,7 @@ class TaskRepository:
             UPDATE tasks SET
                 status = ?,
                 priority = ?,
+                base_priority = ?,
                 started_at = ?,
                 completed_at = ?,
                 result_path = ?,
@@ -87,6 +316,7 @@ class TaskRepository:
             (
                 task.status.value,
                 task.priority,
+                task.base_priority,
                 task.started_at.isoformat() if task.started_at else None,
                 task.completed_at.isoformat() if task.completed_at else None,
                 task.result_path,
@@ -117,56 +347,464 @@ class TaskRepository:
         await self.db.commit()
         return self.db.connection.total_changes > 0
 
-    async def mark_completed(self, task_id: str, result_path: str) -> None:
-        """Mark task as completed."""
-        await self.db.execute(
+    async def claim_batch(
+        self,
+        platform: Optional[str],
+        n: int,
+        lease_seconds: int,
+        worker_id: str,
+        where: Optional[str] = None,
+        where_params: tuple = (),
+        order_by: str = CLAIM_ORDER,
+    ) -> List[Task]:
+        """
+        Atomically claim up to n pending tasks for a worker.
+
+        The tasks are moved to PROCESSING by a single UPDATE ... RETURNING
+        statement, so workers sharing the database never claim the same task.
+        Delayed retries whose next_attempt_at has passed are made due first;
+        retries that are not yet due are skipped.
+
+        Args:
+            platform: Only claim tasks for this platform (None for any)
+            n: Maximum number of tasks to claim
+            lease_seconds: Lease duration before the claim expires
+            worker_id: Identifier of the claiming worker
+            where: Extra SQL condition selecting candidate tasks
+            where_params: Parameters for the where condition
+            order_by: SQL ORDER BY clause choosing which candidates win
+
+        Returns:
+            Claimed tasks ordered by priority
+        """
+        now = datetime.utcnow()
+        lease_expires_at = now + timedelta(seconds=lease_seconds)
+
+        conditions = ["status = ?"]
+        params: list = [TaskStatus.PENDING.value]
+        if platform:
+            conditions.append("platform = ?")
+            params.append(platform)
+        if where:
+            conditions.append(f"({where})")
+            params.extend(where_params)
+        condition_sql = " AND ".join(conditions)
+
+        async with self.db.transaction():
+            # Promote due retries; an index range scan on idx_tasks_due
+            await self.db.execute(
+                """
+                UPDATE tasks SET next_attempt_at = NULL
+                WHERE status = ? AND next_attempt_at <= ?
+                """,
+                (TaskStatus.PENDING.value, now.isoformat()),
+            )
+            rows = await self.db.fetchall(
+                f"""
+                UPDATE tasks SET
+                    status = ?,
+                    started_at = ?,
+                    worker_id = ?,
+                    lease_expires_at = ?,
+                    heartbeat_at = ?
+                WHERE status = ? AND id IN (
+                    SELECT id FROM tasks
+                    WHERE {condition_sql} AND next_attempt_at IS NULL
+                    ORDER BY {order_by}
+                    LIMIT ?
+                )
+                RETURNING *
+                """,
+                (
+                    TaskStatus.PROCESSING.value,
+                    now.isoformat(),
+                    worker_id,
+                    lease_expires_at.isoformat(),
+                    now.isoformat(),
+                    TaskStatus.PENDING.value,
+                    *params,
+                    n,
+                ),
+            )
+
+        # RETURNING does not preserve the subquery order
+        tasks = [self._row_to_task(row) for row in rows]
+        tasks.sort(key=lambda t: (-t.priority, t.created_at or now))
+        return tasks
+
+    async def release(self, task_ids: List[str], worker_id: str) -> int:
+        """Return claimed tasks to the pending pool. Returns count released."""
+        if not task_ids:
+            return 0
+
+        placeholders = ", ".join("?" for _ in task_ids)
+        cursor = await self.db.execute(
+            f"""
+            UPDATE tasks SET
+                status = ?,
+                started_at = NULL,
+                worker_id = NULL,
+                lease_expires_at = NULL,
+                heartbeat_at = NULL
+            WHERE status = ? AND worker_id = ? AND id IN ({placeholders})
+            """,
+            (
+                TaskStatus.PENDING.value,
+                TaskStatus.PROCESSING.value,
+                worker_id,
+                *task_ids,
+            ),
+        )
+        await self.db.commit()
+        return cursor.rowcount
+
+    async def release_worker(self, worker_id: str) -> int:
+        """Return every task claimed by a worker to the pending pool. Returns count released."""
+        cursor = await self.db.execute(
+            """
+            UPDATE tasks SET
+                status = ?,
+                started_at = NULL,
+                worker_id = NULL,
+                lease_expires_at = NULL,
+                heartbeat_at = NULL
+            WHERE status = ? AND worker_id = ?
+            """,
+            (
+                TaskStatus.PENDING.value,
+                TaskStatus.PROCESSING.value,
+                worker_id,
+            ),
+        )
+        await self.db.commit()
+        return cursor.rowcount
+
+    async def renew_leases(self, worker_id: str, lease_seconds: int) -> int:
+        """Extend the leases of all tasks held by a worker. Returns count renewed."""
+        now = datetime.utcnow()
+        cursor = await self.db.execute(
+            """
+            UPDATE tasks SET
+                lease_expires_at = ?,
+                heartbeat_at = ?
+            WHERE status = ? AND worker_id = ?
+            """,
+            (
+                (now + timedelta(seconds=lease_seconds)).isoformat(),
+                now.isoformat(),
+                TaskStatus.PROCESSING.value,
+                worker_id,
+            ),
+        )
+        await self.db.commit()
+        return cursor.rowcount
+
+    async def reap_expired(self, stale_after_seconds: int = 600) -> int:
+        """
+        Return tasks with expired leases to the pending pool.
+
+        Tasks marked processing without a lease (via mark_processing) are
+        reclaimed once started_at is older than stale_after_seconds.
+
+        Returns:
+            Count of reclaimed tasks
+        """
+        now = datetime.utcnow()
+        cursor = await self.db.execute(
             """
+            UPDATE tasks SET
+                status = ?,
+                started_at = NULL,
+                worker_id = NULL,
+                lease_expires_at = NULL,
+                heartbeat_at = NULL
+            WHERE status = ? AND (
+                lease_expires_at < ?
+                OR (lease_expires_at IS NULL AND started_at < ?)
+            )
+            """,
+            (
+                TaskStatus.PENDING.value,
+                TaskStatus.PROCESSING.value,
+                now.isoformat(),
+                (now - timedelta(seconds=stale_after_seconds)).isoformat(),
+            ),
+        )
+        await self.db.commit()
+        return cursor.rowcount
+
+    @staticmethod
+    def _lease_fence(worker_id: Optional[str]) -> Tuple[str, tuple]:
+        """
+        Condition limiting a write to the worker holding the task's lease.
+
+        Without a worker ID (manual changes) the write is not fenced.
+        """
+        if worker_id is None:
+            return "", ()
+        return " AND status = ? AND worker_id = ?", (TaskStatus.PROCESSING.value, worker_id)
+
+    async def _leased_ids(self, task_ids: List[str], worker_id: Optional[str]) -> Set[str]:
+        """Get the subset of task IDs whose lease the worker holds."""
+        if worker_id is None:
+            return set(task_ids)
+        if not task_ids:
+            return set()
+
+        placeholders = ", ".join("?" for _ in task_ids)
+        rows = await self.db.fetchall(
+            f"""
+            SELECT id FROM tasks
+            WHERE status = ? AND worker_id = ? AND id IN ({placeholders})
+            """,
+            (TaskStatus.PROCESSING.value, worker_id, *task_ids),
+        )
+        return {row["id"] for row in rows}
+
+    async def mark_completed(
+        self, task_id: str, result_path: str, worker_id: Optional[str] = None
+    ) -> bool:
+        """
+        Mark task as completed.
+
+        With a worker ID, only while that worker holds the task's lease.
+        Returns False if no task was updated.
+        """
+        fence, fence_params = self._lease_fence(worker_id)
+        cursor = await self.db.execute(
+            f"""
             UPDATE tasks SET
                 status = ?,
                 completed_at = ?,
                 result_path = ?
-            WHERE id = ?
+            WHERE id = ?{fence}
             """,
             (
                 TaskStatus.COMPLETED.value,
                 datetime.utcnow().isoformat(),
                 result_path,
                 task_id,
+                *fence_params,
             ),
         )
         await self.db.commit()
+        return cursor.rowcount > 0
 
-    async def mark_failed(self, task_id: str, error: str) -> None:
-        """Mark task as failed."""
-        await self.db.execute(
+    async def mark_completed_batch(
+        self, results: List[Tuple[str, str]], worker_id: Optional[str] = None
+    ) -> Set[str]:
+        """
+        Mark several tasks completed. Takes (task_id, result_path) pairs.
+
+        With a worker ID, only tasks whose lease that worker still holds
+        are completed.
+
+        Returns:
+            IDs of the completed tasks
+        """
+        if not results:
+            return set()
+
+        completed_at = datetime.utcnow().isoformat()
+        fence, fence_params = self._lease_fence(worker_id)
+        async with self.db.transaction():
+            leased = await self._leased_ids([task_id for task_id, _ in results], worker_id)
+            await self.db.executemany(
+                f"""
+                UPDATE tasks SET
+                    status = ?,
+                    completed_at = ?,
+                    result_path = ?
+                WHERE id = ?{fence}
+                """,
+                [
+                    (TaskStatus.COMPLETED.value, completed_at, result_path, task_id, *fence_params)
+                    for task_id, result_path in results
+                    if task_id in leased
+                ],
+            )
+        return leased
+
+    async def record_fingerprints(self, fingerprints: List[Tuple[str, PageFingerprint]]) -> None:
+        """Store the fetched page fingerprint of several tasks and mark them checked."""
+        if not fingerprints:
+            return
+
+        checked_at = datetime.utcnow().isoformat()
+        await self.db.executemany(
             """
+            UPDATE tasks SET
+                etag = ?,
+                last_modified = ?,
+                content_hash = ?,
+                last_checked_at = ?
+            WHERE id = ?
+            """,
+            [
+                (fp.etag, fp.last_modified, fp.content_hash, checked_at, task_id)
+                for task_id, fp in fingerprints
+            ],
+        )
+        await self.db.commit()
+
+    async def mark_unchanged_batch(
+        self,
+        fingerprints: List[Tuple[str, PageFingerprint]],
+        worker_id: Optional[str] = None,
+    ) -> Set[str]:
+        """
+        Complete several tasks whose page had not changed.
+
+        The result path and completed_at of the earlier fetch are kept;
+        only last_checked_at moves. Validators missing from a 304
+        response keep their stored values. With a worker ID, only tasks
+        whose lease that worker still holds are completed.
+
+        Returns:
+            IDs of the completed tasks
+        """
+        if not fingerprints:
+            return set()
+
+        checked_at = datetime.utcnow().isoformat()
+        fence, fence_params = self._lease_fence(worker_id)
+        async with self.db.transaction():
+            leased = await self._leased_ids([task_id for task_id, _ in fingerprints], worker_id)
+            await self.db.executemany(
+                f"""
+                UPDATE tasks SET
+                    status = ?,
+                    etag = COALESCE(?, etag),
+                    last_modified = COALESCE(?, last_modified),
+                    content_hash = COALESCE(?, content_hash),
+                    last_checked_at = ?
+                WHERE id = ?{fence}
+                """,
+                [
+                    (
+                        TaskStatus.COMPLETED.value,
+                        fp.etag,
+                        fp.last_modified,
+                        fp.content_hash,
+                        checked_at,
+                        task_id,
+                        *fence_params,
+                    )
+                    for task_id, fp in fingerprints
+                    if task_id in leased
+                ],
+            )
+        return leased
+
+    async def requeue_completed(
+        self,
+        checked_before: datetime,
+        platform: Optional[str] = None,
+        limit: Optional[int] = None,
+    ) -> int:
+        """
+        Return completed tasks last checked before a time to the queue.
+
+        Tasks completed before fingerprints were recorded count as never
+        checked. Returns count requeued.
+        """
+        conditions = ["status = ?", "(last_checked_at < ? OR last_checked_at IS NULL)"]
+        params: list = [TaskStatus.COMPLETED.value, checked_before.isoformat()]
+        if platform:
+            conditions.append("platform = ?")
+            params.append(platform)
+        limit_sql = ""
+        if limit:
+            limit_sql = "ORDER BY last_checked_at LIMIT ?"
+            params.append(limit)
+
+        cursor = await self.db.execute(
+            f"""
+            UPDATE tasks SET
+                status = ?,
+                started_at = NULL,
+                error = NULL,
+                retry_count = 0,
+                worker_id = NULL,
+                lease_expires_at = NULL,
+                heartbeat_at = NULL,
+                next_attempt_at = NULL
+            WHERE id IN (
+                SELECT id FROM tasks WHERE {" AND ".join(conditions)} {limit_sql}
+            )
+            """,
+            (TaskStatus.PENDING.value, *params),
+        )
+        await self.db.commit()
+        return cursor.rowcount
+
+    async def mark_failed(
+        self, task_id: str, error: str, worker_id: Optional[str] = None
+    ) -> bool:
+        """
+        Mark task as failed.
+
+        With a worker ID, only while that worker holds the task's lease.
+        Returns False if no task was updated.
+        """
+        fence, fence_params = self._lease_fence(worker_id)
+        cursor = await self.db.execute(
+            f"""
             UPDATE tasks SET
                 status = ?,
                 completed_at = ?,
                 error = ?
-            WHERE id = ?
+            WHERE id = ?{fence}
             """,
             (
                 TaskStatus.FAILED.value,
                 datetime.utcnow().isoformat(),
                 error,
                 task_id,
+                *fence_params,
             ),
         )
         await self.db.commit()
+        return cursor.rowcount > 0
 
-    async def increment_retry(self, task_id: str) -> int:
-        """Increment retry count and return new count."""
-        await self.db.execute(
-            """
+    async def increment_retry(
+        self, task_id: str, delay_seconds: float = 0, worker_id: Optional[str] = None
+    ) -> Optional[int]:
+        """
+        Return a task to the pending pool and increment its retry count.
+
+        Args:
+            task_id: Task ID
+            delay_seconds: Do not claim the task again for this long
+            worker_id: Only requeue while this worker holds the task's lease
+
+        Returns:
+            New retry count, or None if the worker no longer holds the lease
+        """
+        next_attempt_at = None
+        if delay_seconds > 0:
+            next_attempt_at = (
+                datetime.utcnow() + timedelta(seconds=delay_seconds)
+            ).isoformat()
+
+        fence, fence_params = self._lease_fence(worker_id)
+        cursor = await self.db.execute(
+            f"""
             UPDATE tasks SET
                 retry_count = retry_count + 1,
-                status = ?
-            WHERE id = ?
+                status = ?,
+                next_attempt_at = ?,
+                started_at = NULL,
+                worker_id = NULL,
+                lease_expires_at = NULL,
+                heartbeat_at = NULL
+            WHERE id = ?{fence}
             """,
-            (TaskStatus.PENDING.value, task_id),
+            (TaskStatus.PENDING.value, next_attempt_at, task_id, *fence_params),
         )
         await self.db.commit()
+        if worker_id is not None and not cursor.rowcount:
+            return None
 
         row = await self.db.fetchone(
             "SELECT retry_count FROM tasks WHERE id = ?",
@@ -179,7 +817,7 @@ class TaskRepository:
     ) -> List[Task]:
         """Get tasks by status."""
         if platform:
-            rows = await self.db.fetchall(
+            rows = await self.db.read_fetchall(
                 """
                 SELECT * FROM tasks 
                 WHERE status = ? AND platform = ?
@@ -189,7 +827,7 @@ class TaskRepository:
                 (status.value, platform, limit),
             )
         else:
-            rows = await self.db.fetchall(
+            rows = await self.db.read_fetchall(
                 """
                 SELECT * FROM tasks 
                 WHERE status = ?
@@ -204,7 +842,7 @@ class TaskRepository:
     async def get_all(self, platform: Optional[str] = None, limit: int = 1000) -> List[Task]:
         """Get all tasks."""
         if platform:
-            rows = await self.db.fetchall(
+            rows = await self.db.read_fetchall(
                 """
                 SELECT * FROM tasks 
                 WHERE platform = ?
@@ -214,7 +852,7 @@ class TaskRepository:
                 (platform, limit),
             )
         else:
-            rows = await self.db.fetchall(
+            rows = await self.db.read_fetchall(
                 """
                 SELECT * FROM tasks 
                 ORDER BY created_at DESC
@@ -225,14 +863,123 @@ class TaskRepository:
 
         return [self._row_to_task(row) for row in rows]
 
-    async def count_by_status(self, status: TaskStatus) -> int:
-        """Count tasks by status."""
-        row = await self.db.fetchone(
-            "SELECT COUNT(*) as count FROM tasks WHERE status = ?",
-            (status.value,),
+    async def list_page(
+        self,
+        filters: Optional[TaskFilter] = None,
+        cursor: Optional[str] = None,
+        limit: int = 100,
+    ) -> Tuple[List[Task], Optional[str]]:
+        """
+        List tasks with keyset pagination.
+
+        Tasks are ordered by (priority DESC, created_at, id), which the
+        idx_tasks_order / idx_tasks_status_order indexes serve directly.
+
+        Args:
+            filters: Optional server-side filters
+            cursor: Cursor returned with the previous page
+            limit: Page size
+
+        Returns:
+            Tuple of (tasks, cursor for the next page or None)
+        """
+        conditions, params = (filters or TaskFilter()).to_sql()
+
+        if cursor:
+            priority, created_at, task_id = decode_cursor(cursor)
+            conditions.append(
+                """(
+                    priority < ?
+                    OR (priority = ? AND (
+                        created_at > ?
+                        OR (created_at = ? AND id > ?)
+                    ))
+                )"""
+            )
+            params.extend([priority, priority, created_at, created_at, task_id])
+
+        where = f"WHERE {' AND '.join(conditions)}" if conditions else ""
+        rows = await self.db.read_fetchall(
+            f"""
+            SELECT * FROM tasks
+            {where}
+            ORDER BY priority DESC, created_at ASC, id ASC
+            LIMIT ?
+            """,
+            (*params, limit + 1),
         )
+
+        tasks = [self._row_to_task(row) for row in rows[:limit]]
+        next_cursor = encode_cursor(tasks[-1]) if len(rows) > limit else None
+        return tasks, next_cursor
+
+    async def iter_all(
+        self,
+        filters: Optional[TaskFilter] = None,
+        page_size: int = 500,
+    ) -> AsyncIterator[Task]:
+        """Stream every matching task page by page."""
+        cursor = None
+        while True:
+            tasks, cursor = await self.list_page(filters, cursor, page_size)
+            for task in tasks:
+                yield task
+            if cursor is None:
+                break
+
+    async def count_by_status(
+        self, status: TaskStatus, platform: Optional[str] = None
+    ) -> int:
+        """Count tasks by status (O(1) via task_counters)."""
+        if platform:
+            row = await self.db.read_fetchone(
+                """
+                SELECT COALESCE(SUM(count), 0) as count FROM task_counters
+                WHERE status = ? AND platform = ?
+                """,
+                (status.value, platform),
+            )
+        else:
+            row = await self.db.read_fetchone(
+                """
+                SELECT COALESCE(SUM(count), 0) as count FROM task_counters
+                WHERE status = ?
+                """,
+                (status.value,),
+            )
         return row["count"] if row else 0
 
+    async def count_all_by_status(
+        self, platform: Optional[str] = None
+    ) -> Dict[str, int]:
+        """Count tasks for every status in one query."""
+        if platform:
+            rows = await self.db.read_fetchall(
+                """
+                SELECT status, SUM(count) as count FROM task_counters
+                WHERE platform = ?
+                GROUP BY status
+                """,
+                (platform,),
+            )
+        else:
+            rows = await self.db.read_fetchall(
+                """
+                SELECT status, SUM(count) as count FROM task_counters
+                GROUP BY status
+                """,
+            )
+
+        counts = {status.value: 0 for status in TaskStatus}
+        counts.update({row["status"]: row["count"] for row in rows})
+        return counts
+
+    async def recount(self) -> None:
+        """Recompute the counter tables from tasks and discovered_links."""
+        async with self.db.transaction():
+            for statement in RECOUNT_STATEMENTS:
+                await self.db.execute(statement)
+
     async def count_pending(self) -> int:
         """Count pending tasks."""
         return await self.count_by_status(TaskStatus.PENDING)
@@ -257,4 +1004,14 @@ class TaskRepository:
             error=row["error"],
             retry_count=row["retry_count"],
             discovered_links_count=row["discovered_links_count"],
+            worker_id=row["worker_id"],
+            lease_expires_at=datetime.fromisoformat(row["lease_expires_at"]) if row["lease_expires_at"] else None,
+            heartbeat_at=datetime.fromisoformat(row["heartbeat_at"]) if row["heartbeat_at"] else None,
+            next_attempt_at=datetime.fromisoformat(row["next_attempt_at"]) if row["next_attempt_at"] else None,
+            base_priority=row["base_priority"],
+            relationship_type=row["relationship_type"],
+            etag=row["etag"],
+            last_modified=row["last_modified"],
+            content_hash=row["content_hash"],
+            last_checked_at=datetime.fromisoformat(row["last_checked_at"]) if row["last_checked_at"] else None,
         )
@@ -2,12 +2,18 @@
 
 from crawler.scraper.scraper import Scraper
 from crawler.scraper.browser import BrowserManager
+from crawler.scraper.pool import BrowserPool, PooledBrowser
+from crawler.scraper.resources import PageResources, ResourcePolicy
 from crawler.scraper.anti_bot import AntiBotHandler
 from crawler.scraper.retry import RetryConfig, retry_with_backoff
 
 __all__ = [
     "Scraper",
     "BrowserManager",
+    "BrowserPool",
+    "PooledBrowser",
+    "ResourcePolicy",
+    "PageResources",
     "AntiBotHandler",
     "RetryConfig",
     "retry_with_backoff",
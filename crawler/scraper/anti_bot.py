@@ -1,10 +1,75 @@
 """Anti-bot challenge handler."""
 
 import asyncio
-from typing import Optional, Dict, Any
+import time
+from dataclasses import dataclass
+from enum import Enum
+from typing import Any, Awaitable, Callable, Dict, Optional, Tuple
+
+from crawler.config_loader import PlatformConfig
 from crawler.scraper.browser import BrowserManager
 
 
+class ChallengeState(str, Enum):
+    """States of a challenge being waited out."""
+    DETECTED = "detected"
+    WAITING = "waiting"
+    CLICKED = "clicked"
+    RESOLVED = "resolved"
+    TIMED_OUT = "timed_out"
+
+
+@dataclass
+class ChallengeSettings:
+    """
+    How long and how often to poll a challenge page.
+
+    Read from "anti_bot" in manifest.json ("scraping") and schedule.json,
+    schedule.json taking precedence:
+
+        {"anti_bot": {"timeout": 30, "poll_interval": 0.5,
+                      "click_after": 5, "target_selector": "#parcel"}}
+
+    target_selector defaults to the parcel_id selector when it is CSS.
+    """
+    timeout: float = 30.0
+    poll_interval: float = 0.5
+    click_after: float = 5.0
+    target_selector: Optional[str] = None
+
+    @classmethod
+    def from_config(cls, config: PlatformConfig) -> "ChallengeSettings":
+        """Build a platform's challenge settings."""
+        settings: Dict[str, Any] = {}
+        scraping = config.manifest.get("scraping") or {}
+        for source in (scraping, config.schedule or {}):
+            settings.update(source.get("anti_bot") or {})
+
+        if "target_selector" not in settings:
+            rule = config.selectors.get("selectors", {}).get("parcel_id") or {}
+            if rule.get("selector") and rule.get("type", "css") == "css":
+                settings["target_selector"] = rule["selector"]
+        return cls(**{k: v for k, v in settings.items() if k in cls.__dataclass_fields__})
+
+
+@dataclass
+class ChallengeOutcome:
+    """Result of waiting out a challenge."""
+    state: ChallengeState = ChallengeState.DETECTED
+    html: str = ""
+    polls: int = 0
+    waited_seconds: float = 0.0
+    clicked: bool = False
+
+    @property
+    def resolved(self) -> bool:
+        return self.state == ChallengeState.RESOLVED
+
+
+class ChallengeError(RuntimeError):
+    """Challenge page that did not clear in time."""
+
+
 class AntiBotHandler:
     """
     Handles anti-bot challenges.
@@ -27,8 +92,25 @@ class AntiBotHandler:
         "robot check",
     ]
 
-    def __init__(self, browser: BrowserManager):
+    # Buttons that start a challenge's verification
+    VERIFY_SELECTOR = "input[type='button'], button, .cf-verify-button"
+
+    def __init__(
+        self,
+        browser: Optional[BrowserManager] = None,
+        settings: Optional[ChallengeSettings] = None,
+        run: Optional[Callable[..., Awaitable[Any]]] = None,
+    ):
+        """
+        Args:
+            browser: Browser showing the page; detection works without one
+            settings: Polling settings for handle_challenge
+            run: Runs a blocking driver call off the event loop, e.g.
+                PooledBrowser.run (default: asyncio.to_thread)
+        """
         self.browser = browser
+        self.settings = settings or ChallengeSettings()
+        self.run = run or asyncio.to_thread
 
     def is_blocked(self, html: str) -> bool:
         """Check if response indicates blocking."""
@@ -50,35 +132,66 @@ class AntiBotHandler:
 
         return None
 
-    async def handle_challenge(self) -> bool:
+    async def handle_challenge(self) -> ChallengeOutcome:
         """
-        Attempt to handle anti-bot challenge.
-        
-        Returns True if handled successfully.
+        Wait for the challenge on the current page to clear.
+
+        Polls the page every poll_interval seconds and stops as soon as
+        the challenge markers are gone or the target selector appears.
+        If the challenge is still up after click_after seconds, a verify
+        button is clicked once. Gives up after timeout seconds. Driver
+        calls go through run, so the event loop stays free while waiting.
         """
-        driver = self.browser.get_driver()
-        if driver is None:
-            return False
+        outcome = ChallengeOutcome()
+        if self.browser is None:
+            return outcome
+
+        settings = self.settings
+        started = time.monotonic()
+        outcome.state = ChallengeState.WAITING
 
-        # Wait for challenge to resolve (some resolve automatically)
-        await asyncio.sleep(5)
+        while True:
+            outcome.html, target_found = await self.run(self._probe, settings.target_selector)
+            outcome.polls += 1
+            elapsed = time.monotonic() - started
+            outcome.waited_seconds = elapsed
 
-        # Try clicking if there's a verify button
+            if target_found or not self.is_blocked(outcome.html):
+                outcome.state = ChallengeState.RESOLVED
+                return outcome
+            if elapsed >= settings.timeout:
+                outcome.state = ChallengeState.TIMED_OUT
+                return outcome
+
+            if outcome.state == ChallengeState.WAITING and elapsed >= settings.click_after:
+                outcome.clicked = await self.run(self._click_verify)
+                outcome.state = ChallengeState.CLICKED
+
+            await asyncio.sleep(min(settings.poll_interval, settings.timeout - elapsed))
+
+    def _probe(self, target_selector: Optional[str]) -> Tuple[str, bool]:
+        """Get the page HTML and whether the target selector is present."""
+        driver = self.browser.get_driver()
+        html = driver.page_source
+        found = False
+        if target_selector:
+            try:
+                found = bool(driver.find_elements("css selector", target_selector))
+            except Exception:
+                pass
+        return html, found
+
+    def _click_verify(self) -> bool:
+        """Click a verify button if the page has one."""
+        driver = self.browser.get_driver()
         try:
-            verify_button = driver.find_element(
-                "css selector",
-                "input[type='button'], button, .cf-verify-button"
-            )
-            if verify_button:
-                verify_button.click()
-                await asyncio.sleep(3)
+            buttons = driver.find_elements("css selector", self.VERIFY_SELECTOR)
+            if buttons:
+                buttons[0].click()
                 return True
         except Exception:
             pass
-
-        # Challenge might resolve on its own
-        await asyncio.sleep(10)
-        return True
+        return False
 
     def get_challenge_info(self, html: str) -> Dict[str, Any]:
         """Get information about detected challenge."""
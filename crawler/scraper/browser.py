@@ -1,8 +1,49 @@
 """Browser manager for SeleniumBase."""
 
-from typing import Optional
+import logging
+import os
+from typing import Dict, List, Optional
 from seleniumbase import Driver
 
+from crawler.scraper.resources import PageResources, ResourcePolicy, summarize_performance_log
+
+logger = logging.getLogger(__name__)
+
+
+def process_tree_rss(pid: int) -> Optional[int]:
+    """
+    Resident memory of a process and all its descendants, in bytes.
+
+    Reads /proc, so returns None where it is not available.
+    """
+    if not os.path.isdir("/proc"):
+        return None
+
+    children: Dict[int, List[int]] = {}
+    for entry in os.listdir("/proc"):
+        if not entry.isdigit():
+            continue
+        try:
+            with open(f"/proc/{entry}/stat") as f:
+                # Fields after the parenthesised command name: state, ppid, ...
+                ppid = int(f.read().rpartition(")")[2].split()[1])
+        except (OSError, IndexError, ValueError):
+            continue
+        children.setdefault(ppid, []).append(int(entry))
+
+    page_size = os.sysconf("SC_PAGE_SIZE")
+    total = 0
+    stack = [pid]
+    while stack:
+        current = stack.pop()
+        try:
+            with open(f"/proc/{current}/statm") as f:
+                total += int(f.read().split()[1]) * page_size
+        except (OSError, IndexError, ValueError):
+            continue
+        stack.extend(children.get(current, ()))
+    return total
+
 
 class BrowserManager:
     """
@@ -13,6 +54,8 @@ class BrowserManager:
     - UC mode for anti-bot bypass
     - Screenshot capability
     - Resource management
+    - Blocking of images, fonts, stylesheets, media and trackers
+      (ResourcePolicy) via CDP, with per-page request/bytes counts
     """
 
     def __init__(
@@ -21,11 +64,13 @@ class BrowserManager:
         uc_mode: bool = True,
         browser: str = "chrome",
         timeout: int = 30,
+        resource_policy: Optional[ResourcePolicy] = None,
     ):
         self.headless = headless
         self.uc_mode = uc_mode
         self.browser = browser
         self.timeout = timeout
+        self.resource_policy = resource_policy or ResourcePolicy.disabled()
         self._driver: Optional[Driver] = None
 
     def get_driver(self) -> Driver:
@@ -41,9 +86,38 @@ class BrowserManager:
                 disable_js=True,
                 # Performance
                 enable_cdp_events=True,
+                log_cdp_events=self.resource_policy.enabled,
             )
+            self._apply_resource_policy()
         return self._driver
 
+    def _apply_resource_policy(self) -> None:
+        """Tell Chrome which sub-resource URLs to fail without fetching."""
+        patterns = self.resource_policy.blocked_urls()
+        if not patterns:
+            return
+        try:
+            self._driver.execute_cdp_cmd("Network.enable", {})
+            self._driver.execute_cdp_cmd("Network.setBlockedURLs", {"urls": patterns})
+        except Exception as e:
+            # Only an optimization; pages still load without it
+            logger.warning(f"Could not enable resource blocking: {e}")
+
+    def page_resources(self) -> Optional[PageResources]:
+        """
+        Requests and bytes loaded or blocked since the last call.
+
+        Drains the driver's performance log, so call it once before
+        navigating and once after the page has loaded.
+        """
+        if self._driver is None or not self.resource_policy.enabled:
+            return None
+        try:
+            entries = self._driver.get_log("performance")
+        except Exception:
+            return None
+        return summarize_performance_log(entries, self.resource_policy.size_estimates)
+
     def close(self) -> None:
         """Close browser."""
         if self._driver:
@@ -53,6 +127,18 @@ class BrowserManager:
                 pass
             self._driver = None
 
+    def rss_bytes(self) -> Optional[int]:
+        """Resident memory of the driver and its Chrome processes, if measurable."""
+        if self._driver is None:
+            return None
+
+        service = getattr(self._driver, "service", None)
+        process = getattr(service, "process", None)
+        pid = getattr(process, "pid", None)
+        if pid is None:
+            return None
+        return process_tree_rss(pid)
+
     def take_screenshot(self) -> Optional[bytes]:
         """Take a screenshot."""
         if self._driver is None:
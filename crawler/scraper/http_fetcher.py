@@ -0,0 +1,220 @@
+"""Plain HTTP fetching for server-rendered pages."""
+
+import asyncio
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Tuple
+from urllib.parse import urljoin
+
+import httpx
+from bs4 import BeautifulSoup
+
+from crawler.config_loader import PlatformConfig
+from crawler.http_clients import get_client, pool_settings
+from crawler.models.scraped_content import ScrapedContent
+from crawler.models.task import PageFingerprint
+from crawler.scraper.anti_bot import AntiBotHandler
+
+
+# How each platform is fetched
+FETCH_MODES = ("browser", "http", "auto")
+
+# Statuses that mean "not for bots" rather than "not there"
+BLOCKED_STATUSES = {401, 403, 429, 503}
+
+DEFAULT_HEADERS = {
+    "User-Agent": (
+        "Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36 "
+        "(KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36"
+    ),
+    "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8",
+    "Accept-Language": "en-US,en;q=0.9",
+}
+
+
+class HttpFetchError(Exception):
+    """HTTP response that cannot be used as page content."""
+
+    def __init__(self, url: str, status_code: int):
+        super().__init__(f"HTTP {status_code} for {url}")
+        self.url = url
+        self.status_code = status_code
+
+
+def fetch_settings(config: PlatformConfig) -> Dict[str, Any]:
+    """
+    Get a platform's fetch settings.
+
+    Read from manifest.json ("scraping") and schedule.json, schedule.json
+    taking precedence:
+
+        {
+            "fetch_mode": "auto",
+            "required_selectors": ["parcel_id"],
+            "http_headers": {"Referer": "https://county.gov/"}
+        }
+    """
+    settings: Dict[str, Any] = {}
+    scraping = config.manifest.get("scraping") or {}
+    for source in (scraping, config.schedule or {}):
+        for key in ("fetch_mode", "required_selectors", "http_headers"):
+            if key in source:
+                settings[key] = source[key]
+
+    mode = settings.get("fetch_mode", "browser")
+    if mode not in FETCH_MODES:
+        raise ValueError(f"Invalid fetch_mode '{mode}' (use {', '.join(FETCH_MODES)})")
+    settings["fetch_mode"] = mode
+    return settings
+
+
+class HttpFetcher:
+    """
+    Fetches pages without a browser, over the shared "fetch" client.
+
+    Besides the HTML it reports why a page may need a real browser:
+    a blocking status code, an anti-bot page, or required selectors
+    missing from the HTML (content rendered by JavaScript).
+
+    Required selectors are the names in required_selectors, else the
+    selectors marked "required": true, else parcel_id if defined.
+    """
+
+    def __init__(
+        self,
+        config: PlatformConfig,
+        timeout: int = 30,
+        headers: Optional[Dict[str, str]] = None,
+        required_selectors: Optional[List[str]] = None,
+        client: Optional[httpx.AsyncClient] = None,
+    ):
+        self.config = config
+        self.timeout = timeout
+        self.headers = {**DEFAULT_HEADERS, **(headers or {})}
+        self.anti_bot = AntiBotHandler()
+
+        selectors = config.selectors.get("selectors", {})
+        if required_selectors is None:
+            required_selectors = [
+                name for name, rule in selectors.items() if rule.get("required")
+            ]
+            if not required_selectors and "parcel_id" in selectors:
+                required_selectors = ["parcel_id"]
+        self.required = {
+            name: selectors[name] for name in required_selectors if name in selectors
+        }
+
+        self._client = client
+
+    @property
+    def client(self) -> httpx.AsyncClient:
+        """Get the client, by default the process-wide "fetch" client."""
+        if self._client is not None:
+            return self._client
+        return get_client("fetch", **pool_settings(self.config, follow_redirects=True))
+
+    async def fetch(
+        self, url: str, fingerprint: Optional[PageFingerprint] = None
+    ) -> Tuple[ScrapedContent, Optional[str]]:
+        """
+        Fetch URL over HTTP.
+
+        With the fingerprint of an earlier fetch the request is
+        conditional; a 304 response gives empty content with
+        metadata["not_modified"] set.
+
+        Returns:
+            Tuple of (content, reason the page needs a browser or None)
+
+        Raises:
+            HttpFetchError: On an error status that a browser would get too
+            httpx.HTTPError: On connection errors and timeouts
+        """
+        headers = dict(self.headers)
+        if fingerprint is not None:
+            if fingerprint.etag:
+                headers["If-None-Match"] = fingerprint.etag
+            if fingerprint.last_modified:
+                headers["If-Modified-Since"] = fingerprint.last_modified
+
+        response = await self.client.get(url, headers=headers, timeout=self.timeout)
+        status = response.status_code
+        validators = {
+            "etag": response.headers.get("ETag"),
+            "last_modified": response.headers.get("Last-Modified"),
+        }
+        if status == 304:
+            return ScrapedContent(
+                html="",
+                url=url,
+                metadata={
+                    "fetched_at": datetime.utcnow().isoformat(),
+                    "platform": self.config.platform,
+                    "fetched_via": "http",
+                    "status_code": status,
+                    "not_modified": True,
+                    **validators,
+                },
+            ), None
+        if status >= 400 and status not in BLOCKED_STATUSES:
+            raise HttpFetchError(url, status)
+
+        html = response.text
+        final_url = str(response.url)
+        title, discovered_urls, missing = await asyncio.to_thread(self._inspect, html, final_url)
+
+        content = ScrapedContent(
+            html=html,
+            url=url,
+            discovered_urls=discovered_urls,
+            metadata={
+                "title": title,
+                "fetched_at": datetime.utcnow().isoformat(),
+                "platform": self.config.platform,
+                "fetched_via": "http",
+                "status_code": status,
+                "final_url": final_url,
+                **validators,
+            },
+        )
+
+        if status in BLOCKED_STATUSES:
+            return content, f"status {status}"
+        if self.anti_bot.is_blocked(html):
+            return content, f"anti-bot page ({self.anti_bot.get_block_type(html) or 'unknown'})"
+        if missing:
+            return content, f"missing selectors: {', '.join(missing)}"
+        return content, None
+
+    def _inspect(self, html: str, base_url: str) -> Tuple[str, List[str], List[str]]:
+        """Get the title, discovery links and required selectors with no match."""
+        soup = BeautifulSoup(html, "lxml")
+        title = soup.title.get_text(strip=True) if soup.title else ""
+
+        discovered_urls = []
+        for rule in self.config.discovery.get("links", {}).values():
+            selector = rule.get("selector")
+            if not selector:
+                continue
+            attr = rule.get("attr", "href")
+            try:
+                elements = soup.select(selector)
+            except Exception:
+                continue
+            for elem in elements:
+                link = elem.get(attr)
+                if link:
+                    link = urljoin(base_url, link)
+                    if link.startswith("http"):
+                        discovered_urls.append(link)
+
+        missing = []
+        for name, rule in self.required.items():
+            if rule.get("type", "css") != "css":
+                continue
+            try:
+                if not soup.select_one(rule["selector"]):
+                    missing.append(name)
+            except Exception:
+                continue
+
+        return title, discovered_urls, missing
@@ -0,0 +1,251 @@
+"""Pool of warm browsers with recycling."""
+
+import asyncio
+import logging
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import asynccontextmanager
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING, Any, AsyncIterator, Callable, Dict, Optional, Set
+
+from crawler.config_loader import PlatformConfig
+from crawler.scraper.resources import ResourcePolicy
+
+if TYPE_CHECKING:
+    from crawler.scraper.browser import BrowserManager
+
+logger = logging.getLogger(__name__)
+
+
+# Error messages meaning the driver session is gone and must be replaced
+FATAL_ERROR_MARKERS = (
+    "invalid session id",
+    "chrome not reachable",
+    "disconnected: not connected to devtools",
+    "session deleted because of page crash",
+    "tab crashed",
+    "no such window",
+    "connection refused",
+)
+
+
+def is_fatal_browser_error(error: BaseException) -> bool:
+    """Check if an error left the browser unusable."""
+    message = str(error).lower()
+    return any(marker in message for marker in FATAL_ERROR_MARKERS)
+
+
+@dataclass
+class PooledBrowser:
+    """A browser checked out from the pool, bound to its own thread."""
+    manager: "BrowserManager"
+    executor: ThreadPoolExecutor
+    pages: int = 0
+    started_at: float = field(default_factory=time.monotonic)
+
+    async def run(self, func: Callable[..., Any], *args) -> Any:
+        """Run a blocking driver call on this browser's thread."""
+        return await asyncio.get_running_loop().run_in_executor(
+            self.executor, func, *args
+        )
+
+
+class BrowserPool:
+    """
+    Hands out pre-launched browsers and replaces worn-out ones.
+
+    start() launches size drivers concurrently. checkout() returns an idle
+    browser and checkin() gives it back; a browser is recycled after
+    max_pages pages, when its process tree exceeds max_rss_mb, or after
+    an error that killed the session. Replacements launch in the
+    background while the remaining browsers keep serving, so a checkout
+    only waits when every browser is busy.
+
+    Configured per platform in manifest.json ("scraping") or
+    schedule.json, schedule.json taking precedence:
+
+        {"browser_pool": {"max_pages": 200, "max_rss_mb": 1500}}
+
+    Browsers of a pool built with from_config block sub-resources per
+    the platform's ResourcePolicy.
+    """
+
+    def __init__(
+        self,
+        size: int = 1,
+        headless: bool = True,
+        uc_mode: bool = True,
+        timeout: int = 30,
+        max_pages: Optional[int] = 200,
+        max_rss_mb: Optional[float] = None,
+        rss_check_every: int = 10,
+        resource_policy: Optional[ResourcePolicy] = None,
+        factory: Optional[Callable[[], "BrowserManager"]] = None,
+    ):
+        self.size = max(1, size)
+        self.max_pages = max_pages
+        self.max_rss_mb = max_rss_mb
+        self.rss_check_every = max(1, rss_check_every)
+        self.factory = factory or self._default_factory(
+            headless, uc_mode, timeout, resource_policy
+        )
+
+        self._idle: asyncio.Queue = asyncio.Queue()
+        self._in_use: Set[int] = set()
+        self._launching: Set[asyncio.Task] = set()
+        self._started = False
+        self._closed = False
+
+        # Counters
+        self.launched = 0
+        self.launch_failures = 0
+        self.recycled: Dict[str, int] = {"pages": 0, "rss": 0, "error": 0}
+
+    @staticmethod
+    def _default_factory(
+        headless: bool,
+        uc_mode: bool,
+        timeout: int,
+        resource_policy: Optional[ResourcePolicy],
+    ) -> Callable[[], "BrowserManager"]:
+        def factory() -> "BrowserManager":
+            from crawler.scraper.browser import BrowserManager
+            return BrowserManager(
+                headless=headless,
+                uc_mode=uc_mode,
+                timeout=timeout,
+                resource_policy=resource_policy,
+            )
+        return factory
+
+    @classmethod
+    def from_config(cls, config: PlatformConfig, size: int = 1, **kwargs) -> "BrowserPool":
+        """Build a pool using a platform's browser_pool settings."""
+        settings: Dict[str, Any] = {}
+        scraping = config.manifest.get("scraping") or {}
+        for source in (scraping, config.schedule or {}):
+            settings.update(source.get("browser_pool") or {})
+
+        for key in ("max_pages", "max_rss_mb", "rss_check_every"):
+            if key in settings:
+                kwargs.setdefault(key, settings[key])
+        if "factory" not in kwargs:
+            kwargs.setdefault("resource_policy", ResourcePolicy.from_config(config))
+        return cls(size=size, **kwargs)
+
+    async def start(self) -> None:
+        """Launch all browsers and wait until they are ready."""
+        self._started = True
+        await asyncio.gather(*(self._launch() for _ in range(self.size)))
+
+    async def _launch(self) -> None:
+        """Start one browser and make it available, retrying on failure."""
+        delay = 1.0
+        while not self._closed:
+            manager = self.factory()
+            browser = PooledBrowser(
+                manager,
+                ThreadPoolExecutor(max_workers=1, thread_name_prefix="browser"),
+            )
+            try:
+                await browser.run(manager.get_driver)
+            except Exception as e:
+                self.launch_failures += 1
+                logger.error(f"Browser launch failed, retrying in {delay:.0f}s: {e}")
+                await self._shutdown(browser)
+                await asyncio.sleep(delay)
+                delay = min(delay * 2, 60.0)
+                continue
+
+            self.launched += 1
+            self._idle.put_nowait(browser)
+            return
+
+    def _launch_in_background(self) -> None:
+        """Start a replacement browser without blocking the caller."""
+        task = asyncio.create_task(self._launch())
+        self._launching.add(task)
+        task.add_done_callback(self._launching.discard)
+
+    async def checkout(self) -> PooledBrowser:
+        """Take an idle browser, waiting if all are busy."""
+        if self._closed:
+            raise RuntimeError("Browser pool is closed")
+        if not self._started:
+            # Not started: launch lazily
+            self._started = True
+            for _ in range(self.size):
+                self._launch_in_background()
+
+        browser = await self._idle.get()
+        self._in_use.add(id(browser))
+        return browser
+
+    async def checkin(self, browser: PooledBrowser, error: Optional[BaseException] = None) -> None:
+        """Return a browser after one page, recycling it if it is worn out."""
+        self._in_use.discard(id(browser))
+        browser.pages += 1
+
+        reason = await self._recycle_reason(browser, error)
+        if self._closed:
+            await self._shutdown(browser)
+        elif reason is None:
+            self._idle.put_nowait(browser)
+        else:
+            self.recycled[reason] += 1
+            logger.info(f"Recycling browser after {browser.pages} pages ({reason})")
+            self._launch_in_background()
+            await self._shutdown(browser)
+
+    async def _recycle_reason(self, browser: PooledBrowser, error: Optional[BaseException]) -> Optional[str]:
+        """Get why a browser should be replaced, or None to keep it."""
+        if error is not None and is_fatal_browser_error(error):
+            return "error"
+        if self.max_pages and browser.pages >= self.max_pages:
+            return "pages"
+        if self.max_rss_mb and browser.pages % self.rss_check_every == 0:
+            rss = await browser.run(browser.manager.rss_bytes)
+            if rss is not None and rss > self.max_rss_mb * 1024 * 1024:
+                return "rss"
+        return None
+
+    @asynccontextmanager
+    async def browser(self) -> AsyncIterator[PooledBrowser]:
+        """Check out a browser for the duration of a block."""
+        browser = await self.checkout()
+        try:
+            yield browser
+        except BaseException as e:
+            await self.checkin(browser, e)
+            raise
+        else:
+            await self.checkin(browser)
+
+    async def _shutdown(self, browser: PooledBrowser) -> None:
+        """Quit a browser and release its thread."""
+        try:
+            await browser.run(browser.manager.close)
+        finally:
+            browser.executor.shutdown(wait=False)
+
+    def stats(self) -> Dict[str, Any]:
+        """Pool size and recycling counters."""
+        return {
+            "size": self.size,
+            "idle": self._idle.qsize(),
+            "in_use": len(self._in_use),
+            "launching": len(self._launching),
+            "launched": self.launched,
+            "launch_failures": self.launch_failures,
+            "recycled": dict(self.recycled),
+        }
+
+    async def close(self) -> None:
+        """Stop launches and quit idle browsers; busy ones quit on checkin."""
+        self._closed = True
+        for task in list(self._launching):
+            task.cancel()
+        await asyncio.gather(*self._launching, return_exceptions=True)
+
+        while not self._idle.empty():
+            await self._shutdown(self._idle.get_nowait())
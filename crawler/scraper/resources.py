@@ -0,0 +1,175 @@
+"""Blocking of page sub-resources the scraper never reads."""
+
+import json
+import logging
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterable, List, Optional
+
+from crawler.config_loader import PlatformConfig
+
+logger = logging.getLogger(__name__)
+
+# URL patterns per CDP resource type. Network.setBlockedURLs matches
+# URLs only, so types are blocked by file extension.
+TYPE_PATTERNS: Dict[str, List[str]] = {
+    "image": ["jpg", "jpeg", "png", "gif", "webp", "avif", "svg", "ico", "bmp"],
+    "font": ["woff", "woff2", "ttf", "otf", "eot"],
+    "stylesheet": ["css"],
+    "media": ["mp4", "webm", "ogg", "mp3", "wav", "m3u8"],
+}
+
+# Ads and analytics, blocked unless a platform overrides block_patterns
+DEFAULT_BLOCK_PATTERNS = [
+    "*google-analytics.com*",
+    "*googletagmanager.com*",
+    "*doubleclick.net*",
+    "*googlesyndication.com*",
+    "*facebook.net*",
+    "*hotjar.com*",
+    "*newrelic.com*",
+    "*nr-data.net*",
+]
+
+# Typical transfer sizes, to estimate bytes saved by blocked requests
+DEFAULT_SIZE_ESTIMATES = {
+    "Image": 60_000,
+    "Font": 40_000,
+    "Stylesheet": 25_000,
+    "Media": 500_000,
+    "Script": 30_000,
+    "Other": 10_000,
+}
+
+
+@dataclass
+class ResourcePolicy:
+    """
+    Per-platform policy of sub-resources Chrome does not download.
+
+    Read from "resource_blocking" in manifest.json ("scraping") and
+    schedule.json, schedule.json taking precedence:
+
+        {
+            "enabled": true,
+            "block_types": ["image", "font", "stylesheet", "media"],
+            "block_patterns": ["*tracker.example.com*"],
+            "allow_images": ["*photos.county.gov*"]
+        }
+
+    Images are only ever read from the markup by ImageExtractor, so they
+    are blocked by default. setBlockedURLs cannot make exceptions, so a
+    non-empty allow_images list turns extension-based image blocking off
+    for the platform; block_patterns still apply.
+    """
+    enabled: bool = True
+    block_types: List[str] = field(default_factory=lambda: list(TYPE_PATTERNS))
+    block_patterns: List[str] = field(default_factory=lambda: list(DEFAULT_BLOCK_PATTERNS))
+    allow_images: List[str] = field(default_factory=list)
+    size_estimates: Dict[str, int] = field(default_factory=lambda: dict(DEFAULT_SIZE_ESTIMATES))
+
+    @classmethod
+    def from_config(cls, config: PlatformConfig) -> "ResourcePolicy":
+        """Build a platform's policy."""
+        settings: Dict[str, Any] = {}
+        scraping = config.manifest.get("scraping") or {}
+        for source in (scraping, config.schedule or {}):
+            settings.update(source.get("resource_blocking") or {})
+
+        unknown = set(settings.get("block_types", ())) - set(TYPE_PATTERNS)
+        if unknown:
+            raise ValueError(
+                f"Unknown resource types {sorted(unknown)} (use {', '.join(TYPE_PATTERNS)})"
+            )
+        return cls(**{k: v for k, v in settings.items() if k in cls.__dataclass_fields__})
+
+    @classmethod
+    def disabled(cls) -> "ResourcePolicy":
+        """A policy that blocks nothing."""
+        return cls(enabled=False)
+
+    def blocked_urls(self) -> List[str]:
+        """URL patterns for Network.setBlockedURLs."""
+        if not self.enabled:
+            return []
+
+        patterns = list(self.block_patterns)
+        for resource_type in self.block_types:
+            if resource_type == "image" and self.allow_images:
+                continue
+            for extension in TYPE_PATTERNS[resource_type]:
+                # With and without a query string
+                patterns.append(f"*.{extension}")
+                patterns.append(f"*.{extension}?*")
+        return patterns
+
+
+@dataclass
+class PageResources:
+    """Requests made and blocked while loading one page."""
+    requests: int = 0
+    blocked: int = 0
+    blocked_by_type: Dict[str, int] = field(default_factory=dict)
+    bytes_loaded: int = 0
+    bytes_saved: int = 0
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Convert to dictionary for metadata."""
+        return {
+            "requests": self.requests,
+            "blocked": self.blocked,
+            "blocked_by_type": dict(self.blocked_by_type),
+            "bytes_loaded": self.bytes_loaded,
+            "bytes_saved": self.bytes_saved,
+        }
+
+    def add(self, other: "PageResources") -> None:
+        """Accumulate another page's counts."""
+        self.requests += other.requests
+        self.blocked += other.blocked
+        self.bytes_loaded += other.bytes_loaded
+        self.bytes_saved += other.bytes_saved
+        for resource_type, count in other.blocked_by_type.items():
+            self.blocked_by_type[resource_type] = self.blocked_by_type.get(resource_type, 0) + count
+
+
+def summarize_performance_log(
+    entries: Iterable[Dict[str, Any]],
+    size_estimates: Optional[Dict[str, int]] = None,
+) -> PageResources:
+    """
+    Count requests, blocked requests and bytes from Chrome's performance log.
+
+    Loaded bytes are the encoded sizes Chrome reports; saved bytes are
+    estimated from typical sizes per resource type, since blocked
+    requests never report one.
+    """
+    estimates = size_estimates or DEFAULT_SIZE_ESTIMATES
+    stats = PageResources()
+    types: Dict[str, str] = {}
+
+    for entry in entries:
+        try:
+            message = json.loads(entry["message"])["message"]
+        except (KeyError, TypeError, ValueError):
+            continue
+        method = message.get("method")
+        params = message.get("params") or {}
+
+        if method == "Network.requestWillBeSent":
+            stats.requests += 1
+            types[params.get("requestId")] = params.get("type", "Other")
+        elif method == "Network.loadingFinished":
+            stats.bytes_loaded += int(params.get("encodedDataLength") or 0)
+        elif method == "Network.loadingFailed":
+            blocked = (
+                params.get("blockedReason") is not None
+                or params.get("errorText") == "net::ERR_BLOCKED_BY_CLIENT"
+            )
+            if not blocked:
+                continue
+            resource_type = params.get("type") or types.get(params.get("requestId"), "Other")
+            stats.blocked += 1
+            stats.blocked_by_type[resource_type] = stats.blocked_by_type.get(resource_type, 0) + 1
+            stats.bytes_saved += estimates.get(resource_type, estimates.get("Other", 0))
+
+    return stats
@@ -1,15 +1,25 @@
 """Main Scraper class."""
 
-import asyncio
-from typing import Optional, List
+import contextlib
+import time
+from typing import Any, AsyncContextManager, Callable, Dict, Optional, List
 from datetime import datetime
 import logging
 
+import httpx
+
 from crawler.models.scraped_content import ScrapedContent
+from crawler.models.task import PageFingerprint
 from crawler.models.parsed_result import DiscoveredLink, RelationshipType
 from crawler.config_loader import PlatformConfig
 from crawler.scraper.browser import BrowserManager
-from crawler.scraper.anti_bot import AntiBotHandler
+from crawler.scraper.anti_bot import (
+    AntiBotHandler, ChallengeError, ChallengeOutcome, ChallengeSettings,
+)
+from crawler.scraper.http_fetcher import FETCH_MODES, HttpFetcher, fetch_settings
+from crawler.ratelimit import RateLimiter
+from crawler.scraper.pool import BrowserPool, PooledBrowser
+from crawler.scraper.resources import PageResources
 from crawler.scraper.retry import RetryConfig, retry_with_backoff
 from crawler.scraper.screenshots import ScreenshotManager
 
@@ -21,8 +31,10 @@ class Scraper:
     Main scraper class for fetching web content.
     
     Features:
-    - SeleniumBase browser automation
-    - Anti-bot challenge handling
+    - SeleniumBase browser automation from a pool of warm browsers
+    - Plain HTTP fetching for server-rendered platforms (fetch_mode
+      "http"), or HTTP first with per-host browser fallback ("auto")
+    - Anti-bot challenge handling, polled without blocking the event loop
     - Retry with exponential backoff
     - Screenshot capture on error
     - Discovery of related URLs
@@ -35,18 +47,49 @@ class Scraper:
         timeout: int = 30,
         max_retries: int = 3,
         screenshot_dir: Optional[str] = None,
+        pool: Optional[BrowserPool] = None,
+        fetch_mode: Optional[str] = None,
+        browser_recheck_seconds: float = 3600.0,
     ):
         self.config = config
         self.timeout = timeout
         self.max_retries = max_retries
 
-        # Initialize components
-        self.browser = BrowserManager(
+        settings = fetch_settings(config)
+        self.fetch_mode = fetch_mode or settings["fetch_mode"]
+        if self.fetch_mode not in FETCH_MODES:
+            raise ValueError(f"Invalid fetch_mode '{self.fetch_mode}'")
+        self.http = HttpFetcher(
+            config,
+            timeout=timeout,
+            headers=settings.get("http_headers"),
+            required_selectors=settings.get("required_selectors"),
+        )
+
+        # auto mode: hosts that needed a browser, and when they were marked
+        self.browser_recheck_seconds = browser_recheck_seconds
+        self._browser_hosts: Dict[str, float] = {}
+        self.fetch_counts = {"http": 0, "browser": 0, "fallback": 0, "not_modified": 0}
+        # Browser sub-resources blocked and loaded, over all pages
+        self.resource_totals = PageResources()
+
+        # Anti-bot challenges: polling settings, counts, and a hook the
+        # caller can use to free capacity while a challenge is waited out
+        self.challenge_settings = ChallengeSettings.from_config(config)
+        self.challenge_counts: Dict[str, float] = {
+            "seen": 0, "resolved": 0, "timed_out": 0, "clicked": 0, "wait_seconds": 0.0,
+        }
+        self.challenge_wait: Callable[[], AsyncContextManager] = contextlib.nullcontext
+
+        # Initialize components (a shared pool is owned by the caller)
+        self._owns_pool = pool is None
+        self.pool = pool or BrowserPool.from_config(
+            config,
+            size=1,
             headless=headless,
             uc_mode=True,
             timeout=timeout,
         )
-        self.anti_bot = AntiBotHandler(self.browser)
         self.screenshot_manager = ScreenshotManager(
             screenshot_dir or "/data/raw/screenshots"
         )
@@ -57,102 +100,196 @@ class Scraper:
             base_delay=1.0,
             max_delay=30.0,
         )
+        # Only transient network errors are worth retrying over HTTP
+        self.http_retry_config = RetryConfig(
+            max_retries=max_retries,
+            base_delay=1.0,
+            max_delay=30.0,
+            retryable_exceptions=(httpx.TransportError,),
+        )
 
-    async def fetch(self, url: str) -> ScrapedContent:
+    async def fetch(
+        self, url: str, fingerprint: Optional[PageFingerprint] = None
+    ) -> ScrapedContent:
         """
         Fetch URL and return scraped content.
         
         Args:
             url: URL to fetch
+            fingerprint: Page fingerprint from the last fetch; HTTP
+                fetches send it as conditional headers
         
         Returns:
-            ScrapedContent with HTML and metadata
+            ScrapedContent with HTML and metadata (content.not_modified
+            on a 304 response)
         """
+        if self.fetch_mode == "browser" or self._needs_browser(url):
+            return await self._fetch_browser(url)
+
+        content, reason = await retry_with_backoff(
+            self.http.fetch,
+            url,
+            fingerprint,
+            config=self.http_retry_config,
+            on_retry=self._on_retry,
+        )
+        if reason is None:
+            self.fetch_counts["http"] += 1
+            if content.not_modified:
+                self.fetch_counts["not_modified"] += 1
+            return content
+
+        if self.fetch_mode == "http":
+            raise RuntimeError(f"HTTP fetch of {url} unusable: {reason}")
+
+        # auto: this host needs a real browser
+        host = RateLimiter.host_of(url)
+        logger.info(f"Switching {host} to browser fetching: {reason}")
+        self._browser_hosts[host] = time.monotonic()
+        self.fetch_counts["fallback"] += 1
+        return await self._fetch_browser(url)
+
+    def _needs_browser(self, url: str) -> bool:
+        """Check if auto mode has switched the URL's host to the browser."""
+        if self.fetch_mode != "auto":
+            return False
+        host = RateLimiter.host_of(url)
+        marked = self._browser_hosts.get(host)
+        if marked is None:
+            return False
+        if time.monotonic() - marked >= self.browser_recheck_seconds:
+            # Give plain HTTP another chance
+            del self._browser_hosts[host]
+            return False
+        return True
+
+    def fetch_stats(self) -> Dict[str, Any]:
+        """Fetch counts by method and hosts switched to the browser."""
+        return {
+            "mode": self.fetch_mode,
+            **self.fetch_counts,
+            "browser_hosts": sorted(self._browser_hosts),
+            "resources": self.resource_totals.to_dict(),
+            "challenges": dict(self.challenge_counts),
+        }
+
+    async def _fetch_browser(self, url: str) -> ScrapedContent:
+        """Fetch URL with a pooled browser."""
         async def _do_fetch():
-            return await asyncio.get_event_loop().run_in_executor(
-                None, self._fetch_sync, url
-            )
+            # Each attempt checks out a browser; a crashed one is replaced
+            async with self.pool.browser() as browser:
+                return await self._fetch_page(url, browser)
 
-        return await retry_with_backoff(
+        content = await retry_with_backoff(
             _do_fetch,
             config=self.retry_config,
             on_retry=self._on_retry,
         )
+        self.fetch_counts["browser"] += 1
+        if "resources" in content.metadata:
+            self.resource_totals.add(PageResources(**content.metadata["resources"]))
+        return content
 
-    def _fetch_sync(self, url: str) -> ScrapedContent:
-        """Synchronous fetch implementation."""
-        driver = self.browser.get_driver()
-        discovered_urls = []
-
+    async def _fetch_page(self, url: str, browser: PooledBrowser) -> ScrapedContent:
+        """Load a page, wait out any challenge, and collect its content."""
+        manager = browser.manager
         try:
-            # Navigate to URL
-            driver.get(url)
+            html = await browser.run(self._load_page, url, manager)
 
-            # Wait for page load
-            driver.wait_for_element_present("body", timeout=self.timeout)
+            anti_bot = AntiBotHandler(manager, self.challenge_settings, run=browser.run)
+            if anti_bot.is_blocked(html):
+                logger.warning(f"Anti-bot detected: {anti_bot.get_challenge_info(html)}")
 
-            # Check for anti-bot
-            html = driver.page_source
-            if self.anti_bot.is_blocked(html):
-                challenge_info = self.anti_bot.get_challenge_info(html)
-                logger.warning(f"Anti-bot detected: {challenge_info}")
+                # Polling leaves the loop free; let the caller use our slot meanwhile
+                async with self.challenge_wait():
+                    outcome = await anti_bot.handle_challenge()
+                self._record_challenge(outcome)
+                if not outcome.resolved:
+                    raise ChallengeError(
+                        f"Challenge on {url} not cleared after {outcome.waited_seconds:.0f}s"
+                    )
+                logger.info(f"Challenge cleared after {outcome.waited_seconds:.1f}s")
+                html = outcome.html
 
-                # Attempt to handle
-                asyncio.get_event_loop().run_until_complete(
-                    self.anti_bot.handle_challenge()
-                )
+            return await browser.run(self._collect_page, url, html, manager)
 
-                # Re-fetch after handling
-                html = driver.page_source
+        except Exception as e:
+            await browser.run(self._save_error_screenshot, manager, e)
+            raise
 
-            # Extract discovered URLs if configured
-            discovery_rules = self.config.discovery.get("links", {})
-            for rule_name, rule_config in discovery_rules.items():
-                selector = rule_config.get("selector")
-                attr = rule_config.get("attr", "href")
-
-                if selector:
-                    try:
-                        elements = driver.find_elements("css selector", selector)
-                        for elem in elements:
-                            try:
-                                link = elem.get_attribute(attr)
-                                if link and link.startswith("http"):
-                                    discovered_urls.append(link)
-                            except Exception:
-                                pass
-                    except Exception:
-                        pass
-
-            # Build result
-            content = ScrapedContent(
-                html=html,
-                url=url,
-                discovered_urls=discovered_urls,
-                metadata={
-                    "title": driver.title,
-                    "fetched_at": datetime.utcnow().isoformat(),
-                    "platform": self.config.platform,
-                },
-            )
+    def _load_page(self, url: str, browser: BrowserManager) -> str:
+        """Navigate to URL and return the page HTML, on the browser's thread."""
+        driver = browser.get_driver()
 
-            return content
+        # Drop log entries left from the previous page
+        browser.page_resources()
 
-        except Exception as e:
-            # Capture screenshot on error
-            try:
-                screenshot = self.browser.take_screenshot()
-                if screenshot:
-                    self.screenshot_manager.save_screenshot(
-                        screenshot,
-                        self.config.platform,
-                        "error",
-                        str(e)[:50],
-                    )
-            except Exception:
-                pass
+        driver.get(url)
+        driver.wait_for_element_present("body", timeout=self.timeout)
+        return driver.page_source
 
-            raise
+    def _collect_page(self, url: str, html: str, browser: BrowserManager) -> ScrapedContent:
+        """Extract discovery links and build the content, on the browser's thread."""
+        driver = browser.get_driver()
+        discovered_urls = []
+
+        # Extract discovered URLs if configured
+        discovery_rules = self.config.discovery.get("links", {})
+        for rule_name, rule_config in discovery_rules.items():
+            selector = rule_config.get("selector")
+            attr = rule_config.get("attr", "href")
+
+            if selector:
+                try:
+                    elements = driver.find_elements("css selector", selector)
+                    for elem in elements:
+                        try:
+                            link = elem.get_attribute(attr)
+                            if link and link.startswith("http"):
+                                discovered_urls.append(link)
+                        except Exception:
+                            pass
+                except Exception:
+                    pass
+
+        # Build result
+        content = ScrapedContent(
+            html=html,
+            url=url,
+            discovered_urls=discovered_urls,
+            metadata={
+                "title": driver.title,
+                "fetched_at": datetime.utcnow().isoformat(),
+                "platform": self.config.platform,
+                "fetched_via": "browser",
+            },
+        )
+        resources = browser.page_resources()
+        if resources is not None:
+            content.metadata["resources"] = resources.to_dict()
+
+        return content
+
+    def _save_error_screenshot(self, browser: BrowserManager, error: Exception) -> None:
+        """Capture a screenshot of the page that failed, on the browser's thread."""
+        try:
+            screenshot = browser.take_screenshot()
+            if screenshot:
+                self.screenshot_manager.save_screenshot(
+                    screenshot,
+                    self.config.platform,
+                    "error",
+                    str(error)[:50],
+                )
+        except Exception:
+            pass
+
+    def _record_challenge(self, outcome: ChallengeOutcome) -> None:
+        """Count a challenge and the time spent waiting on it."""
+        self.challenge_counts["seen"] += 1
+        self.challenge_counts["resolved" if outcome.resolved else "timed_out"] += 1
+        self.challenge_counts["clicked"] += int(outcome.clicked)
+        self.challenge_counts["wait_seconds"] += round(outcome.waited_seconds, 3)
 
     async def fetch_with_discovery(
         self, url: str
@@ -201,7 +338,8 @@ class Scraper:
 
     async def close(self) -> None:
         """Close browser and cleanup."""
-        self.browser.close()
+        if self._owns_pool:
+            await self.pool.close()
 
     def _on_retry(self, attempt: int, exception: Exception) -> None:
         """Called on each retry attempt."""
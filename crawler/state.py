@@ -151,14 +151,17 @@ class StateSerializer:
             return True
         return False
 
-    def cleanup_old_checkpoints(self, keep_count: int = 5) -> int:
+    def cleanup_old_checkpoints(self, keep_count: int = 5, prefix: str = "checkpoint_") -> int:
         """
         Remove old checkpoints, keeping only the most recent ones.
+
+        Only checkpoints whose file name starts with prefix are considered,
+        e.g. "checkpoint_<worker_id>_" for one worker's checkpoints.
         
         Returns count of deleted checkpoints.
         """
         checkpoints = []
-        for path in self.state_dir.glob("checkpoint_*.json"):
+        for path in self.state_dir.glob(f"{prefix}*.json"):
             try:
                 data = json.loads(path.read_text(encoding="utf-8"))
                 checkpoints.append((path, data.get("timestamp", "")))
@@ -0,0 +1,21 @@
+"""Traversal strategies for choosing which tasks to claim."""
+
+from crawler.strategies.base import (
+    BaseStrategy,
+    ChronosStrategy,
+    PriorityStrategy,
+    RippleStrategy,
+    TargetedStrategy,
+)
+from crawler.strategies.mixer import STRATEGIES, StrategyMixer, StrategyStats
+
+__all__ = [
+    "BaseStrategy",
+    "ChronosStrategy",
+    "PriorityStrategy",
+    "RippleStrategy",
+    "TargetedStrategy",
+    "STRATEGIES",
+    "StrategyMixer",
+    "StrategyStats",
+]
@@ -0,0 +1,104 @@
+"""Base traversal strategy."""
+
+from abc import ABC, abstractmethod
+from typing import TYPE_CHECKING, Any, Dict, List, Optional, Tuple
+
+from crawler.models.task import Task
+
+if TYPE_CHECKING:
+    from crawler.lpm import LocalPersistenceManager
+
+
+class BaseStrategy(ABC):
+    """
+    Selects which pending tasks a worker claims next.
+
+    A strategy is one indexed SQL selection over the tasks table: a WHERE
+    condition and an ORDER BY clause, both evaluated inside the atomic
+    claim statement so concurrent workers never claim the same task.
+    """
+
+    @property
+    @abstractmethod
+    def name(self) -> str:
+        """Unique identifier, used as the key in mixer weights."""
+
+    # ORDER BY clause; must match an index to keep claims cheap
+    order_by: str = "priority DESC, created_at ASC"
+
+    def __init__(self, config: Optional[Dict[str, Any]] = None):
+        self.config = config or {}
+
+    def where(self) -> Tuple[Optional[str], tuple]:
+        """Get the candidate condition and its parameters (None for all pending)."""
+        return None, ()
+
+    async def suggest_tasks(
+        self,
+        lpm: "LocalPersistenceManager",
+        limit: int,
+        platform: Optional[str],
+        worker_id: str,
+        lease_seconds: int,
+    ) -> List[Task]:
+        """Claim up to limit tasks selected by this strategy."""
+        if limit <= 0:
+            return []
+
+        where, params = self.where()
+        return await lpm.claim_tasks(
+            platform,
+            limit,
+            lease_seconds,
+            worker_id,
+            where=where,
+            where_params=params,
+            order_by=self.order_by,
+        )
+
+    def feedback(self, task: Task, success: bool, duration: float) -> None:
+        """Receive the outcome of a task this strategy selected."""
+        pass
+
+
+class PriorityStrategy(BaseStrategy):
+    """Highest effective priority first (the default queue order)."""
+
+    name = "priority"
+
+
+class ChronosStrategy(BaseStrategy):
+    """
+    Least recently crawled pages first, so nothing waits indefinitely.
+
+    Never-fetched tasks (NULL last_checked_at sorts first) go oldest
+    first; pages requeued for a re-crawl (see refresh_tasks) follow in
+    order of their last check.
+    """
+
+    name = "chronos"
+    order_by = "last_checked_at ASC, created_at ASC, id ASC"
+
+
+class RippleStrategy(BaseStrategy):
+    """Tasks discovered from other pages (owner, neighbor, ...) by priority."""
+
+    name = "ripple"
+
+    def where(self) -> Tuple[Optional[str], tuple]:
+        return "relationship_type IS NOT NULL", ()
+
+
+class TargetedStrategy(BaseStrategy):
+    """
+    Business-driven work: tasks enqueued with a high base priority.
+
+    Config:
+        min_base_priority: Lowest base priority that counts as targeted (default 50)
+    """
+
+    name = "targeted"
+    order_by = "base_priority DESC, created_at ASC, id ASC"
+
+    def where(self) -> Tuple[Optional[str], tuple]:
+        return "base_priority >= ?", (self.config.get("min_base_priority", 50),)
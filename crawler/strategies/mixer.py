@@ -0,0 +1,238 @@
+"""Weighted strategy mixer with starvation protection."""
+
+import logging
+import time
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING, Any, Dict, List, Optional
+
+from crawler.models.task import Task
+from crawler.strategies.base import (
+    BaseStrategy,
+    ChronosStrategy,
+    PriorityStrategy,
+    RippleStrategy,
+    TargetedStrategy,
+)
+
+if TYPE_CHECKING:
+    from crawler.lpm import LocalPersistenceManager
+
+logger = logging.getLogger(__name__)
+
+
+# Built-in strategies by name
+STRATEGIES = {
+    cls.name: cls
+    for cls in (PriorityStrategy, ChronosStrategy, RippleStrategy, TargetedStrategy)
+}
+
+
+@dataclass
+class StrategyStats:
+    """Per-strategy counters."""
+    claimed: int = 0
+    completed: int = 0
+    failed: int = 0
+    busy_seconds: float = 0.0
+    # Consecutive batches in which the strategy got no quota
+    starved_batches: int = 0
+    started_at: float = field(default_factory=time.monotonic)
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Convert to dictionary for reporting."""
+        elapsed = max(time.monotonic() - self.started_at, 1e-9)
+        return {
+            "claimed": self.claimed,
+            "completed": self.completed,
+            "failed": self.failed,
+            "tasks_per_minute": round(self.completed * 60 / elapsed, 2),
+            "avg_seconds": round(self.busy_seconds / max(self.completed + self.failed, 1), 3),
+        }
+
+
+class StrategyMixer:
+    """
+    Fills claim batches from several strategies by weight.
+
+    Each batch is split into per-strategy quotas by weight (largest
+    remainder rounding). Strategies in min_guaranteed always get at least
+    that many slots per batch, and any strategy with a positive weight
+    that was rounded down to zero for starvation_batches batches in a row
+    gets one slot. Slots a strategy cannot fill go to the others in
+    weight order, so the mixer never claims fewer tasks than the queue
+    can provide.
+
+    Config (schedule.json "strategies"):
+
+        {
+            "weights": {"priority": 0.6, "chronos": 0.3, "ripple": 0.1},
+            "min_guaranteed": {"chronos": 1},
+            "config": {"targeted": {"min_base_priority": 50}}
+        }
+    """
+
+    def __init__(
+        self,
+        strategies: List[BaseStrategy],
+        weights: Dict[str, float],
+        min_guaranteed: Optional[Dict[str, int]] = None,
+        starvation_batches: int = 10,
+    ):
+        self.strategies = {s.name: s for s in strategies}
+        unknown = set(weights) - set(self.strategies)
+        if unknown:
+            raise ValueError(f"Weights for unknown strategies: {', '.join(sorted(unknown))}")
+
+        total = sum(w for w in weights.values() if w > 0)
+        if total <= 0:
+            raise ValueError("At least one strategy needs a positive weight")
+        self.weights = {name: max(w, 0) / total for name, w in weights.items()}
+        self.min_guaranteed = min_guaranteed or {}
+        self.starvation_batches = starvation_batches
+
+        self.stats = {name: StrategyStats() for name in self.strategies}
+        # Strategy that claimed each in-flight task
+        self._sources: Dict[str, str] = {}
+
+    @classmethod
+    def from_config(cls, config: Optional[Dict[str, Any]]) -> Optional["StrategyMixer"]:
+        """Build a mixer from a strategies config, or None if not configured."""
+        if not config or not config.get("weights"):
+            return None
+
+        weights = config["weights"]
+        strategy_config = config.get("config", {})
+        strategies = []
+        for name in weights:
+            if name not in STRATEGIES:
+                raise ValueError(f"Unknown strategy: {name}")
+            strategies.append(STRATEGIES[name](strategy_config.get(name)))
+
+        return cls(
+            strategies,
+            weights,
+            min_guaranteed=config.get("min_guaranteed"),
+            starvation_batches=config.get("starvation_batches", 10),
+        )
+
+    def allocate(self, total: int) -> Dict[str, int]:
+        """Split a batch of total slots into per-strategy quotas."""
+        quotas = {name: 0 for name in self.weights}
+        remaining = total
+
+        # Guaranteed minimums first
+        for name, minimum in self.min_guaranteed.items():
+            if name in quotas and remaining > 0:
+                quotas[name] = min(minimum, remaining)
+                remaining -= quotas[name]
+
+        # Starvation protection: one slot for strategies rounded away for too long
+        for name, weight in self.weights.items():
+            if (
+                remaining > 0
+                and weight > 0
+                and quotas[name] == 0
+                and self.stats[name].starved_batches >= self.starvation_batches
+            ):
+                quotas[name] = 1
+                remaining -= 1
+
+        # Largest remainder over what is left
+        shares = {name: weight * remaining for name, weight in self.weights.items()}
+        for name, share in shares.items():
+            quotas[name] += int(share)
+        leftover = total - sum(quotas.values())
+        by_remainder = sorted(
+            shares, key=lambda n: (shares[n] - int(shares[n]), self.weights[n]), reverse=True
+        )
+        for name in by_remainder[:leftover]:
+            quotas[name] += 1
+
+        for name, weight in self.weights.items():
+            if weight > 0 and quotas[name] == 0:
+                self.stats[name].starved_batches += 1
+            else:
+                self.stats[name].starved_batches = 0
+
+        return quotas
+
+    async def claim(
+        self,
+        lpm: "LocalPersistenceManager",
+        limit: int,
+        platform: Optional[str],
+        worker_id: str,
+        lease_seconds: int,
+    ) -> List[Task]:
+        """Claim up to limit tasks, mixing strategies by weight."""
+        quotas = self.allocate(limit)
+        claimed: List[Task] = []
+        shortfall = 0
+
+        order = sorted(self.weights, key=lambda n: self.weights[n], reverse=True)
+        exhausted = set()
+        for name in order:
+            tasks = await self._claim_from(lpm, name, quotas[name], platform, worker_id, lease_seconds)
+            claimed.extend(tasks)
+            if len(tasks) < quotas[name]:
+                shortfall += quotas[name] - len(tasks)
+                exhausted.add(name)
+
+        # Give unfilled slots to strategies that still have work
+        for name in order:
+            if shortfall <= 0:
+                break
+            if name in exhausted:
+                continue
+            tasks = await self._claim_from(lpm, name, shortfall, platform, worker_id, lease_seconds)
+            claimed.extend(tasks)
+            shortfall -= len(tasks)
+
+        return claimed
+
+    async def _claim_from(
+        self,
+        lpm: "LocalPersistenceManager",
+        name: str,
+        limit: int,
+        platform: Optional[str],
+        worker_id: str,
+        lease_seconds: int,
+    ) -> List[Task]:
+        """Claim through one strategy and record where the tasks came from."""
+        if limit <= 0:
+            return []
+
+        tasks = await self.strategies[name].suggest_tasks(
+            lpm, limit, platform, worker_id, lease_seconds
+        )
+        self.stats[name].claimed += len(tasks)
+        for task in tasks:
+            self._sources[task.id] = name
+        return tasks
+
+    def record_result(self, task: Task, success: bool, duration: float) -> None:
+        """Record a processed task against the strategy that claimed it."""
+        name = self._sources.pop(task.id, None)
+        if name is None:
+            return
+
+        stats = self.stats[name]
+        if success:
+            stats.completed += 1
+        else:
+            stats.failed += 1
+        stats.busy_seconds += duration
+        self.strategies[name].feedback(task, success, duration)
+
+    def forget(self, task_ids: List[str]) -> None:
+        """Drop tracking for tasks released without being processed."""
+        for task_id in task_ids:
+            self._sources.pop(task_id, None)
+
+    def report(self) -> Dict[str, Dict[str, Any]]:
+        """Per-strategy throughput."""
+        return {
+            name: {"weight": round(self.weights.get(name, 0), 3), **stats.to_dict()}
+            for name, stats in self.stats.items()
+        }
@@ -0,0 +1,332 @@
+"""Supervisor running several worker processes against one database."""
+
+import asyncio
+import logging
+import multiprocessing
+import os
+import signal
+import socket
+import time
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+
+from crawler.state import CheckpointState, StateSerializer
+
+logger = logging.getLogger(__name__)
+
+# Name of the aggregated status file in the state directory
+STATUS_NAME = "supervisor"
+
+
+@dataclass
+class ChildProcess:
+    """One supervised worker slot and its restart history."""
+    index: int
+    worker_id: str
+    process: Optional[multiprocessing.process.BaseProcess] = None
+    started_at: Optional[str] = None
+    started_monotonic: float = 0.0
+    restarts: int = 0
+    failures: int = 0
+    next_start_at: float = 0.0
+    last_exit_code: Optional[int] = None
+    finished: bool = False
+    # Counts from earlier incarnations of this slot
+    carried_processed: int = 0
+    carried_errors: int = 0
+
+    @property
+    def alive(self) -> bool:
+        return self.process is not None and self.process.is_alive()
+
+
+def _child_main(
+    worker_id: str,
+    platform: str,
+    db_path: str,
+    data_dir: str,
+    config_dir: str,
+    db_options: Dict[str, Any],
+    worker_options: Dict[str, Any],
+    shutdown: Any,
+) -> None:
+    """Entry point of a worker process."""
+    # Ctrl+C reaches the whole process group; the supervisor decides
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+    signal.signal(signal.SIGTERM, lambda signum, frame: shutdown.set())
+
+    asyncio.run(_run_child(
+        worker_id, platform, db_path, data_dir, config_dir,
+        db_options, worker_options, shutdown,
+    ))
+
+
+async def _run_child(
+    worker_id: str,
+    platform: str,
+    db_path: str,
+    data_dir: str,
+    config_dir: str,
+    db_options: Dict[str, Any],
+    worker_options: Dict[str, Any],
+    shutdown: Any,
+) -> None:
+    """Run one worker until it finishes or the shared shutdown is set."""
+    from crawler.config_loader import ConfigLoader
+    from crawler.lpm import LocalPersistenceManager
+    from crawler.worker import Worker
+
+    config = ConfigLoader(config_dir).load(platform)
+    if not config:
+        raise RuntimeError(f"Platform '{platform}' not found in {config_dir}")
+
+    lpm = LocalPersistenceManager(db_path, data_dir, db_options=db_options)
+    await lpm.initialize()
+
+    try:
+        worker = Worker(lpm, config, worker_id=worker_id, **worker_options)
+        run = asyncio.create_task(worker.run())
+        while not run.done():
+            if shutdown.is_set():
+                # The worker finishes tasks in the pipeline while cancelling
+                worker.stop()
+                run.cancel()
+                break
+            await asyncio.wait({run}, timeout=0.5)
+
+        try:
+            await run
+        except asyncio.CancelledError:
+            pass
+    finally:
+        await lpm.close()
+
+
+class WorkerSupervisor:
+    """
+    Runs processes worker processes sharing one database.
+
+    Workers claim tasks atomically, so they need no coordination beyond
+    the database. A child that exits with an error is restarted after an
+    exponential backoff, reset once a child has stayed up for
+    stable_after seconds; a child that exits cleanly (queue drained) is
+    not restarted. stop() sets a shutdown event shared by all children,
+    which finish their in-flight tasks and exit; stragglers are
+    terminated after shutdown_timeout.
+
+    Every status_interval seconds the supervisor writes an aggregated
+    view of its children (latest checkpoint counts plus counts carried
+    over from restarted processes) to state/supervisor.json.
+    """
+
+    def __init__(
+        self,
+        platform: str,
+        db_path: str,
+        data_dir: str,
+        config_dir: str,
+        processes: int,
+        db_options: Optional[Dict[str, Any]] = None,
+        worker_options: Optional[Dict[str, Any]] = None,
+        restart_base_delay: float = 1.0,
+        restart_max_delay: float = 60.0,
+        stable_after: float = 60.0,
+        shutdown_timeout: float = 120.0,
+        status_interval: float = 5.0,
+        supervisor_id: Optional[str] = None,
+    ):
+        self.platform = platform
+        self.db_path = db_path
+        self.data_dir = data_dir
+        self.config_dir = config_dir
+        self.processes = max(1, processes)
+        self.db_options = db_options or {}
+        # Children throttle the same hosts, so each gets an equal share of the rate limits
+        self.worker_options = {"rate_share": 1.0 / self.processes, **(worker_options or {})}
+        self.restart_base_delay = restart_base_delay
+        self.restart_max_delay = restart_max_delay
+        self.stable_after = stable_after
+        self.shutdown_timeout = shutdown_timeout
+        self.status_interval = status_interval
+        self.supervisor_id = supervisor_id or f"{socket.gethostname()}-{os.getpid()}"
+
+        # Spawn: children must not inherit the parent's threads or connections
+        self._context = multiprocessing.get_context("spawn")
+        self._shutdown = self._context.Event()
+        self._stopping = False
+        self.started_at = datetime.utcnow().isoformat()
+        self.state_serializer = StateSerializer(f"{data_dir}/state")
+
+        # Stable IDs per slot, so a restarted child releases its predecessor's claims
+        self.children = [
+            ChildProcess(index=i, worker_id=f"{self.supervisor_id}-w{i}")
+            for i in range(self.processes)
+        ]
+
+    def run(self) -> None:
+        """Start the children and supervise them until stopped or all are done."""
+        previous = {
+            signum: signal.signal(signum, lambda *_: self.stop())
+            for signum in (signal.SIGINT, signal.SIGTERM)
+        }
+        logger.info(f"Supervisor {self.supervisor_id} starting {self.processes} workers")
+
+        last_status = 0.0
+        try:
+            while not self._stopping:
+                now = time.monotonic()
+                for child in self.children:
+                    self._check_child(child, now)
+
+                if all(child.finished for child in self.children):
+                    logger.info("All workers finished")
+                    break
+
+                if now - last_status >= self.status_interval:
+                    last_status = now
+                    self.write_status()
+
+                time.sleep(0.2)
+        finally:
+            self._shutdown_children()
+            self.write_status()
+            for signum, handler in previous.items():
+                signal.signal(signum, handler)
+
+    def stop(self) -> None:
+        """Ask all children to finish their current tasks and exit."""
+        self._stopping = True
+        self._shutdown.set()
+
+    def _check_child(self, child: ChildProcess, now: float) -> None:
+        """Reap an exited child and (re)start it when due."""
+        if child.finished or child.alive:
+            return
+
+        if child.process is not None:
+            self._reap(child, now)
+            if child.finished:
+                return
+
+        if now >= child.next_start_at:
+            self._start(child)
+
+    def _start(self, child: ChildProcess) -> None:
+        """Launch the process for a child slot."""
+        child.process = self._context.Process(
+            target=_child_main,
+            args=(
+                child.worker_id,
+                self.platform,
+                self.db_path,
+                self.data_dir,
+                self.config_dir,
+                self.db_options,
+                self.worker_options,
+                self._shutdown,
+            ),
+            name=f"crawler-{child.worker_id}",
+        )
+        child.process.start()
+        child.started_at = datetime.utcnow().isoformat()
+        child.started_monotonic = time.monotonic()
+        logger.info(f"Started worker {child.worker_id} (pid {child.process.pid})")
+
+    def _reap(self, child: ChildProcess, now: float) -> None:
+        """Record an exited child and schedule its restart if it failed."""
+        exit_code = child.process.exitcode
+        child.last_exit_code = exit_code
+
+        # Keep the finished incarnation's counts
+        checkpoint = self._latest_checkpoint(child)
+        if checkpoint is not None:
+            child.carried_processed += checkpoint.processed_count
+            child.carried_errors += checkpoint.error_count
+        child.process = None
+        child.started_at = None
+
+        if exit_code == 0 or self._stopping:
+            child.finished = True
+            logger.info(f"Worker {child.worker_id} exited")
+            return
+
+        if now - child.started_monotonic >= self.stable_after:
+            child.failures = 0
+        delay = min(self.restart_base_delay * (2 ** child.failures), self.restart_max_delay)
+        child.failures += 1
+        child.restarts += 1
+        child.next_start_at = now + delay
+        logger.error(
+            f"Worker {child.worker_id} exited with code {exit_code}, "
+            f"restarting in {delay:.0f}s (restart {child.restarts})"
+        )
+
+    def _shutdown_children(self) -> None:
+        """Signal shutdown and wait for children, terminating stragglers."""
+        self._stopping = True
+        self._shutdown.set()
+        deadline = time.monotonic() + self.shutdown_timeout
+        for child in self.children:
+            if child.process is None:
+                continue
+            child.process.join(max(0.0, deadline - time.monotonic()))
+            if child.process.is_alive():
+                logger.warning(f"Terminating worker {child.worker_id}")
+                child.process.terminate()
+                child.process.join(10)
+                if child.process.is_alive():
+                    child.process.kill()
+                    child.process.join()
+            self._reap(child, time.monotonic())
+
+    def _latest_checkpoint(self, child: ChildProcess) -> Optional[CheckpointState]:
+        """Latest checkpoint written by the child's current incarnation."""
+        checkpoint = self.state_serializer.get_latest_checkpoint(
+            prefix=f"checkpoint_{child.worker_id}_"
+        )
+        if checkpoint is None or child.started_at is None:
+            return None
+        if checkpoint.timestamp < child.started_at:
+            return None
+        return checkpoint
+
+    def status(self) -> Dict[str, Any]:
+        """Aggregated status of all children."""
+        children: List[Dict[str, Any]] = []
+        for child in self.children:
+            checkpoint = self._latest_checkpoint(child)
+            children.append({
+                "index": child.index,
+                "worker_id": child.worker_id,
+                "pid": child.process.pid if child.alive else None,
+                "alive": child.alive,
+                "started_at": child.started_at,
+                "restarts": child.restarts,
+                "last_exit_code": child.last_exit_code,
+                "finished": child.finished,
+                "processed": child.carried_processed + (checkpoint.processed_count if checkpoint else 0),
+                "errors": child.carried_errors + (checkpoint.error_count if checkpoint else 0),
+                "last_checkpoint": checkpoint.checkpoint_id if checkpoint else None,
+            })
+
+        return {
+            "supervisor_id": self.supervisor_id,
+            "pid": os.getpid(),
+            "platform": self.platform,
+            "started_at": self.started_at,
+            "updated_at": datetime.utcnow().isoformat(),
+            "processes": self.processes,
+            "alive": sum(1 for c in children if c["alive"]),
+            "processed": sum(c["processed"] for c in children),
+            "errors": sum(c["errors"] for c in children),
+            "restarts": sum(c["restarts"] for c in children),
+            "children": children,
+        }
+
+    def write_status(self) -> None:
+        """Write the aggregated status to the state directory."""
+        try:
+            self.state_serializer.save_json(STATUS_NAME, self.status())
+        except OSError as e:
+            logger.error(f"Could not write supervisor status: {e}")
@@ -0,0 +1,99 @@
+"""Tests for anti-bot challenge handling."""
+
+import asyncio
+
+import pytest
+
+pytest.importorskip("seleniumbase")
+
+from crawler.config_loader import PlatformConfig
+from crawler.scraper.anti_bot import AntiBotHandler, ChallengeSettings, ChallengeState
+
+CHALLENGE = "<title>Just a moment</title><p>Checking your browser</p>"
+
+
+class ChallengeDriver:
+    """Shows a challenge page for a number of page_source reads."""
+
+    def __init__(self, challenge_reads: int, target_after: int = 10**6):
+        self.reads = 0
+        self.challenge_reads = challenge_reads
+        self.target_after = target_after
+        self.clicks = 0
+
+    @property
+    def page_source(self) -> str:
+        self.reads += 1
+        return CHALLENGE if self.reads <= self.challenge_reads else "<div id='pid'>1</div>"
+
+    def find_elements(self, by, selector):
+        if selector == "#pid":
+            return [object()] if self.reads >= self.target_after else []
+        driver = self
+
+        class Button:
+            def click(self):
+                driver.clicks += 1
+
+        return [Button()]
+
+
+class FakeBrowser:
+    def __init__(self, driver):
+        self.driver = driver
+
+    def get_driver(self):
+        return self.driver
+
+
+async def handle(driver, **settings):
+    handler = AntiBotHandler(FakeBrowser(driver), ChallengeSettings(**settings))
+    return await handler.handle_challenge()
+
+
+async def test_challenge_exits_early_without_blocking_loop():
+    """Test polling stops once the marker is gone and the loop keeps running."""
+    ticks = 0
+
+    async def ticker():
+        nonlocal ticks
+        while True:
+            ticks += 1
+            await asyncio.sleep(0.01)
+
+    running = asyncio.create_task(ticker())
+    outcome = await handle(ChallengeDriver(challenge_reads=3), poll_interval=0.05, timeout=5)
+    running.cancel()
+
+    assert outcome.state == ChallengeState.RESOLVED
+    assert outcome.polls == 4
+    assert outcome.waited_seconds < 1
+    assert "pid" in outcome.html
+    assert ticks >= 5
+
+
+async def test_challenge_target_selector_and_timeout():
+    """Test the target selector resolves early and a stuck page times out after a click."""
+    outcome = await handle(
+        ChallengeDriver(challenge_reads=100, target_after=2),
+        poll_interval=0.01, target_selector="#pid",
+    )
+    assert outcome.resolved
+    assert outcome.polls == 2
+
+    driver = ChallengeDriver(challenge_reads=10**6)
+    outcome = await handle(driver, poll_interval=0.02, click_after=0.05, timeout=0.2)
+    assert outcome.state == ChallengeState.TIMED_OUT
+    assert outcome.clicked and driver.clicks == 1
+    assert 0.2 <= outcome.waited_seconds < 1
+
+
+def test_challenge_settings_from_config():
+    """Test the target selector defaults to parcel_id and schedule overrides."""
+    config = PlatformConfig(
+        platform="test",
+        selectors={"selectors": {"parcel_id": {"selector": "#pid", "type": "css"}}},
+        schedule={"anti_bot": {"timeout": 12}},
+    )
+    settings = ChallengeSettings.from_config(config)
+    assert (settings.timeout, settings.target_selector) == (12, "#pid")
@@ -0,0 +1,112 @@
+"""Tests for the seen-URL Bloom filter."""
+
+import pytest
+
+from crawler.bloom import BloomFilter
+from crawler.lpm import LocalPersistenceManager
+from crawler.models.parsed_result import DiscoveredLink
+from crawler.models.task import Task
+from crawler.urls import url_hash
+
+
+def test_bloom_filter_roundtrip(tmp_path):
+    """Test membership, false-positive rate and persistence."""
+    bloom = BloomFilter(capacity=5000, error_rate=0.01)
+    bloom.update(f"https://example.com/{i}" for i in range(5000))
+
+    assert all(f"https://example.com/{i}" in bloom for i in range(5000))
+    false_positives = sum(f"https://other.com/{i}" in bloom for i in range(5000))
+    assert false_positives < 5000 * 0.02
+    assert not bloom.saturated
+
+    path = tmp_path / "seen.bloom"
+    bloom.save(path)
+    loaded = BloomFilter.load(path)
+    assert len(loaded) == 5000
+    assert "https://example.com/42" in loaded
+    assert loaded.memory_bytes == bloom.memory_bytes
+
+    path.write_bytes(b"junk")
+    with pytest.raises(ValueError):
+        BloomFilter.load(path)
+
+
+@pytest.mark.asyncio
+async def test_url_filter_prefilters_known_urls(temp_db: str, tmp_path):
+    """Test that the LPM filter is rebuilt, updated and persisted."""
+    lpm = LocalPersistenceManager(temp_db, str(tmp_path))
+    await lpm.initialize()
+
+    try:
+        await lpm.add_task("https://example.com/a", "test")
+        bloom = await lpm.load_url_filter()
+        assert len(bloom) == 1
+
+        await lpm.add_task("https://example.com/b", "test")
+        await lpm.add_task("https://example.com/b", "test")
+        await lpm.add_tasks([Task(id="again", url="https://example.com/a", platform="test")])
+        known = await lpm.get_known_urls(
+            "test", ["https://example.com/a", "https://EXAMPLE.com/b", "https://example.com/c"]
+        )
+        assert known == {"https://example.com/a", "https://EXAMPLE.com/b"}
+
+        link = DiscoveredLink(url="https://example.com/c")
+        assert await lpm.add_discovered_links("source", [link, link]) == 1
+        assert await lpm.add_discovered_links("source", [link]) == 0
+
+        stats = await lpm.get_stats()
+        assert stats["url_filter"]["entries"] == 3
+        assert stats["url_filter"]["memory_bytes"] > 0
+    finally:
+        await lpm.close()
+
+    assert lpm.url_filter_path.exists()
+    assert len(BloomFilter.load(lpm.url_filter_path)) == 3
+
+
+def test_bloom_filter_merge_on_save(tmp_path):
+    """Test saving with merge keeps keys saved by another filter."""
+    path = tmp_path / "seen.bloom"
+    first = BloomFilter(capacity=1000, error_rate=0.01)
+    second = BloomFilter(capacity=1000, error_rate=0.01)
+    first.update(["a", "shared"])
+    second.update(["b", "shared"])
+
+    first.save(path)
+    second.save(path, merge=True)
+    merged = BloomFilter.load(path)
+    assert all(key in merged for key in ("a", "b", "shared"))
+    assert len(merged) == 3
+
+    with pytest.raises(ValueError):
+        BloomFilter(capacity=50).save(path, merge=True)
+
+
+@pytest.mark.asyncio
+async def test_url_filter_shared_between_processes(temp_db: str, tmp_path):
+    """Test two LPMs on one data directory never duplicate links or lose URLs."""
+    first = LocalPersistenceManager(temp_db, str(tmp_path))
+    second = LocalPersistenceManager(temp_db, str(tmp_path))
+    await first.initialize()
+    await second.initialize()
+
+    try:
+        await first.load_url_filter()
+        await second.load_url_filter()
+
+        link = DiscoveredLink(url="https://example.com/shared")
+        assert await first.add_discovered_links("a", [link]) == 1
+        assert await second.add_discovered_links("b", [link]) == 0
+        assert await first.add_discovered_links("a", [DiscoveredLink(url="https://example.com/a")]) == 1
+
+        rows = await first.db.fetchall("SELECT url FROM discovered_links")
+        assert sorted(row["url"] for row in rows) == [
+            "https://example.com/a", "https://example.com/shared",
+        ]
+    finally:
+        await first.close()
+        await second.close()
+
+    bloom = BloomFilter.load(first.url_filter_path)
+    assert url_hash("https://example.com/a") in bloom
+    assert url_hash("https://example.com/shared") in bloom
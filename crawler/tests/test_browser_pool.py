@@ -0,0 +1,69 @@
+"""Tests for the browser pool."""
+
+import asyncio
+
+import pytest
+
+pytest.importorskip("seleniumbase")
+
+from crawler.scraper.pool import BrowserPool
+
+
+class FakeBrowser:
+    """Stands in for BrowserManager without launching Chrome."""
+
+    def __init__(self):
+        self.closed = False
+        self.rss = 0
+
+    def get_driver(self):
+        return object()
+
+    def close(self):
+        self.closed = True
+
+    def rss_bytes(self):
+        return self.rss
+
+
+async def test_browser_pool_recycles():
+    """Test recycling after max pages, memory growth and fatal errors."""
+    created = []
+
+    def factory():
+        created.append(FakeBrowser())
+        return created[-1]
+
+    pool = BrowserPool(size=1, max_pages=3, max_rss_mb=100, rss_check_every=1, factory=factory)
+    await pool.start()
+    assert len(created) == 1
+
+    # Healthy pages go back to the pool until max_pages
+    for _ in range(3):
+        async with pool.browser():
+            pass
+    await asyncio.sleep(0)
+    assert created[0].closed
+    assert pool.recycled["pages"] == 1
+
+    # Memory above the threshold
+    browser = await pool.checkout()
+    browser.manager.rss = 200 * 1024 * 1024
+    await pool.checkin(browser)
+    assert pool.recycled["rss"] == 1
+
+    # A dead session is replaced, other errors are not
+    with pytest.raises(RuntimeError):
+        async with pool.browser():
+            raise RuntimeError("element not found")
+    with pytest.raises(RuntimeError):
+        async with pool.browser():
+            raise RuntimeError("invalid session id")
+    assert pool.recycled["error"] == 1
+
+    async with pool.browser() as browser:
+        assert not browser.manager.closed
+    assert len(created) == 4
+
+    await pool.close()
+    assert all(b.closed for b in created)
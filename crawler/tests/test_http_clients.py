@@ -0,0 +1,80 @@
+"""Tests for the shared HTTP client registry."""
+
+import asyncio
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import httpx
+import pytest
+
+from crawler.http_clients import HttpClientRegistry
+
+
+class KeepAliveHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def do_GET(self):
+        self.send_response(200)
+        self.send_header("Content-Length", "2")
+        self.end_headers()
+        self.wfile.write(b"ok")
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def server_url():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), KeepAliveHandler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{server.server_port}"
+    server.shutdown()
+    server.server_close()
+
+
+@pytest.mark.asyncio
+async def test_registry_reuses_connections(server_url):
+    """Test named clients are shared and keep connections alive."""
+    registry = HttpClientRegistry()
+    client = registry.get("fetch")
+    assert registry.get("fetch") is client
+
+    for _ in range(5):
+        response = await client.get(server_url)
+        assert response.text == "ok"
+
+    metrics = registry.metrics()["fetch"]
+    assert metrics["requests"] == 5
+    assert metrics["connections_opened"] == 1
+    assert metrics["reuse_ratio"] == 0.8
+    assert (metrics["open"], metrics["idle"]) == (1, 1)
+
+    await registry.close()
+    assert client.is_closed
+    assert registry.metrics() == {}
+
+
+@pytest.mark.asyncio
+async def test_registry_caps_requests_per_host():
+    """Test concurrent requests to one host wait for a free slot."""
+    running = {"a.example.com": 0, "b.example.com": 0}
+    peak = dict(running)
+
+    async def handler(request: httpx.Request) -> httpx.Response:
+        host = request.url.host
+        running[host] += 1
+        peak[host] = max(peak[host], running[host])
+        await asyncio.sleep(0.01)
+        running[host] -= 1
+        return httpx.Response(200, text="ok")
+
+    registry = HttpClientRegistry()
+    client = registry.get("fetch", transport=httpx.MockTransport(handler), max_per_host=2)
+    await asyncio.gather(*(
+        client.get(f"https://{host}/{i}") for i in range(6) for host in running
+    ))
+
+    assert peak == {"a.example.com": 2, "b.example.com": 2}
+    assert registry.metrics()["fetch"]["host_waits"] > 0
+    await registry.close()
@@ -0,0 +1,93 @@
+"""Tests for HTTP fetching with browser fallback."""
+
+import httpx
+import pytest
+
+pytest.importorskip("seleniumbase")
+
+from crawler.config_loader import PlatformConfig
+from crawler.models.scraped_content import ScrapedContent
+from crawler.models.task import PageFingerprint
+from crawler.scraper.http_fetcher import HttpFetchError
+from crawler.scraper.scraper import Scraper
+
+
+PAGES = {
+    "static.example.com": (200, '<title>Parcel</title><div id="pid">1</div><a class="n" href="/p/2">next</a>'),
+    "js.example.com": (200, '<title>Loading</title><div id="app"></div>'),
+    "blocked.example.com": (403, "Forbidden"),
+    "gone.example.com": (404, "Not found"),
+}
+
+
+def handler(request: httpx.Request) -> httpx.Response:
+    status, body = PAGES[request.url.host]
+    return httpx.Response(status, text=body)
+
+
+async def test_auto_mode_falls_back_per_host(tmp_path):
+    """Test static pages stay on HTTP and other hosts switch to the browser."""
+    config = PlatformConfig(
+        platform="test",
+        selectors={"selectors": {"parcel_id": {"selector": "#pid", "type": "css"}}},
+        discovery={"links": {"neighbor": {"selector": "a.n", "attr": "href"}}},
+        schedule={"fetch_mode": "auto"},
+    )
+    scraper = Scraper(config, screenshot_dir=str(tmp_path))
+    scraper.http._client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+
+    async def fetch_browser(url):
+        scraper.fetch_counts["browser"] += 1
+        return ScrapedContent(html="<div id='pid'>1</div>", url=url, metadata={"fetched_via": "browser"})
+
+    scraper._fetch_browser = fetch_browser
+
+    try:
+        content = await scraper.fetch("https://static.example.com/p/1")
+        assert content.metadata["fetched_via"] == "http"
+        assert content.metadata["title"] == "Parcel"
+        assert content.discovered_urls == ["https://static.example.com/p/2"]
+
+        # Missing required selector, then remembered for the host
+        for i in range(2):
+            content = await scraper.fetch(f"https://js.example.com/p/{i}")
+            assert content.metadata["fetched_via"] == "browser"
+
+        content = await scraper.fetch("https://blocked.example.com/p/1")
+        assert content.metadata["fetched_via"] == "browser"
+
+        # A missing page is an error whichever way it is fetched
+        with pytest.raises(HttpFetchError):
+            await scraper.fetch("https://gone.example.com/p/1")
+
+        stats = scraper.fetch_stats()
+        assert (stats["http"], stats["browser"], stats["fallback"]) == (1, 3, 2)
+        assert stats["browser_hosts"] == ["blocked.example.com", "js.example.com"]
+    finally:
+        await scraper.close()
+        await scraper.http.client.aclose()
+
+
+async def test_conditional_fetch():
+    """Test validators are sent and a 304 comes back as not modified."""
+    def cached(request: httpx.Request) -> httpx.Response:
+        if request.headers.get("If-None-Match") == '"v1"':
+            return httpx.Response(304, headers={"ETag": '"v1"'})
+        return httpx.Response(200, text='<div id="pid">1</div>', headers={"ETag": '"v1"'})
+
+    config = PlatformConfig(platform="test", schedule={"fetch_mode": "http"})
+    scraper = Scraper(config)
+    scraper.http._client = httpx.AsyncClient(transport=httpx.MockTransport(cached))
+
+    try:
+        content = await scraper.fetch("https://example.com/p/1")
+        assert not content.not_modified
+        assert content.metadata["etag"] == '"v1"'
+
+        content = await scraper.fetch("https://example.com/p/1", PageFingerprint(etag='"v1"'))
+        assert content.not_modified
+        assert content.html == ""
+        assert scraper.fetch_stats()["not_modified"] == 1
+    finally:
+        await scraper.close()
+        await scraper.http.client.aclose()
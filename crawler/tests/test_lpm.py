@@ -1,7 +1,14 @@
 """Tests for LPM."""
 
+import aiosqlite
 import pytest
+from datetime import datetime, timedelta
+from crawler.db.maintenance import compact_database
+from crawler.db.tuning import get_profile
 from crawler.lpm import LocalPersistenceManager
+from crawler.models.task import PageFingerprint, Task
+from crawler.priority import PriorityCalculator
+from crawler.repositories.task_repo import TaskFilter
 
 
 @pytest.mark.asyncio
@@ -62,3 +69,455 @@ async def test_lpm_complete_task(temp_db: str, tmp_path):
         assert task.result_path == "/results/test.json"
     finally:
         await lpm.close()
+
+
+@pytest.mark.asyncio
+async def test_lpm_persist_batch(temp_db: str, tmp_path):
+    """Test saving and completing several results at once."""
+    lpm = LocalPersistenceManager(temp_db, str(tmp_path))
+    await lpm.initialize()
+
+    try:
+        ids = [await lpm.add_task(f"https://example.com/{i}", "test") for i in range(3)]
+
+        paths = await lpm.save_results(
+            "test", [(task_id, {"task_id": task_id}, "<html></html>") for task_id in ids]
+        )
+        async with lpm.db.transaction():
+            await lpm.complete_tasks(list(zip(ids, paths)))
+
+        for task_id, path in zip(ids, paths):
+            task = await lpm.get_task(task_id)
+            assert task.status.value == "completed"
+            assert task.result_path == path
+            assert (await lpm.get_result(task_id, "test")) == {"task_id": task_id}
+            assert lpm.get_raw_html_path(task_id, "test").read_text() == "<html></html>"
+    finally:
+        await lpm.close()
+
+
+@pytest.mark.asyncio
+async def test_lpm_fingerprints_and_refresh(temp_db: str, tmp_path):
+    """Test page fingerprints are stored, unchanged pages keep results, refresh requeues."""
+    lpm = LocalPersistenceManager(temp_db, str(tmp_path))
+    await lpm.initialize()
+
+    try:
+        first = await lpm.add_task("https://example.com/1", "test")
+        second = await lpm.add_task("https://example.com/2", "test")
+        async with lpm.db.transaction():
+            await lpm.complete_tasks(
+                [(first, "/r/1.json"), (second, "/r/2.json")],
+                [
+                    (first, PageFingerprint('"v1"', "Mon, 01 Jan 2024 00:00:00 GMT", "aaa")),
+                    (second, PageFingerprint(None, None, "bbb")),
+                ],
+            )
+
+        task = await lpm.get_task(first)
+        assert task.fingerprint == PageFingerprint('"v1"', "Mon, 01 Jan 2024 00:00:00 GMT", "aaa")
+        first_checked = task.last_checked_at
+        assert first_checked is not None
+
+        # Nothing is stale yet
+        assert await lpm.refresh_tasks(timedelta(hours=1)) == 0
+        assert await lpm.refresh_tasks(timedelta(0)) == 2
+        assert (await lpm.get_task(first)).status.value == "pending"
+
+        # A 304 without validators keeps the stored ones and the result
+        await lpm.complete_unchanged([(first, PageFingerprint(None, None, None))])
+        task = await lpm.get_task(first)
+        assert task.status.value == "completed"
+        assert task.result_path == "/r/1.json"
+        assert task.fingerprint.etag == '"v1"'
+        assert task.fingerprint.content_hash == "aaa"
+        assert task.last_checked_at > first_checked
+    finally:
+        await lpm.close()
+
+
+@pytest.mark.asyncio
+async def test_lpm_claim_tasks(temp_db: str, tmp_path):
+    """Test atomic batched claiming."""
+    lpm = LocalPersistenceManager(temp_db, str(tmp_path))
+    await lpm.initialize()
+
+    try:
+        await lpm.add_task("https://low.com", "test", priority=1)
+        await lpm.add_task("https://high.com", "test", priority=10)
+        await lpm.add_task("https://med.com", "test", priority=5)
+        await lpm.add_task("https://other.com", "other", priority=20)
+
+        claimed = await lpm.claim_tasks("test", 2, 60, "worker-a")
+        assert [t.url for t in claimed] == ["https://high.com", "https://med.com"]
+        assert all(t.status.value == "processing" for t in claimed)
+        assert all(t.worker_id == "worker-a" for t in claimed)
+        assert all(t.lease_expires_at is not None for t in claimed)
+
+        # Claimed tasks are not handed out again
+        claimed = await lpm.claim_tasks("test", 5, 60, "worker-b")
+        assert [t.url for t in claimed] == ["https://low.com"]
+
+        released = await lpm.release_tasks([claimed[0].id], "worker-b")
+        assert released == 1
+        task = await lpm.get_task(claimed[0].id)
+        assert task.status.value == "pending"
+        assert task.worker_id is None
+    finally:
+        await lpm.close()
+
+
+@pytest.mark.asyncio
+async def test_lpm_reap_expired_leases(temp_db: str, tmp_path):
+    """Test that expired leases are returned to the queue."""
+    lpm = LocalPersistenceManager(temp_db, str(tmp_path))
+    await lpm.initialize()
+
+    try:
+        await lpm.add_task("https://expired.com", "test", priority=10)
+        await lpm.add_task("https://live.com", "test", priority=5)
+
+        expired = await lpm.claim_tasks("test", 1, -1, "dead-worker")
+        live = await lpm.claim_tasks("test", 1, 600, "live-worker")
+
+        assert await lpm.reap_expired_leases() == 1
+
+        task = await lpm.get_task(expired[0].id)
+        assert task.status.value == "pending"
+        assert task.worker_id is None
+        task = await lpm.get_task(live[0].id)
+        assert task.status.value == "processing"
+
+        assert await lpm.renew_leases("live-worker", 600) == 1
+    finally:
+        await lpm.close()
+
+
+@pytest.mark.asyncio
+async def test_stale_worker_cannot_finish_reclaimed_task(temp_db: str, tmp_path):
+    """Test writes from a worker whose lease was reaped and reclaimed are ignored."""
+    lpm = LocalPersistenceManager(temp_db, str(tmp_path))
+    await lpm.initialize()
+
+    try:
+        task_id = await lpm.add_task("https://example.com/1", "test")
+        await lpm.claim_tasks("test", 1, -1, "worker-a")
+        assert await lpm.reap_expired_leases() == 1
+        await lpm.claim_tasks("test", 1, 600, "worker-b")
+
+        assert await lpm.retry_task(task_id, worker_id="worker-a") is None
+        assert not await lpm.fail_task(task_id, "boom", worker_id="worker-a")
+        assert not await lpm.complete_task(task_id, "/results/a.json", worker_id="worker-a")
+        assert await lpm.complete_tasks([(task_id, "/results/a.json")], worker_id="worker-a") == set()
+        assert await lpm.complete_unchanged(
+            [(task_id, PageFingerprint(None, None, "x"))], worker_id="worker-a"
+        ) == set()
+
+        task = await lpm.get_task(task_id)
+        assert (task.status.value, task.worker_id, task.retry_count) == ("processing", "worker-b", 0)
+        assert task.content_hash is None
+
+        assert await lpm.complete_tasks([(task_id, "/results/b.json")], worker_id="worker-b") == {task_id}
+        task = await lpm.get_task(task_id)
+        assert (task.status.value, task.result_path) == ("completed", "/results/b.json")
+    finally:
+        await lpm.close()
+
+
+@pytest.mark.asyncio
+async def test_lpm_add_tasks_in_chunks(temp_db: str, tmp_path):
+    """Test bulk task insertion."""
+    from crawler.models.task import Task
+
+    lpm = LocalPersistenceManager(temp_db, str(tmp_path))
+    await lpm.initialize()
+
+    try:
+        tasks = [
+            Task(id=f"task-{i}", url=f"https://example.com/{i}", platform="test")
+            for i in range(5)
+        ]
+        chunks = await lpm.add_tasks(tasks, chunk_size=2)
+        assert chunks == [2, 2, 1]
+        assert await lpm.get_queue_depth() == 5
+    finally:
+        await lpm.close()
+
+
+@pytest.mark.asyncio
+async def test_lpm_deduplicates_urls(temp_db: str, tmp_path):
+    """Test that equivalent URLs are queued once per platform."""
+    lpm = LocalPersistenceManager(temp_db, str(tmp_path))
+    await lpm.initialize()
+
+    try:
+        first = await lpm.add_task("https://Example.com/parcel?b=2&a=1", "test")
+        again = await lpm.add_task("https://example.com:443/parcel?a=1&b=2#top", "test")
+        other = await lpm.add_task("https://example.com/parcel?a=1&b=2", "other")
+
+        assert again == first
+        assert other != first
+        assert await lpm.get_queue_depth() == 2
+
+        known = await lpm.get_known_urls(
+            "test", ["https://example.com/parcel?a=1&b=2", "https://example.com/new"]
+        )
+        assert known == {"https://example.com/parcel?a=1&b=2"}
+    finally:
+        await lpm.close()
+
+
+@pytest.mark.asyncio
+async def test_duplicate_links_removed_on_upgrade(temp_db: str, tmp_path):
+    """Test that links duplicated by older versions are merged before URLs become unique."""
+    lpm = LocalPersistenceManager(temp_db, str(tmp_path))
+    await lpm.initialize()
+    await lpm.close()
+
+    async with aiosqlite.connect(temp_db) as conn:
+        await conn.execute("DROP INDEX idx_discovered_links_url_unique")
+        await conn.executemany(
+            "INSERT INTO discovered_links (source_task_id, url, processed) VALUES (?, ?, ?)",
+            [("a", "https://example.com/1", 0), ("b", "https://example.com/1", 1),
+             ("a", "https://example.com/2", 0)],
+        )
+        await conn.commit()
+
+    lpm = LocalPersistenceManager(temp_db, str(tmp_path))
+    await lpm.initialize()
+
+    try:
+        rows = await lpm.db.fetchall(
+            "SELECT source_task_id, url, processed FROM discovered_links ORDER BY url"
+        )
+        assert [tuple(row) for row in rows] == [
+            ("a", "https://example.com/1", 1), ("a", "https://example.com/2", 0),
+        ]
+        assert await lpm.link_repo.count_unprocessed() == 1
+    finally:
+        await lpm.close()
+
+
+@pytest.mark.asyncio
+async def test_group_commit_transaction(temp_db: str, tmp_path):
+    """Test group commit batching and explicit transactions."""
+    lpm = LocalPersistenceManager(
+        temp_db, str(tmp_path), db_options={"group_commit": True, "commit_interval_ms": 10}
+    )
+    await lpm.initialize()
+
+    try:
+        task_id = await lpm.add_task("https://example.com", "test")
+        assert lpm.db.connection.in_transaction
+
+        await lpm.db.flush()
+        assert not lpm.db.connection.in_transaction
+
+        with pytest.raises(RuntimeError):
+            async with lpm.db.transaction():
+                await lpm.db.execute("DELETE FROM tasks WHERE id = ?", (task_id,))
+                raise RuntimeError("abort")
+
+        assert await lpm.get_task(task_id) is not None
+    finally:
+        await lpm.close()
+
+
+@pytest.mark.asyncio
+async def test_read_pool_is_read_only(temp_db: str, tmp_path):
+    """Test that pooled readers see committed writes but cannot write."""
+    import sqlite3
+
+    lpm = LocalPersistenceManager(temp_db, str(tmp_path))
+    await lpm.initialize()
+
+    try:
+        await lpm.add_task("https://example.com", "test")
+        assert await lpm.get_queue_depth() == 1
+
+        with pytest.raises(sqlite3.OperationalError):
+            await lpm.db.read_fetchall("DELETE FROM tasks")
+    finally:
+        await lpm.close()
+
+
+@pytest.mark.asyncio
+async def test_lpm_stats_counters(temp_db: str, tmp_path):
+    """Test that trigger-maintained counters track status changes."""
+    lpm = LocalPersistenceManager(temp_db, str(tmp_path))
+    await lpm.initialize()
+
+    try:
+        first = await lpm.add_task("https://a.com", "test")
+        await lpm.add_task("https://b.com", "test")
+        await lpm.add_task("https://c.com", "test")
+        await lpm.complete_task(first, "/results/a.json")
+        await lpm.claim_tasks("test", 1, 60, "worker-a")
+        await lpm.task_repo.delete(first)
+
+        stats = await lpm.get_stats()
+        assert stats["tasks"]["pending"] == 1
+        assert stats["tasks"]["processing"] == 1
+        assert stats["tasks"]["completed"] == 0
+        assert stats["tasks"]["total"] == 2
+
+        await lpm.db.execute("DELETE FROM task_counters")
+        await lpm.db.commit()
+        await lpm.recount_stats()
+        assert await lpm.get_stats() == stats
+    finally:
+        await lpm.close()
+
+
+@pytest.mark.asyncio
+async def test_task_keyset_pagination(temp_db: str, tmp_path):
+    """Test that cursor pages cover every task once, in priority order."""
+    lpm = LocalPersistenceManager(temp_db, str(tmp_path))
+    await lpm.initialize()
+
+    try:
+        for i in range(7):
+            await lpm.add_task(f"https://example.com/{i}", "test", priority=i % 3)
+        await lpm.add_task("https://other.com", "other", priority=9)
+
+        filters = TaskFilter(platform="test")
+        seen = []
+        cursor = None
+        while True:
+            tasks, cursor = await lpm.task_repo.list_page(filters, cursor, 3)
+            seen.extend(tasks)
+            if cursor is None:
+                break
+
+        assert len(seen) == 7
+        assert len({t.id for t in seen}) == 7
+        assert [t.priority for t in seen] == sorted((t.priority for t in seen), reverse=True)
+        assert [t.id for t in seen] == [t.id async for t in lpm.task_repo.iter_all(filters, 2)]
+
+        with pytest.raises(ValueError):
+            await lpm.task_repo.list_page(filters, "not-a-cursor", 3)
+    finally:
+        await lpm.close()
+
+
+@pytest.mark.asyncio
+async def test_compact_archives_finished_tasks(temp_db: str, tmp_path):
+    """Test that compaction moves old finished tasks to the archive."""
+    lpm = LocalPersistenceManager(temp_db, str(tmp_path))
+    await lpm.initialize()
+
+    try:
+        old = await lpm.add_task("https://old.com", "test")
+        recent = await lpm.add_task("https://recent.com", "test")
+        await lpm.add_task("https://pending.com", "test")
+        await lpm.complete_task(old, "/results/old.json")
+        await lpm.complete_task(recent, "/results/recent.json")
+        await lpm.db.execute(
+            "UPDATE tasks SET completed_at = '2000-01-01T00:00:00' WHERE id = ?", (old,)
+        )
+        await lpm.db.commit()
+
+        archive = str(tmp_path / "archive.db")
+        report = await compact_database(lpm.db, archive_path=archive, retention_days=7)
+
+        assert report.tasks_archived == 1
+        assert report.auto_vacuum == "incremental"
+        assert await lpm.get_task(old) is None
+        assert await lpm.get_task(recent) is not None
+        stats = await lpm.get_stats()
+        assert stats["tasks"]["completed"] == 1
+        assert stats["tasks"]["total"] == 2
+
+        async with aiosqlite.connect(archive) as conn:
+            async with conn.execute("SELECT id FROM tasks") as cursor:
+                assert await cursor.fetchall() == [(old,)]
+    finally:
+        await lpm.close()
+
+
+@pytest.mark.asyncio
+async def test_db_profile_from_env(temp_db: str, tmp_path, monkeypatch):
+    """Test that the DB_PROFILE tuning profile is applied on connect."""
+    monkeypatch.setenv("DB_PROFILE", "balanced")
+    lpm = LocalPersistenceManager(temp_db, str(tmp_path))
+    await lpm.initialize()
+
+    try:
+        assert lpm.db.profile.name == "balanced"
+        row = await lpm.db.fetchone("PRAGMA cache_size")
+        assert row[0] == -64 * 1024
+        row = await lpm.db.read_fetchone("PRAGMA temp_store")
+        assert row[0] == 2
+    finally:
+        await lpm.close()
+
+    monkeypatch.setenv("DB_PROFILE", "missing")
+    with pytest.raises(ValueError):
+        get_profile()
+
+
+@pytest.mark.asyncio
+async def test_delayed_retry_not_claimed_until_due(temp_db: str, tmp_path):
+    """Test that a retried task is skipped until next_attempt_at passes."""
+    lpm = LocalPersistenceManager(temp_db, str(tmp_path))
+    await lpm.initialize()
+
+    try:
+        flaky = await lpm.add_task("https://flaky.com", "test", priority=5)
+        healthy = await lpm.add_task("https://healthy.com", "test")
+
+        claimed = await lpm.claim_tasks("test", 1, 60, "worker-a")
+        assert [t.id for t in claimed] == [flaky]
+        assert await lpm.retry_task(flaky, delay_seconds=300) == 1
+
+        claimed = await lpm.claim_tasks("test", 5, 60, "worker-a")
+        assert [t.id for t in claimed] == [healthy]
+        next_retry = await lpm.next_retry_at("test")
+        assert next_retry is not None
+
+        await lpm.db.execute(
+            "UPDATE tasks SET next_attempt_at = '2000-01-01T00:00:00' WHERE id = ?",
+            (flaky,),
+        )
+        await lpm.db.commit()
+        claimed = await lpm.claim_tasks("test", 5, 60, "worker-a")
+        assert [t.id for t in claimed] == [flaky]
+        assert claimed[0].retry_count == 1
+        assert await lpm.next_retry_at("test") is None
+    finally:
+        await lpm.close()
+
+
+@pytest.mark.asyncio
+async def test_reprioritize_matches_calculator(temp_db: str, tmp_path):
+    """Test that the SQL reprioritization agrees with PriorityCalculator."""
+    lpm = LocalPersistenceManager(temp_db, str(tmp_path))
+    await lpm.initialize()
+
+    try:
+        calculator = PriorityCalculator()
+        created = datetime.utcnow() - timedelta(hours=3, minutes=30)
+        await lpm.add_tasks([
+            Task(id="fresh", url="https://a.com", platform="test", priority=4),
+            Task(
+                id="owner", url="https://b.com", platform="test",
+                created_at=created, base_priority=1, relationship_type="owner",
+            ),
+            Task(
+                id="ancient", url="https://c.com", platform="test",
+                created_at=created - timedelta(days=30),
+            ),
+        ])
+        await lpm.db.execute("UPDATE tasks SET retry_count = 2 WHERE id = 'ancient'")
+        await lpm.db.commit()
+
+        assert await lpm.reprioritize_tasks(calculator) == 2
+        assert await lpm.reprioritize_tasks(calculator) == 0
+
+        owner = await lpm.get_task("owner")
+        assert owner.priority == 1 + calculator.calculate("owner", created)
+        assert owner.base_priority == 1
+        assert (await lpm.get_task("fresh")).priority == 4
+        assert (await lpm.get_task("ancient")).priority == 10 + 2 * 2
+    finally:
+        await lpm.close()
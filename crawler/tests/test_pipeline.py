@@ -0,0 +1,60 @@
+"""Tests for pipeline building blocks."""
+
+import time
+
+from crawler.config_loader import PlatformConfig
+from crawler.models.scraped_content import ScrapedContent
+from crawler.models.task import Task
+from crawler.parser.parser import Parser
+from crawler.pipeline import StageStats, create_parse_executor, fingerprint_content, parse_html
+
+
+async def test_parse_executor(sample_html: str, sample_config: dict):
+    """Test parsing off the event loop, in a thread and in a process."""
+    config = PlatformConfig(
+        platform="test",
+        selectors=sample_config["selectors"],
+        mapping=sample_config["mapping"],
+    )
+    expected = Parser(config).parse(sample_html).to_dict()
+
+    for workers in (0, 1):
+        executor = create_parse_executor(config, workers)
+        try:
+            result = await parse_html(executor, sample_html)
+            assert result.to_dict() == expected
+        finally:
+            executor.shutdown()
+
+
+def test_stage_utilization():
+    """Test busy time is reported against the stage's worker time."""
+    stats = StageStats("parse", workers=2)
+    stats.started_at = time.monotonic() - 10
+    stats.busy_seconds = 5
+    stats.items = 4
+
+    report = stats.to_dict(queued=3)
+    assert 0.2 < report["utilization"] <= 0.25
+    assert report["avg_seconds"] == 1.25
+    assert report["queued"] == 3
+
+
+def test_fingerprint_content():
+    """Test pages are unchanged on a 304 or an equal content hash."""
+    page = ScrapedContent(html="<p>1</p>", url="https://example.com", metadata={"etag": '"v1"'})
+    task = Task(id="t", url=page.url, platform="test")
+
+    fingerprint, unchanged = fingerprint_content(task, page)
+    assert not unchanged
+    assert fingerprint.etag == '"v1"'
+
+    task.content_hash = fingerprint.content_hash
+    assert fingerprint_content(task, page)[1]
+    page.html = "<p>2</p>"
+    assert not fingerprint_content(task, page)[1]
+
+    not_modified = ScrapedContent(html="", url=page.url, metadata={"not_modified": True})
+    fingerprint, unchanged = fingerprint_content(task, not_modified)
+    assert unchanged
+    assert fingerprint.content_hash == task.content_hash
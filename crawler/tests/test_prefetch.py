@@ -0,0 +1,84 @@
+"""Tests for task prefetcher."""
+
+import asyncio
+import pytest
+
+from crawler.lpm import LocalPersistenceManager
+from crawler.prefetch import TaskPrefetcher
+from crawler.ratelimit import RateLimiter, parse_rate
+
+
+@pytest.mark.asyncio
+async def test_prefetcher_serves_by_priority(temp_db: str, tmp_path):
+    """Test that buffered tasks are served highest priority first."""
+    lpm = LocalPersistenceManager(temp_db, str(tmp_path))
+    await lpm.initialize()
+
+    try:
+        await lpm.add_task("https://low.com", "test", priority=1)
+        await lpm.add_task("https://high.com", "test", priority=10)
+        await lpm.add_task("https://med.com", "test", priority=5)
+
+        prefetcher = TaskPrefetcher(lpm, "test", "worker-a", chunk_size=10)
+        urls = [(await prefetcher.get(wait=False)).url for _ in range(3)]
+        assert urls == ["https://high.com", "https://med.com", "https://low.com"]
+        assert await prefetcher.get(wait=False) is None
+    finally:
+        await lpm.close()
+
+
+@pytest.mark.asyncio
+async def test_prefetcher_wakes_on_new_task(temp_db: str, tmp_path):
+    """Test that an idle consumer wakes as soon as a task is added."""
+    lpm = LocalPersistenceManager(temp_db, str(tmp_path))
+    await lpm.initialize()
+
+    try:
+        prefetcher = TaskPrefetcher(lpm, "test", "worker-a", poll_interval=30)
+        consumer = asyncio.create_task(prefetcher.get())
+        await asyncio.sleep(0.05)
+        assert not consumer.done()
+
+        await lpm.add_task("https://new.com", "test")
+        task = await asyncio.wait_for(consumer, timeout=1)
+        assert task.url == "https://new.com"
+
+        await lpm.add_task("https://first.com", "test", priority=5)
+        await lpm.add_task("https://buffered.com", "test")
+        await prefetcher.get(wait=False)
+        assert len(prefetcher) == 1
+        assert await prefetcher.release() == 1
+        assert await lpm.get_queue_depth() == 1
+    finally:
+        await lpm.close()
+
+
+@pytest.mark.asyncio
+async def test_prefetcher_defers_throttled_hosts(temp_db: str, tmp_path):
+    """Test that a throttled host's tasks yield to other hosts."""
+    lpm = LocalPersistenceManager(temp_db, str(tmp_path))
+    await lpm.initialize()
+
+    try:
+        await lpm.add_task("https://slow.gov/1", "test", priority=10)
+        await lpm.add_task("https://slow.gov/2", "test", priority=9)
+        await lpm.add_task("https://fast.gov/1", "test", priority=1)
+
+        now = [0.0]
+        limiter = RateLimiter(
+            default_rate=parse_rate("60/m"),
+            host_rates={"fast.gov": None},
+            clock=lambda: now[0],
+        )
+        prefetcher = TaskPrefetcher(
+            lpm, "test", "worker-a", chunk_size=10, rate_limiter=limiter
+        )
+
+        assert (await prefetcher.get(wait=False)).url == "https://slow.gov/1"
+        assert (await prefetcher.get(wait=False)).url == "https://fast.gov/1"
+        assert limiter.delay_for("https://slow.gov/2") == pytest.approx(1.0)
+
+        now[0] = 1.0
+        assert (await prefetcher.get(wait=False)).url == "https://slow.gov/2"
+    finally:
+        await lpm.close()
@@ -0,0 +1,82 @@
+"""Tests for browser resource blocking."""
+
+import json
+
+import pytest
+
+pytest.importorskip("seleniumbase")
+
+from crawler.config_loader import PlatformConfig
+from crawler.scraper.browser import BrowserManager
+from crawler.scraper.resources import ResourcePolicy, summarize_performance_log
+
+
+def log_entry(method: str, **params) -> dict:
+    return {"message": json.dumps({"message": {"method": method, "params": params}})}
+
+
+def test_policy_from_config():
+    """Test schedule settings override the manifest and the image allow-list."""
+    config = PlatformConfig(
+        platform="test",
+        manifest={"scraping": {"resource_blocking": {"block_types": ["font"]}}},
+        schedule={"resource_blocking": {"block_types": ["image", "font"], "block_patterns": []}},
+    )
+    policy = ResourcePolicy.from_config(config)
+    assert "*.png" in policy.blocked_urls()
+    assert "*.woff2?*" in policy.blocked_urls()
+    assert "*.css" not in policy.blocked_urls()
+
+    policy.allow_images = ["*photos.example.com*"]
+    assert "*.png" not in policy.blocked_urls()
+    assert ResourcePolicy.disabled().blocked_urls() == []
+
+    with pytest.raises(ValueError):
+        ResourcePolicy.from_config(PlatformConfig(
+            platform="test", schedule={"resource_blocking": {"block_types": ["video"]}},
+        ))
+
+
+def test_summarize_performance_log():
+    """Test blocked requests are counted per type with estimated savings."""
+    entries = [
+        log_entry("Network.requestWillBeSent", requestId="1", type="Document"),
+        log_entry("Network.loadingFinished", requestId="1", encodedDataLength=12000),
+        log_entry("Network.requestWillBeSent", requestId="2", type="Image"),
+        log_entry("Network.loadingFailed", requestId="2", blockedReason="inspector"),
+        log_entry("Network.requestWillBeSent", requestId="3", type="Font"),
+        log_entry("Network.loadingFailed", requestId="3", type="Font", errorText="net::ERR_BLOCKED_BY_CLIENT"),
+        log_entry("Network.requestWillBeSent", requestId="4", type="Script"),
+        log_entry("Network.loadingFailed", requestId="4", errorText="net::ERR_CONNECTION_RESET"),
+        {"message": "not json"},
+    ]
+    stats = summarize_performance_log(entries, {"Image": 100, "Font": 10, "Other": 1})
+    assert (stats.requests, stats.blocked) == (4, 2)
+    assert stats.blocked_by_type == {"Image": 1, "Font": 1}
+    assert stats.bytes_loaded == 12000
+    assert stats.bytes_saved == 110
+
+
+def test_browser_applies_policy():
+    """Test the blocked URL patterns are sent over CDP once the driver exists."""
+    class FakeDriver:
+        def __init__(self):
+            self.commands = []
+
+        def execute_cdp_cmd(self, cmd, params):
+            self.commands.append((cmd, params))
+
+        def get_log(self, name):
+            return [log_entry("Network.requestWillBeSent", requestId="1", type="Document")]
+
+    policy = ResourcePolicy(block_types=["font"], block_patterns=["*ads*"])
+    manager = BrowserManager(resource_policy=policy)
+    manager._driver = FakeDriver()
+    manager._apply_resource_policy()
+
+    assert manager._driver.commands[0] == ("Network.enable", {})
+    cmd, params = manager._driver.commands[1]
+    assert cmd == "Network.setBlockedURLs"
+    assert params["urls"][0] == "*ads*"
+    assert "*.woff" in params["urls"]
+    assert manager.page_resources().requests == 1
@@ -0,0 +1,102 @@
+"""Tests for traversal strategies."""
+
+import pytest
+from datetime import datetime, timedelta
+
+from crawler.lpm import LocalPersistenceManager
+from crawler.models.task import Task
+from crawler.strategies import BaseStrategy, ChronosStrategy, StrategyMixer
+
+
+def test_mixer_allocates_by_weight_with_guarantees():
+    """Test quota split, guaranteed minimums and starvation protection."""
+    mixer = StrategyMixer.from_config({
+        "weights": {"priority": 0.9, "chronos": 0.1, "ripple": 0.01},
+        "min_guaranteed": {"chronos": 1},
+        "starvation_batches": 3,
+    })
+
+    quotas = mixer.allocate(10)
+    assert quotas == {"priority": 8, "chronos": 2, "ripple": 0}
+
+    for _ in range(2):
+        mixer.allocate(10)
+    assert mixer.allocate(10)["ripple"] == 1
+
+    assert StrategyMixer.from_config({}) is None
+    with pytest.raises(ValueError):
+        StrategyMixer.from_config({"weights": {"missing": 1}})
+    with pytest.raises(TypeError):
+        BaseStrategy()
+
+
+@pytest.mark.asyncio
+async def test_mixer_claims_from_each_strategy(temp_db: str, tmp_path):
+    """Test that a batch mixes strategies and backfills empty ones."""
+    lpm = LocalPersistenceManager(temp_db, str(tmp_path))
+    await lpm.initialize()
+
+    try:
+        old = datetime.utcnow() - timedelta(days=3)
+        await lpm.add_tasks(
+            [Task(id="old", url="https://a.com/old", platform="test", created_at=old)]
+            + [
+                Task(id=f"hot{i}", url=f"https://a.com/{i}", platform="test", priority=10)
+                for i in range(5)
+            ]
+        )
+
+        mixer = StrategyMixer.from_config({
+            "weights": {"priority": 0.5, "chronos": 0.25, "ripple": 0.25},
+        })
+        tasks = await mixer.claim(lpm, 4, "test", "worker-a", 60)
+
+        ids = {t.id for t in tasks}
+        assert len(tasks) == 4
+        assert "old" in ids
+        report = mixer.report()
+        assert report["chronos"]["claimed"] == 1
+        assert report["ripple"]["claimed"] == 0
+
+        old_task = next(t for t in tasks if t.id == "old")
+        mixer.record_result(old_task, True, 0.5)
+        assert mixer.report()["chronos"]["completed"] == 1
+    finally:
+        await lpm.close()
+
+
+@pytest.mark.asyncio
+async def test_chronos_prefers_least_recently_checked(temp_db: str, tmp_path):
+    """Test Chronos claims never-fetched pages, then the stalest re-crawls."""
+    lpm = LocalPersistenceManager(temp_db, str(tmp_path))
+    await lpm.initialize()
+
+    try:
+        now = datetime.utcnow()
+        await lpm.add_tasks([
+            Task(id=task_id, url=f"https://a.com/{task_id}", platform="test",
+                 created_at=now - timedelta(days=days))
+            for task_id, days in (("fresh", 5), ("stale", 4), ("new", 1))
+        ])
+        for task_id, checked in (("fresh", now - timedelta(hours=1)), ("stale", now - timedelta(days=10))):
+            await lpm.db.execute(
+                "UPDATE tasks SET last_checked_at = ? WHERE id = ?", (checked.isoformat(), task_id)
+            )
+        await lpm.db.commit()
+
+        chronos = ChronosStrategy()
+        order = []
+        for _ in range(3):
+            tasks = await chronos.suggest_tasks(lpm, 1, "test", "worker-a", 60)
+            order.extend(t.id for t in tasks)
+        assert order == ["new", "stale", "fresh"]
+
+        plan = await lpm.db.fetchall(
+            "EXPLAIN QUERY PLAN SELECT id FROM tasks WHERE status = 'pending' "
+            f"AND platform = 'test' AND next_attempt_at IS NULL ORDER BY {chronos.order_by} LIMIT 5"
+        )
+        details = " ".join(row["detail"] for row in plan)
+        assert "idx_tasks_due_checked" in details
+        assert "TEMP B-TREE" not in details
+    finally:
+        await lpm.close()
@@ -0,0 +1,105 @@
+"""Tests for the worker supervisor."""
+
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Optional
+
+from crawler.config_loader import PlatformConfig
+from crawler.ratelimit import RateLimiter
+from crawler.state import CheckpointState, StateSerializer
+from crawler.supervisor import WorkerSupervisor
+
+
+@dataclass
+class ExitedProcess:
+    """Stands in for a child process that has exited."""
+    exitcode: Optional[int]
+    pid: int = 1234
+
+    def is_alive(self) -> bool:
+        return False
+
+
+def test_supervisor_restart_backoff_and_status(tmp_path):
+    """Test crashed children back off, clean exits finish, counts aggregate."""
+    supervisor = WorkerSupervisor(
+        "test", str(tmp_path / "crawler.db"), str(tmp_path), str(tmp_path), 2,
+        restart_base_delay=1.0, restart_max_delay=3.0, stable_after=60.0,
+        supervisor_id="sup",
+    )
+    child = supervisor.children[0]
+    assert child.worker_id == "sup-w0"
+
+    # Crash after writing a checkpoint: counts carry over, restart in 1s
+    child.started_at = datetime.utcnow().isoformat()
+    StateSerializer(str(tmp_path / "state")).save_checkpoint(CheckpointState.create(
+        checkpoint_id=f"{child.worker_id}_1", processed_count=7, error_count=1,
+    ))
+    child.process = ExitedProcess(exitcode=1)
+    supervisor._reap(child, now=100.0)
+    assert (child.restarts, child.next_start_at) == (1, 101.0)
+
+    # Quick crashes double the delay up to the cap
+    for expected in (2.0, 3.0):
+        child.process = ExitedProcess(exitcode=-9)
+        child.started_monotonic = 100.0
+        supervisor._reap(child, now=101.0)
+        assert child.next_start_at == 101.0 + expected
+
+    # A clean exit is not restarted
+    child.process = ExitedProcess(exitcode=0)
+    supervisor._reap(child, now=200.0)
+    assert child.finished
+
+    status = supervisor.status()
+    assert status["processed"] == 7
+    assert status["errors"] == 1
+    assert status["restarts"] == 3
+    assert status["children"][0]["last_exit_code"] == 0
+
+
+def test_supervisor_divides_rate_limits(tmp_path):
+    """Test each child gets an equal share of the per-host rate limits."""
+    supervisor = WorkerSupervisor(
+        "test", str(tmp_path / "crawler.db"), str(tmp_path), str(tmp_path), 4,
+        worker_options={"concurrency": 2},
+    )
+    share = supervisor.worker_options["rate_share"]
+    assert share == 0.25
+    assert supervisor.worker_options["concurrency"] == 2
+
+    config = PlatformConfig(
+        platform="test",
+        schedule={"rate_limit": "8/s", "burst": 4, "host_rate_limits": {"slow.gov": "4/m"}},
+    )
+    limiter = RateLimiter.from_config(config, share=share)
+    assert limiter.default_rate == 2.0
+    assert limiter.burst == 1
+    assert limiter.host_rates["slow.gov"] == 1 / 60
+
+    # Four children together stay within the configured 8/s
+    now = [0.0]
+    children = [RateLimiter.from_config(config, share=share) for _ in range(4)]
+    for child in children:
+        child.clock = lambda: now[0]
+    sent = 0
+    while now[0] < 10.0:
+        sent += sum(child.try_acquire("https://fast.gov/p") for child in children)
+        now[0] += 0.01
+    assert sent <= 8 * 10 + 4
+
+
+def test_checkpoint_cleanup_per_worker(tmp_path):
+    """Test pruning one worker's checkpoints leaves the others and the latest."""
+    serializer = StateSerializer(str(tmp_path / "state"))
+    for worker_id, count in (("sup-w1", 8), ("sup-w10", 2)):
+        for i in range(count):
+            checkpoint = CheckpointState.create(checkpoint_id=f"{worker_id}_{i}", processed_count=i)
+            checkpoint.timestamp = f"2026-01-01T00:00:{i:02d}"
+            serializer.save_checkpoint(checkpoint)
+
+    assert serializer.cleanup_old_checkpoints(5, prefix="checkpoint_sup-w1_") == 3
+    assert len(list(serializer.state_dir.glob("checkpoint_sup-w1_*.json"))) == 5
+    assert len(list(serializer.state_dir.glob("checkpoint_sup-w10_*.json"))) == 2
+    latest = serializer.get_latest_checkpoint(prefix="checkpoint_sup-w1_")
+    assert latest.processed_count == 7
@@ -0,0 +1,242 @@
+"""Tests for the worker pipeline."""
+
+import asyncio
+
+import pytest
+
+pytest.importorskip("seleniumbase")
+
+from crawler.config_loader import PlatformConfig
+from crawler.lpm import LocalPersistenceManager
+from crawler.models.parsed_result import DiscoveredLink, ParsedResult
+from crawler.models.scraped_content import ScrapedContent
+from crawler.models.task import TaskStatus
+from crawler.pipeline import PipelineItem, fingerprint_content
+from crawler.scraper.pool import BrowserPool
+from crawler.worker import Worker
+
+
+async def claimed_items(lpm: LocalPersistenceManager, worker: Worker, count: int):
+    """Add and claim tasks, returning them as parsed pipeline items."""
+    for i in range(count):
+        await lpm.add_task(f"https://example.com/p/{i}", "test", task_id=f"t{i}")
+    tasks = await lpm.claim_tasks("test", count, 600, worker.worker_id)
+
+    items = []
+    for task in sorted(tasks, key=lambda t: t.id):
+        item = PipelineItem(task)
+        item.content = ScrapedContent(html=f"<p>{task.id}</p>", url=task.url)
+        item.fingerprint, item.unchanged = fingerprint_content(task, item.content)
+        item.result = ParsedResult(
+            task_id=task.id, platform="test", parcel_id=task.id, data={},
+            discovered_links=[DiscoveredLink(url=f"{task.url}/next")],
+        )
+        items.append(item)
+    worker._pending += len(items)
+    return items
+
+
+async def test_persist_batch_failure_isolates_bad_item(temp_db: str, tmp_path):
+    """Test one failing item does not fail or retry the rest of its batch."""
+    lpm = LocalPersistenceManager(temp_db, str(tmp_path))
+    await lpm.initialize()
+    worker = Worker(lpm, PlatformConfig(platform="test"), persist_batch_size=10, worker_id="w")
+
+    add_links = lpm.add_discovered_links
+
+    async def add_discovered_links(source_task_id, links):
+        if source_task_id == "t1":
+            raise RuntimeError("bad links")
+        return await add_links(source_task_id, links)
+
+    lpm.add_discovered_links = add_discovered_links
+
+    try:
+        for item in await claimed_items(lpm, worker, 3):
+            worker.persist_queue.put_nowait(item)
+
+        stage = asyncio.create_task(worker._persist_stage())
+        await asyncio.wait_for(worker.persist_queue.join(), 5)
+        stage.cancel()
+
+        for task_id in ("t0", "t2"):
+            task = await lpm.get_task(task_id)
+            assert (task.status, task.retry_count) == (TaskStatus.COMPLETED, 0)
+        bad = await lpm.get_task("t1")
+        assert (bad.status, bad.retry_count) == (TaskStatus.PENDING, 1)
+
+        assert worker.processed_count == 2
+        assert (worker.stages["persist"].items, worker.stages["persist"].failed) == (2, 1)
+        assert worker._pending == 0
+    finally:
+        await lpm.close()
+
+
+async def test_persist_drops_results_after_lease_lost(temp_db: str, tmp_path):
+    """Test a task reclaimed by another worker is neither completed nor retried."""
+    lpm = LocalPersistenceManager(temp_db, str(tmp_path))
+    await lpm.initialize()
+    worker = Worker(lpm, PlatformConfig(platform="test"), worker_id="w")
+
+    try:
+        kept, lost, lost_failing = await claimed_items(lpm, worker, 3)
+        await lpm.db.execute(
+            "UPDATE tasks SET worker_id = 'other' WHERE id IN (?, ?)",
+            (lost.task.id, lost_failing.task.id),
+        )
+        await lpm.db.commit()
+
+        await worker._persist_batch([kept, lost])
+        await worker._fail_item(lost_failing, RuntimeError("late failure"))
+
+        for item in (lost, lost_failing):
+            task = await lpm.get_task(item.task.id)
+            assert (task.status, task.worker_id, task.retry_count) == (TaskStatus.PROCESSING, "other", 0)
+        assert (await lpm.get_task(kept.task.id)).status == TaskStatus.COMPLETED
+        assert await lpm.link_repo.get_by_source(lost.task.id) == []
+        assert (worker.processed_count, worker.lease_lost_count) == (1, 2)
+        assert worker._pending == 0
+    finally:
+        await lpm.close()
+
+
+class SlowFetches:
+    """Stands in for Scraper.fetch, tracking how many fetches overlap."""
+
+    def __init__(self, durations=None, default: float = 0.2):
+        self.durations = durations or {}
+        self.default = default
+        self.active = 0
+        self.max_active = 0
+
+    async def __call__(self, url: str) -> ScrapedContent:
+        self.active += 1
+        self.max_active = max(self.max_active, self.active)
+        try:
+            await asyncio.sleep(self.durations.get(url, self.default))
+        finally:
+            self.active -= 1
+        return ScrapedContent(html=f"<p>{url}</p>", url=url)
+
+
+def http_worker(lpm, monkeypatch, fetches, **options) -> Worker:
+    """A worker whose pages come from a fake fetch instead of a browser."""
+    async def fetch(scraper, url, fingerprint=None):
+        return await fetches(url)
+
+    monkeypatch.setattr("crawler.worker.Scraper.fetch", fetch)
+    config = PlatformConfig(platform="test", schedule={"fetch_mode": "http"})
+    return Worker(lpm, config, worker_id="w", parse_workers=0, **options)
+
+
+async def test_concurrent_fetches_drain(temp_db: str, tmp_path, monkeypatch):
+    """Test fetches overlap up to the concurrency and drain mode waits for them."""
+    lpm = LocalPersistenceManager(temp_db, str(tmp_path))
+    await lpm.initialize()
+    fetches = SlowFetches()
+
+    try:
+        for i in range(6):
+            await lpm.add_task(f"https://example.com/p/{i}", "test")
+        worker = http_worker(lpm, monkeypatch, fetches, concurrency=3, drain_mode=True)
+
+        started = asyncio.get_running_loop().time()
+        running = asyncio.create_task(worker.run())
+        await asyncio.sleep(fetches.default / 2)
+        await worker._create_checkpoint()
+        checkpoint = worker.state_serializer.get_latest_checkpoint()
+        assert len(checkpoint.metadata["inflight_task_ids"]) == 3
+
+        await asyncio.wait_for(running, 10)
+        elapsed = asyncio.get_running_loop().time() - started
+
+        assert fetches.max_active == 3
+        assert not worker.inflight_task_ids
+        # Two rounds of three overlapping fetches, not six in a row
+        assert elapsed < 6 * fetches.default
+        assert worker.processed_count == 6
+        stats = await lpm.get_stats()
+        assert stats["tasks"]["completed"] == 6
+    finally:
+        await lpm.close()
+
+
+async def test_leases_renewed_while_draining(temp_db: str, tmp_path, monkeypatch):
+    """Test the heartbeat keeps running until in-flight fetches finish."""
+    lpm = LocalPersistenceManager(temp_db, str(tmp_path))
+    await lpm.initialize()
+    fetches = SlowFetches({"https://example.com/p/0": 0.05}, default=0.5)
+
+    try:
+        for i in range(3):
+            await lpm.add_task(f"https://example.com/p/{i}", "test")
+        worker = http_worker(lpm, monkeypatch, fetches, concurrency=3, heartbeat_interval=0.05)
+
+        renewals_while_draining = 0
+        renew_leases = lpm.renew_leases
+
+        async def counting_renew(worker_id, lease_seconds):
+            nonlocal renewals_while_draining
+            if not worker.running and fetches.active:
+                renewals_while_draining += 1
+            return await renew_leases(worker_id, lease_seconds)
+
+        lpm.renew_leases = counting_renew
+
+        running = asyncio.create_task(worker.run())
+        await asyncio.sleep(0.02)
+        worker.stop()
+        await asyncio.wait_for(running, 10)
+
+        assert renewals_while_draining >= 3
+        assert worker.processed_count == 3
+        assert worker._maintenance_task.done()
+    finally:
+        await lpm.close()
+
+
+class FakeBrowserManager:
+    """Stands in for BrowserManager without launching Chrome."""
+
+    def get_driver(self):
+        return object()
+
+    def close(self):
+        pass
+
+    def rss_bytes(self):
+        return 0
+
+
+async def test_challenges_beyond_spare_browsers(temp_db: str, tmp_path, monkeypatch):
+    """Test more simultaneous challenges than spare browsers do not stall the worker."""
+    lpm = LocalPersistenceManager(temp_db, str(tmp_path))
+    await lpm.initialize()
+
+    monkeypatch.setattr(
+        "crawler.worker.BrowserPool.from_config",
+        lambda config, size, **kwargs: BrowserPool(size=size, factory=FakeBrowserManager),
+    )
+
+    async def fetch_page(scraper, url, browser):
+        if "challenge" in url:
+            async with scraper.challenge_wait():
+                await asyncio.sleep(0.2)
+        return ScrapedContent(html=f"<p>{url}</p>", url=url)
+
+    monkeypatch.setattr("crawler.worker.Scraper._fetch_page", fetch_page)
+
+    try:
+        for name in ("challenge-0", "challenge-1", "plain"):
+            await lpm.add_task(f"https://example.com/{name}", "test")
+        worker = Worker(
+            lpm, PlatformConfig(platform="test"), worker_id="w", parse_workers=0,
+            concurrency=1, spare_browsers=1, drain_mode=True,
+        )
+
+        await asyncio.wait_for(worker.run(), 5)
+
+        assert worker.processed_count == 3
+        assert worker.browser_pool.size == 2
+    finally:
+        await lpm.close()
@@ -0,0 +1,49 @@
+"""URL normalization and hashing for queue deduplication."""
+
+import hashlib
+from urllib.parse import urlsplit, urlunsplit, parse_qsl, urlencode
+
+
+DEFAULT_PORTS = {
+    "http": 80,
+    "https": 443,
+}
+
+
+def normalize_url(url: str) -> str:
+    """
+    Normalize a URL so equivalent spellings compare equal.
+
+    - Lowercases scheme and host
+    - Drops default ports and fragments
+    - Sorts query parameters
+    - Uses "/" for an empty path
+    """
+    url = url.strip()
+    parts = urlsplit(url)
+
+    try:
+        port = parts.port
+    except ValueError:
+        # Malformed port - compare the URL as given
+        return url
+
+    scheme = parts.scheme.lower()
+    netloc = (parts.hostname or "").lower()
+    if parts.username:
+        userinfo = parts.username
+        if parts.password:
+            userinfo += f":{parts.password}"
+        netloc = f"{userinfo}@{netloc}"
+    if port and DEFAULT_PORTS.get(scheme) != port:
+        netloc += f":{port}"
+
+    path = parts.path or "/"
+    query = urlencode(sorted(parse_qsl(parts.query, keep_blank_values=True)))
+
+    return urlunsplit((scheme, netloc, path, query, ""))
+
+
+def url_hash(url: str) -> str:
+    """Get the dedup hash of a URL (SHA1 of its normalized form)."""
+    return hashlib.sha1(normalize_url(url).encode("utf-8")).hexdigest()
@@ -4,6 +4,7 @@ import logging
 from typing import Optional, Dict, Any
 import httpx
 
+from crawler.http_clients import get_client
 from crawler.webhooks.models import WebhookPayload
 from crawler.webhooks.signer import WebhookSigner
 
@@ -19,6 +20,7 @@ class WebhookClient:
     - Retry with backoff
     - Timeout handling
     - Error logging
+    - Keep-alive connections shared through the "webhooks" client
     """
 
     def __init__(
@@ -73,42 +75,43 @@ class WebhookClient:
 
     async def _send_once(self, payload: WebhookPayload) -> bool:
         """Send webhook once."""
-        async with httpx.AsyncClient() as client:
-            # Prepare payload
-            data = payload.to_dict()
-
-            # Prepare headers
-            headers = {
-                "Content-Type": "application/json",
-                "X-Webhook-Event": payload.event.value,
-            }
+        client = get_client("webhooks")
+
+        # Prepare payload
+        data = payload.to_dict()
+
+        # Prepare headers
+        headers = {
+            "Content-Type": "application/json",
+            "X-Webhook-Event": payload.event.value,
+        }
+
+        # Add signature if configured
+        if self.signer:
+            signature = self.signer.sign(data)
+            headers["X-Webhook-Signature"] = signature
+
+        try:
+            response = await client.post(
+                self.webhook_url,
+                json=data,
+                headers=headers,
+                timeout=self.timeout,
+            )
+
+            if response.status_code >= 400:
+                logger.warning(f"Webhook returned {response.status_code}")
+                return False
 
-            # Add signature if configured
-            if self.signer:
-                signature = self.signer.sign(data)
-                headers["X-Webhook-Signature"] = signature
+            logger.info(f"Webhook sent successfully: {payload.event.value}")
+            return True
 
-            try:
-                response = await client.post(
-                    self.webhook_url,
-                    json=data,
-                    headers=headers,
-                    timeout=self.timeout,
-                )
-
-                if response.status_code >= 400:
-                    logger.warning(f"Webhook returned {response.status_code}")
-                    return False
-
-                logger.info(f"Webhook sent successfully: {payload.event.value}")
-                return True
-
-            except httpx.TimeoutException:
-                logger.warning("Webhook request timed out")
-                return False
-            except httpx.ConnectError:
-                logger.warning("Webhook connection failed")
-                return False
+        except httpx.TimeoutException:
+            logger.warning("Webhook request timed out")
+            return False
+        except httpx.ConnectError:
+            logger.warning("Webhook connection failed")
+            return False
 
     async def send_task_completed(
         self,
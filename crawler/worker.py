@@ -2,27 +2,52 @@
 
 import asyncio
 import logging
-from typing import Optional
+import os
+import socket
+import time
+from contextlib import asynccontextmanager
+from contextvars import ContextVar
+from typing import AsyncIterator, List, Optional, Set
 from datetime import datetime
 
 from crawler.lpm import LocalPersistenceManager
+from crawler.prefetch import TaskPrefetcher
+from crawler.ratelimit import RateLimiter
+from crawler.strategies.mixer import StrategyMixer
 from crawler.config_loader import PlatformConfig
+from crawler.http_clients import close_clients, pool_metrics
 from crawler.scraper.scraper import Scraper
-from crawler.parser.parser import Parser
+from crawler.scraper.pool import BrowserPool
+from crawler.scraper.retry import RetryConfig
+from crawler.pipeline import (
+    PipelineItem, StageStats, create_parse_executor, fingerprint_content, parse_html,
+)
 from crawler.state import StateSerializer, CheckpointState
 from crawler.models.task import TaskStatus
 
 logger = logging.getLogger(__name__)
 
+# Item the current fetch task is working on
+_fetching_item: ContextVar[Optional[PipelineItem]] = ContextVar("_fetching_item", default=None)
+
 
 class Worker:
     """
     Worker for processing task queue.
     
     Features:
-    - Continuous task processing
+    - Staged pipeline: concurrent fetches (one pooled browser per slot),
+      parsing in worker processes and batched persistence, linked by
+      bounded queues for backpressure, with per-stage utilization
+    - Warm browser pool with recycling of worn-out browsers
+    - Atomic batched task claiming with leases
+    - In-memory prefetch buffer with instant wake-up on new tasks
+    - Per-host rate limiting from the platform config (rate_share of it
+      when several processes crawl the platform)
+    - Optional weighted strategy mix (schedule.json "strategies")
+    - Lease heartbeat and reaping of expired leases
     - Checkpoint-based resumability
-    - Error handling with retries
+    - Error handling with delayed retries (exponential backoff)
     - Progress logging
     """
 
@@ -33,148 +58,505 @@ class Worker:
         max_retries: int = 3,
         drain_mode: bool = False,
         checkpoint_interval: int = 10,
+        checkpoint_keep: int = 5,
+        batch_size: int = 5,
+        lease_seconds: int = 600,
+        worker_id: Optional[str] = None,
+        heartbeat_interval: int = 60,
+        retry_base_delay: float = 30.0,
+        retry_max_delay: float = 3600.0,
+        reprioritize_interval: int = 300,
+        url_filter: bool = True,
+        concurrency: int = 1,
+        spare_browsers: int = 1,
+        parse_workers: int = 1,
+        persist_batch_size: int = 20,
+        rate_share: float = 1.0,
     ):
         self.lpm = lpm
         self.config = config
         self.max_retries = max_retries
         self.drain_mode = drain_mode
         self.checkpoint_interval = checkpoint_interval
+        self.checkpoint_keep = max(1, checkpoint_keep)
+        self.concurrency = max(1, concurrency)
+        self.spare_browsers = max(0, spare_browsers)
+        self.parse_workers = max(0, parse_workers)
+        self.persist_batch_size = max(1, persist_batch_size)
+        # Keep at least one claim per slot buffered
+        self.batch_size = max(batch_size, self.concurrency)
+        self.lease_seconds = lease_seconds
+        self.worker_id = worker_id or f"{socket.gethostname()}-{os.getpid()}"
+        self.heartbeat_interval = heartbeat_interval
+        self.reprioritize_interval = reprioritize_interval
+        self.use_url_filter = url_filter
+        self.retry_config = RetryConfig(
+            max_retries=max_retries,
+            base_delay=retry_base_delay,
+            max_delay=retry_max_delay,
+        )
 
         # State
         self.running = False
         self.processed_count = 0
         self.error_count = 0
-        self.current_task_id: Optional[str] = None
+        self.reclaimed_count = 0
+        self.unchanged_count = 0
+        # Tasks finished after their lease had passed to another worker
+        self.lease_lost_count = 0
+        self._maintenance_task: Optional[asyncio.Task] = None
+        self._inflight: Set[asyncio.Task] = set()
+        self._slots: Optional[asyncio.Semaphore] = None
+        self._stage_tasks: List[asyncio.Task] = []
+        # Tasks taken off the prefetch buffer and not yet finished or failed
+        self._pending = 0
+        self.inflight_task_ids: Set[str] = set()
+        self._pipeline_idle = asyncio.Event()
+        self._pipeline_idle.set()
+        self._last_checkpoint_count = 0
+
+        # Pipeline queues: fetched pages wait for a parser, parsed ones for
+        # the next persist batch. Full queues hold back the stage before.
+        self.parse_queue: asyncio.Queue = asyncio.Queue(maxsize=2 * self.concurrency)
+        self.persist_queue: asyncio.Queue = asyncio.Queue(maxsize=2 * self.persist_batch_size)
+        self.stages = {
+            "fetch": StageStats("fetch", workers=self.concurrency),
+            "parse": StageStats("parse", workers=max(1, self.parse_workers)),
+            "persist": StageStats("persist"),
+        }
 
         # Components
         self.scraper: Optional[Scraper] = None
-        self.parser: Optional[Parser] = None
+        self.browser_pool: Optional[BrowserPool] = None
+        self.parse_executor = None
+        self.mixer = StrategyMixer.from_config((config.schedule or {}).get("strategies"))
+        self.prefetcher = TaskPrefetcher(
+            lpm,
+            config.platform,
+            self.worker_id,
+            chunk_size=self.batch_size,
+            lease_seconds=lease_seconds,
+            rate_limiter=RateLimiter.from_config(config, share=rate_share),
+            mixer=self.mixer,
+        )
         self.state_serializer = StateSerializer(f"{lpm.data_dir}/state")
 
     async def run(self) -> None:
         """Start worker loop."""
         self.running = True
-        logger.info(f"Worker started for platform: {self.config.platform}")
+        logger.info(
+            f"Worker {self.worker_id} started for platform: {self.config.platform} "
+            f"(concurrency {self.concurrency})"
+        )
+
+        # One browser per slot, plus spares that cover recycling
+        self.browser_pool = BrowserPool.from_config(
+            self.config,
+            size=self.concurrency + self.spare_browsers,
+            headless=True,
+        )
+        self.scraper = Scraper(self.config, headless=True, pool=self.browser_pool)
+        self.scraper.challenge_wait = self._slot_given_up
+
+        # Warm them up front unless pages are fetched over plain HTTP first
+        # (auto mode launches browsers on the first fallback)
+        if self.scraper.fetch_mode == "browser":
+            await self.browser_pool.start()
+            logger.info(f"Browser pool ready: {self.browser_pool.size} browsers")
+        else:
+            logger.info(f"Fetch mode: {self.scraper.fetch_mode}")
+        self.parse_executor = create_parse_executor(self.config, self.parse_workers)
+        self._slots = asyncio.Semaphore(self.concurrency)
+
+        # Seen-URL filter so duplicate checks skip SQLite for new URLs
+        if self.use_url_filter and self.lpm.url_filter is None:
+            bloom = await self.lpm.load_url_filter()
+            logger.info(
+                f"URL filter loaded: {len(bloom)} entries, "
+                f"{bloom.memory_bytes / 1024 / 1024:.1f} MiB"
+            )
+
+        # Claims still under our ID belong to a previous process that died
+        released = await self.lpm.release_worker_tasks(self.worker_id)
+        if released:
+            logger.warning(f"Released {released} tasks left claimed by {self.worker_id}")
 
-        # Initialize scraper and parser
-        self.scraper = Scraper(self.config, headless=True)
-        self.parser = Parser(self.config)
+        # Heartbeat our leases and reclaim those of dead workers
+        self._maintenance_task = asyncio.create_task(self._maintenance_loop())
+
+        # Downstream stages; the loop below is the fetch stage
+        for stats in self.stages.values():
+            stats.started_at = time.monotonic()
+        self._stage_tasks = [
+            asyncio.create_task(self._parse_stage())
+            for _ in range(self.stages["parse"].workers)
+        ]
+        self._stage_tasks.append(asyncio.create_task(self._persist_stage()))
 
         try:
             while self.running:
-                # Check if we should stop (drain mode)
-                if self.drain_mode:
-                    depth = await self.lpm.get_queue_depth()
-                    if depth == 0:
-                        logger.info("Queue drained, stopping")
-                        break
+                # Wait for a free slot before taking a task off the buffer
+                await self._slots.acquire()
+                if not self.running:
+                    self._slots.release()
+                    break
 
-                # Get next task
-                task = await self.lpm.get_next_task(self.config.platform)
+                # Get next task (drain mode stops once the queue is empty)
+                task = await self.prefetcher.get(wait=not self.drain_mode)
 
                 if task is None:
-                    if self.drain_mode:
+                    self._slots.release()
+                    if self._pipeline_busy():
+                        # Tasks in the pipeline may still queue retries or discovered links
+                        await self._wait_for_pipeline()
+                        continue
+
+                    next_retry = await self.lpm.next_retry_at(self.config.platform)
+                    if next_retry is None:
+                        logger.info("Queue drained, stopping")
                         break
-                    # Wait before checking again
-                    await asyncio.sleep(5)
-                    continue
 
-                # Process task
-                await self._process_task(task)
+                    # Only delayed retries left - wait for the first one
+                    delay = max(0.0, (next_retry - datetime.utcnow()).total_seconds())
+                    logger.info(f"Waiting {delay:.0f}s for delayed retries")
+                    await asyncio.sleep(delay)
+                    continue
 
-                # Create checkpoint periodically
-                if self.processed_count % self.checkpoint_interval == 0:
-                    await self._create_checkpoint()
+                # Fetch in the background; the slot is freed once the page is queued
+                self._pending += 1
+                self._pipeline_idle.clear()
+                running = asyncio.create_task(self._fetch_stage(task))
+                self._inflight.add(running)
+                running.add_done_callback(self._inflight.discard)
 
         except KeyboardInterrupt:
             logger.info("Worker interrupted")
         finally:
             await self._cleanup()
 
-    async def _process_task(self, task) -> None:
-        """Process a single task."""
-        self.current_task_id = task.id
+    async def _fetch_stage(self, task) -> None:
+        """Fetch one task's page and hand it to the parse stage, then free the slot."""
+        self.inflight_task_ids.add(task.id)
+        item = PipelineItem(task)
+        _fetching_item.set(item)
+        stats = self.stages["fetch"]
         logger.info(f"Processing task: {task.id} ({task.url})")
 
         try:
-            # Mark as processing
-            success = await self.lpm.start_task(task.id)
-            if not success:
-                logger.warning(f"Task {task.id} already being processed")
-                return
-
-            # Fetch content
-            content = await self.scraper.fetch(task.url)
-            logger.debug(f"Fetched {len(content.html)} bytes")
-
-            # Parse content
-            result = self.parser.parse(content.html)
-            result.task_id = task.id
-
-            # Save result
-            result_path = await self.lpm.save_result(
-                task.id,
-                self.config.platform,
-                result.to_dict(),
-            )
-
-            # Save raw HTML
-            raw_path = self.lpm.get_raw_html_path(task.id, self.config.platform)
-            await self.lpm.save_text(content.html, raw_path)
-
-            # Add discovered links to queue
-            if result.discovered_links:
-                await self.lpm.add_discovered_links(task.id, result.discovered_links)
-                logger.debug(f"Added {len(result.discovered_links)} discovered links")
+            with stats.busy():
+                item.content = await self.scraper.fetch(task.url, task.fingerprint)
+                item.fingerprint, item.unchanged = fingerprint_content(task, item.content)
+            stats.items += 1
+            logger.debug(f"Fetched {len(item.content.html)} bytes")
+
+            # Blocks while parsers (or, for unchanged pages, persistence) are behind
+            if item.unchanged:
+                await self.persist_queue.put(item)
+            else:
+                await self.parse_queue.put(item)
+        except Exception as e:
+            stats.failed += 1
+            await self._fail_item(item, e)
+        finally:
+            if item.holds_slot:
+                self._slots.release()
+
+    @asynccontextmanager
+    async def _slot_given_up(self) -> AsyncIterator[None]:
+        """
+        Free the current fetch slot for other tasks, e.g. during a challenge wait.
+
+        The slot is not taken back: the waiting task still holds a pooled
+        browser, so waiting for a slot held by a task that waits for a
+        browser would deadlock. The task finishes outside the concurrency
+        limit instead; the pool size still bounds browsers in use.
+        """
+        item = _fetching_item.get()
+        if item is not None and item.holds_slot:
+            item.holds_slot = False
+            self._slots.release()
+        yield
+
+    async def _parse_stage(self) -> None:
+        """Parse fetched pages off the event loop."""
+        stats = self.stages["parse"]
+        while True:
+            item = await self.parse_queue.get()
+            try:
+                with stats.busy():
+                    item.result = await parse_html(self.parse_executor, item.content.html)
+                item.result.task_id = item.task.id
+                stats.items += 1
+
+                # Blocks while persistence is behind
+                await self.persist_queue.put(item)
+            except Exception as e:
+                stats.failed += 1
+                await self._fail_item(item, e)
+            finally:
+                self.parse_queue.task_done()
+
+    async def _persist_stage(self) -> None:
+        """Write parsed results in batches: files on a thread, DB in one transaction."""
+        stats = self.stages["persist"]
+        while True:
+            batch = [await self.persist_queue.get()]
+            while len(batch) < self.persist_batch_size and not self.persist_queue.empty():
+                batch.append(self.persist_queue.get_nowait())
+
+            try:
+                with stats.busy():
+                    await self._persist_batch(batch)
+                stats.items += len(batch)
+            except Exception as e:
+                if len(batch) == 1:
+                    stats.failed += 1
+                    await self._fail_item(batch[0], e)
+                else:
+                    # The transaction rolled back for every item; retry them
+                    # separately so only the ones at fault count as failed
+                    logger.warning(f"Persisting {len(batch)} tasks failed ({e}), retrying one by one")
+                    await self._persist_items(batch)
+            finally:
+                for _ in batch:
+                    self.persist_queue.task_done()
+
+            if self.processed_count - self._last_checkpoint_count >= self.checkpoint_interval:
+                self._last_checkpoint_count = self.processed_count
+                await self._create_checkpoint()
+
+    async def _persist_items(self, items: List[PipelineItem]) -> None:
+        """Persist items one at a time, failing only those that fail on their own."""
+        stats = self.stages["persist"]
+        for item in items:
+            try:
+                with stats.busy():
+                    await self._persist_batch([item])
+                stats.items += 1
+            except Exception as e:
+                stats.failed += 1
+                await self._fail_item(item, e)
+
+    async def _persist_batch(self, batch: List[PipelineItem]) -> None:
+        """
+        Save results and raw HTML, queue discovered links and complete the
+        tasks. Unchanged pages write no files and are only marked checked.
+
+        Tasks whose lease expired and went to another worker are left to
+        that worker; their results are dropped.
+        """
+        changed = [item for item in batch if not item.unchanged]
+        unchanged = [item for item in batch if item.unchanged]
+
+        result_paths = await self.lpm.save_results(
+            self.config.platform,
+            [(item.task.id, item.result.to_dict(), item.content.html) for item in changed],
+        )
 
-            # Mark complete
-            await self.lpm.complete_task(task.id, result_path)
+        async with self.lpm.db.transaction():
+            completed = await self.lpm.complete_tasks(
+                [(item.task.id, path) for item, path in zip(changed, result_paths)],
+                [(item.task.id, item.fingerprint) for item in changed],
+                worker_id=self.worker_id,
+            )
+            completed |= await self.lpm.complete_unchanged(
+                [(item.task.id, item.fingerprint) for item in unchanged],
+                worker_id=self.worker_id,
+            )
+            for item in changed:
+                if item.task.id in completed and item.result.discovered_links:
+                    await self.lpm.add_discovered_links(item.task.id, item.result.discovered_links)
+
+        now = time.monotonic()
+        for item in batch:
+            if item.task.id not in completed:
+                self.lease_lost_count += 1
+                logger.warning(f"Task {item.task.id} lease lost, dropping its result")
+                self._item_done(item)
+                continue
             self.processed_count += 1
-
-            logger.info(f"Task {task.id} completed: {result.parcel_id}")
-
+            if self.mixer is not None:
+                self.mixer.record_result(item.task, True, now - item.started)
+            if item.unchanged:
+                self.unchanged_count += 1
+                logger.info(f"Task {item.task.id} unchanged")
+            else:
+                logger.info(f"Task {item.task.id} completed: {item.result.parcel_id}")
+            self._item_done(item)
+
+    async def _fail_item(self, item: PipelineItem, error: Exception) -> None:
+        """Record a task that failed in any stage."""
+        logger.error(f"Task {item.task.id} failed: {error}")
+        if self.mixer is not None:
+            self.mixer.record_result(item.task, False, time.monotonic() - item.started)
+        try:
+            await self._handle_task_failure(item.task, error)
         except Exception as e:
-            logger.error(f"Task {task.id} failed: {e}")
-            await self._handle_task_failure(task, e)
+            # The lease expires and the reaper requeues the task
+            logger.error(f"Could not record failure of task {item.task.id}: {e}")
+        finally:
+            self._item_done(item)
+
+    def _item_done(self, item: PipelineItem) -> None:
+        """Count a task as finished with the pipeline."""
+        self.inflight_task_ids.discard(item.task.id)
+        self._pending -= 1
+        if self._pending <= 0:
+            self._pipeline_idle.set()
+
+    def _pipeline_busy(self) -> bool:
+        """Check if any task is being fetched, parsed or persisted."""
+        return self._pending > 0
+
+    async def _wait_for_pipeline(self) -> None:
+        """Wait until every task taken so far has finished all stages."""
+        await self._pipeline_idle.wait()
+
+    def pipeline_report(self) -> dict:
+        """Per-stage throughput, utilization and queue depth."""
+        queued = {"parse": self.parse_queue.qsize(), "persist": self.persist_queue.qsize()}
+        return {
+            name: stats.to_dict(queued.get(name))
+            for name, stats in self.stages.items()
+        }
 
     async def _handle_task_failure(self, task, error: Exception) -> None:
         """Handle task failure with retry logic."""
-        retry_count = await self.lpm.retry_task(task.id)
-
-        if retry_count <= self.max_retries:
-            logger.info(f"Task {task.id} will be retried (attempt {retry_count})")
+        delay = self.retry_config.get_delay(task.retry_count)
+
+        # Requeue and fail together, so nobody claims the task in between
+        async with self.lpm.db.transaction():
+            retry_count = await self.lpm.retry_task(task.id, delay, worker_id=self.worker_id)
+            if retry_count is not None and retry_count > self.max_retries:
+                await self.lpm.fail_task(task.id, str(error))
+
+        if retry_count is None:
+            self.lease_lost_count += 1
+            logger.warning(f"Task {task.id} lease lost, leaving it to its new worker")
+        elif retry_count <= self.max_retries:
+            logger.info(
+                f"Task {task.id} will be retried in {delay:.0f}s (attempt {retry_count})"
+            )
         else:
-            await self.lpm.fail_task(task.id, str(error))
             self.error_count += 1
             logger.error(f"Task {task.id} failed permanently after {retry_count} attempts")
 
+    async def _maintenance_loop(self) -> None:
+        """
+        Periodically renew our leases, reap expired ones and age priorities.
+
+        Runs until cancelled by _cleanup, after in-flight tasks have drained.
+        """
+        last_reprioritized = 0.0
+        while True:
+            try:
+                await self.lpm.renew_leases(self.worker_id, self.lease_seconds)
+                reclaimed = await self.lpm.reap_expired_leases(self.lease_seconds)
+                if reclaimed:
+                    self.reclaimed_count += reclaimed
+                    logger.warning(f"Reclaimed {reclaimed} tasks with expired leases")
+            except Exception as e:
+                logger.error(f"Lease maintenance failed: {e}")
+
+            now = asyncio.get_running_loop().time()
+            if now - last_reprioritized >= self.reprioritize_interval:
+                last_reprioritized = now
+                try:
+                    changed = await self.lpm.reprioritize_tasks(platform=self.config.platform)
+                    if changed:
+                        logger.debug(f"Reprioritized {changed} pending tasks")
+                except Exception as e:
+                    logger.error(f"Reprioritization failed: {e}")
+
+            await asyncio.sleep(self.heartbeat_interval)
+
     async def _create_checkpoint(self) -> None:
         """Create checkpoint for resumability."""
         checkpoint = CheckpointState.create(
-            checkpoint_id=datetime.utcnow().strftime("%Y%m%d_%H%M%S"),
-            task_id=self.current_task_id,
+            # Prefixed with the worker ID so workers sharing a state dir don't collide
+            checkpoint_id=f"{self.worker_id}_{datetime.utcnow().strftime('%Y%m%d_%H%M%S')}",
             processed_count=self.processed_count,
             error_count=self.error_count,
             metadata={
                 "platform": self.config.platform,
                 "drain_mode": self.drain_mode,
+                "worker_id": self.worker_id,
+                # Several tasks are in flight at once, so there is no single current task
+                "inflight_task_ids": sorted(self.inflight_task_ids),
+                "reclaimed_count": self.reclaimed_count,
+                "lease_lost_count": self.lease_lost_count,
+                "unchanged_count": self.unchanged_count,
+                "strategies": self.mixer.report() if self.mixer else None,
+                "browser_pool": self.browser_pool.stats() if self.browser_pool else None,
+                "pipeline": self.pipeline_report(),
+                "fetch": self.scraper.fetch_stats() if self.scraper else None,
+                "http_pools": pool_metrics(),
             },
         )
         self.state_serializer.save_checkpoint(checkpoint)
+        # Keep the state dir (and the supervisor's scans of it) bounded
+        self.state_serializer.cleanup_old_checkpoints(
+            self.checkpoint_keep, prefix=f"checkpoint_{self.worker_id}_"
+        )
         logger.debug(f"Checkpoint created: {checkpoint.checkpoint_id}")
 
+        report = self.pipeline_report()
+        bottleneck = max(report, key=lambda name: report[name]["utilization"])
+        logger.info(
+            "Pipeline utilization: "
+            + ", ".join(f"{name} {stats['utilization']:.0%}" for name, stats in report.items())
+            + f" (bottleneck: {bottleneck})"
+        )
+
+        if self.mixer is not None:
+            for name, stats in self.mixer.report().items():
+                logger.info(
+                    f"Strategy {name}: {stats['completed']} done, "
+                    f"{stats['failed']} failed, {stats['tasks_per_minute']}/min"
+                )
+
     async def _cleanup(self) -> None:
         """Cleanup resources."""
         self.running = False
 
+        # Let tasks already in the pipeline finish, then stop the stages.
+        # Leases keep being renewed meanwhile, so none expire mid-drain.
+        if self._pipeline_busy():
+            logger.info(f"Waiting for {self._pending} running tasks")
+            await asyncio.gather(*self._inflight, return_exceptions=True)
+            if self._stage_tasks:
+                await self._wait_for_pipeline()
+        for stage in self._stage_tasks:
+            stage.cancel()
+        await asyncio.gather(*self._stage_tasks, return_exceptions=True)
+
+        if self._maintenance_task:
+            self._maintenance_task.cancel()
+            try:
+                await self._maintenance_task
+            except asyncio.CancelledError:
+                pass
+        if self.parse_executor is not None:
+            self.parse_executor.shutdown(wait=False, cancel_futures=True)
+
+        # Hand prefetched but unprocessed claims back to the queue
+        released = await self.prefetcher.release()
+        if released:
+            logger.info(f"Released {released} prefetched tasks")
+
         if self.scraper:
             await self.scraper.close()
+        if self.browser_pool:
+            await self.browser_pool.close()
 
-        # Final checkpoint
+        # Final checkpoint, then drop keep-alive connections
         await self._create_checkpoint()
+        await close_clients()
 
         logger.info(
-            f"Worker stopped. Processed: {self.processed_count}, Errors: {self.error_count}"
+            f"Worker stopped. Processed: {self.processed_count} "
+            f"({self.unchanged_count} unchanged), "
+            f"Errors: {self.error_count}, Reclaimed: {self.reclaimed_count}"
         )
 
     def stop(self) -> None: